@@ -21,8 +21,19 @@ def _add_adapt_args(parser):
     )
     parser.add_argument(
         "--discover",
+        nargs="?",
+        const="agent",
+        default="",
+        metavar="MODE",
+        help=(
+            "Generate/update image-request.yaml before applying: 'agent' (default) asks the agent; "
+            "'static' scans manifests locally and asks the agent only for what it cannot resolve"
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
         action="store_true",
-        help="Run automated agent discovery to generate/update image-request.yaml before applying",
+        help="With --discover, run the agent even if dependency manifests are unchanged since the last discovery",
     )
     parser.add_argument("--base-image", help="Override generated Dockerfile base image")
     parser.add_argument("--from-image", help="Adapt an existing image as Dockerfile parent")
@@ -47,6 +58,36 @@ def _add_adapt_args(parser):
         action="store_true",
         help="Skip approval prompts (auto-approve wishlist and build-error retry)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="With --all --build, build up to N images concurrently (default: 1)",
+    )
+
+
+# Subcommand -> function in skua.commands. Resolved lazily so that startup
+# only pays for the modules the chosen command needs.
+COMMAND_FUNCTIONS = {
+    "init": "cmd_init",
+    "build": "cmd_build",
+    "add": "cmd_add",
+    "remove": "cmd_remove",
+    "run": "cmd_run",
+    "stop": "cmd_stop",
+    "restart": "cmd_restart",
+    "adapt": "cmd_adapt",
+    "list": "cmd_list",
+    "clean": "cmd_clean",
+    "purge": "cmd_purge",
+    "config": "cmd_config",
+    "validate": "cmd_validate",
+    "describe": "cmd_describe",
+    "ssh": "cmd_ssh",
+    "sync": "cmd_sync",
+}
 
 
 def main():
@@ -56,6 +97,8 @@ def main():
     )
     parser.add_argument("--version", action="version",
                         version=f"%(prog)s {__version__}")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Write a Chrome trace-event JSON of this command to FILE (also: SKUA_TRACE)")
     sub = parser.add_subparsers(dest="command")
 
     # init
@@ -71,13 +114,21 @@ def main():
         action="store_true",
         help="Show full Docker build output",
     )
+    p_build.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Build up to N images concurrently (default: 1)",
+    )
 
     # add
     p_add = sub.add_parser("add", help="Add a project configuration")
     p_add.add_argument("name", help="Project name (alphanumeric, hyphens, underscores)")
     p_add.add_argument("--dir", help="Project directory path")
     p_add.add_argument("--repo", help="Git repository URL to clone (mutually exclusive with --dir)")
-    p_add.add_argument("--host", help="SSH config host for remote execution (requires --repo)")
+    p_add.add_argument("--host", help="SSH config host for remote execution (requires --repo or --dir)")
     p_add.add_argument("--ssh-key", help="SSH private key path")
     p_add.add_argument("--env", help="Environment resource name (default: from global)")
     p_add.add_argument("--security", help="Security profile name (default: from global)")
@@ -97,6 +148,8 @@ def main():
     # run
     p_run = sub.add_parser("run", help="Run a container for a project")
     p_run.add_argument("name", help="Project name to run")
+    p_run.add_argument("--timings", action="store_true",
+                       help="Print how long each container entrypoint phase took")
 
     # stop
     p_stop = sub.add_parser("stop", help="Stop a running project container")
@@ -150,6 +203,17 @@ def main():
         action="store_true",
         help="Only show projects running on the local host",
     )
+    p_list.add_argument(
+        "--refresh",
+        action="store_true",
+        help="With --git, fetch every repo now instead of reusing recent fetches",
+    )
+    p_list.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Deadline for querying all Docker hosts (default: 8)",
+    )
 
     # clean
     p_clean = sub.add_parser("clean", help="Clean persisted agent credentials")
@@ -163,6 +227,16 @@ def main():
     p_cfg = sub.add_parser("config", help="Show or edit global configuration")
     p_cfg.add_argument("--git-name", help="Set git user name")
     p_cfg.add_argument("--git-email", help="Set git user email")
+    p_cfg.add_argument("--git-fetch-ttl", type=int, metavar="SECONDS",
+                       help="Reuse 'skua list --git' fetches newer than this (0 = always fetch)")
+    p_cfg.add_argument("--remote-clone-filter", metavar="FILTER",
+                       help="Partial-clone filter for remote repo volumes, e.g. blob:none ('none' to clear)")
+    p_cfg.add_argument("--remote-clone-depth", type=int, metavar="N",
+                       help="Shallow-clone depth for remote repo volumes (0 = full history)")
+    p_cfg.add_argument("--remote-mirror", choices=["on", "off"],
+                       help="Share a per-host mirror volume that remote repo clones borrow objects from")
+    p_cfg.add_argument("--precreate", choices=["on", "off"],
+                       help="Pre-create stopped containers after add/build/adapt so 'skua run' only starts them")
     p_cfg.add_argument("--tool-dir", help="Set path to directory containing Dockerfile")
     p_cfg.add_argument("--ssh-key", help="Set default SSH private key path")
     p_cfg.add_argument("--default-env", help="Set default environment")
@@ -209,37 +283,46 @@ def main():
     p_cred_rm = cred_sub.add_parser("remove", help="Remove a credential set")
     p_cred_rm.add_argument("name", help="Credential name to remove")
 
+    # ssh
+    p_ssh = sub.add_parser("ssh", help="Inspect or close multiplexed SSH connections to remote hosts")
+    p_ssh.add_argument(
+        "action",
+        nargs="?",
+        choices=["status", "close"],
+        default="status",
+        help="status (default) or close",
+    )
+    p_ssh.add_argument("host", nargs="?", help="SSH host (default: all project hosts)")
+
+    # sync
+    p_sync = sub.add_parser("sync", help="Push a remote project's local directory into its volume on the host")
+    p_sync.add_argument("name", help="Project name")
+    p_sync.add_argument("--watch", action="store_true", help="Keep syncing as local files change (Ctrl-C to stop)")
+    p_sync.add_argument("--interval", type=float, default=1.0, metavar="SECONDS",
+                        help="Polling interval for --watch (default: 1)")
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
-    # Lazy import commands to keep startup fast
-    from skua.commands import (
-        cmd_build, cmd_init, cmd_add, cmd_remove, cmd_run, cmd_stop, cmd_restart,
-        cmd_adapt, cmd_list, cmd_clean, cmd_purge, cmd_config, cmd_validate,
-        cmd_describe, cmd_credential,
-    )
-
-    commands = {
-        "init": cmd_init,
-        "build": cmd_build,
-        "add": cmd_add,
-        "remove": cmd_remove,
-        "run": cmd_run,
-        "stop": cmd_stop,
-        "restart": cmd_restart,
-        "adapt": cmd_adapt,
-        "list": cmd_list,
-        "clean": cmd_clean,
-        "purge": cmd_purge,
-        "config": cmd_config,
-        "validate": cmd_validate,
-        "describe": cmd_describe,
-        "credential": _handle_credential,
-    }
-    commands[args.command](args)
+    from skua import trace
+    if getattr(args, "trace", None):
+        trace.enable(args.trace)
+    else:
+        trace.enable_from_env()
+
+    # Only the chosen command's module is imported (see skua.commands).
+    import skua.commands
+
+    if args.command == "credential":
+        # Shows subcommand help when no action is given.
+        handler = _handle_credential
+    else:
+        handler = getattr(skua.commands, COMMAND_FUNCTIONS[args.command])
+    with trace.span(f"skua {args.command}"):
+        handler(args)
 
 
 def _handle_credential(args):
@@ -1,23 +1,42 @@
 # SPDX-License-Identifier: BUSL-1.1
-"""Command implementations for skua CLI."""
+"""Command implementations for skua CLI.
 
-from skua.commands.build import cmd_build
-from skua.commands.init import cmd_init
-from skua.commands.add import cmd_add
-from skua.commands.remove import cmd_remove
-from skua.commands.run import cmd_run
-from skua.commands.stop import cmd_stop
-from skua.commands.restart import cmd_restart
-from skua.commands.adapt import cmd_adapt
-from skua.commands.list_cmd import cmd_list
-from skua.commands.clean import cmd_clean
-from skua.commands.purge import cmd_purge
-from skua.commands.config_cmd import cmd_config
-from skua.commands.validate_cmd import cmd_validate
-from skua.commands.describe import cmd_describe
-from skua.commands.credential import cmd_credential
-__all__ = [
-    "cmd_build", "cmd_init", "cmd_add", "cmd_remove", "cmd_run", "cmd_stop",
-    "cmd_restart", "cmd_adapt", "cmd_list", "cmd_clean", "cmd_purge",
-    "cmd_config", "cmd_validate", "cmd_describe", "cmd_credential",
-]
+Command functions are resolved lazily (PEP 562), so `from skua.commands
+import cmd_list` imports only skua.commands.list_cmd and its dependencies.
+"""
+
+# Command function name -> defining module.
+_COMMAND_MODULES = {
+    "cmd_build": "skua.commands.build",
+    "cmd_init": "skua.commands.init",
+    "cmd_add": "skua.commands.add",
+    "cmd_remove": "skua.commands.remove",
+    "cmd_run": "skua.commands.run",
+    "cmd_stop": "skua.commands.stop",
+    "cmd_restart": "skua.commands.restart",
+    "cmd_adapt": "skua.commands.adapt",
+    "cmd_list": "skua.commands.list_cmd",
+    "cmd_clean": "skua.commands.clean",
+    "cmd_purge": "skua.commands.purge",
+    "cmd_config": "skua.commands.config_cmd",
+    "cmd_validate": "skua.commands.validate_cmd",
+    "cmd_describe": "skua.commands.describe",
+    "cmd_credential": "skua.commands.credential",
+    "cmd_ssh": "skua.commands.ssh_cmd",
+    "cmd_sync": "skua.commands.sync_cmd",
+}
+
+__all__ = list(_COMMAND_MODULES)
+
+
+def __getattr__(name):
+    module_name = _COMMAND_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    func = getattr(__import__(module_name, fromlist=[name]), name)
+    globals()[name] = func
+    return func
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -7,18 +7,27 @@ import shlex
 import shutil
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from types import SimpleNamespace
 
 from skua.commands.credential import resolve_credential_sources
 from skua.config import ConfigStore, validate_project
+from skua.dependency_scan import scan_project
 from skua.docker import (
+    build_cache_options,
     build_run_command,
     build_image,
+    compute_build_context_hash,
+    content_tag_base,
+    generate_dockerfile,
     image_exists,
     image_name_for_project,
     resolve_project_image_inputs,
+    tag_image,
 )
+from skua.git_cache import clone_repo
 from skua.project_adapt import (
     ensure_adapt_workspace,
     image_request_path,
@@ -26,14 +35,25 @@ from skua.project_adapt import (
     request_changes_project,
     request_has_updates,
     apply_image_request_to_project,
+    discovery_cache_file,
+    discovery_cache_key,
+    load_cached_discovery,
+    merge_image_requests,
+    save_cached_discovery,
     write_applied_image_request,
+    write_image_request,
 )
 
 
+class AdaptError(Exception):
+    """A project could not be adapted; the message says why."""
+
+
 def cmd_adapt(args):
     store = ConfigStore()
     all_mode = bool(getattr(args, "all", False))
     name = str(getattr(args, "name", "") or "").strip()
+    name = _split_discover_arg(args, name, all_mode)
 
     if all_mode:
         _cmd_adapt_all(store, args)
@@ -43,29 +63,10 @@ def cmd_adapt(args):
         print("Error: Provide a project name or use --all.")
         sys.exit(1)
 
-    project = store.resolve_project(name)
-    if project is None:
-        print(f"Error: Project '{name}' not found.")
-        sys.exit(1)
-
-    env = store.load_environment(project.environment)
-    if env is None:
-        print(f"Error: Environment '{project.environment}' not found.")
-        sys.exit(1)
-    if env.mode != "unmanaged":
-        print(
-            f"Error: skua adapt currently supports unmanaged mode only "
-            f"(project uses mode '{env.mode}')."
-        )
-        sys.exit(1)
-    sec = store.load_security(project.security)
-    if sec is None:
-        print(f"Error: Security profile '{project.security}' not found.")
-        sys.exit(1)
-
-    agent = store.load_agent(project.agent)
-    if agent is None:
-        print(f"Error: Agent '{project.agent}' not found.")
+    try:
+        project, env, sec, agent = _load_adapt_resources(store, name)
+    except AdaptError as exc:
+        print(f"Error: {exc}")
         sys.exit(1)
 
     if bool(getattr(args, "show_prompt", False)):
@@ -104,17 +105,48 @@ def cmd_adapt(args):
         sys.exit(1)
 
     request_from_flags = _request_from_flags(args)
-    discover_mode = bool(getattr(args, "discover", False))
+    discover_mode = _discover_mode(args)
     if discover_mode and request_from_flags is not None:
         print("Warning: --discover ignored because request flags were provided.")
-        discover_mode = False
+        discover_mode = ""
     if discover_mode and args.clear:
         print("Warning: --discover ignored with --clear.")
-        discover_mode = False
-
-    if discover_mode:
-        print("[adapt] Step 1: Discover wishlist with agent")
-        _run_agent_adapt_session(store, project, env, sec, agent)
+        discover_mode = ""
+
+    ask_agent = discover_mode == "agent"
+    if discover_mode == "static":
+        print("[adapt] Step 1: Discover wishlist with static analysis")
+        started = time.monotonic()
+        scan = scan_project(project_dir)
+        write_image_request(request_path, scan.request())
+        elapsed_ms = (time.monotonic() - started) * 1000
+        found = ", ".join(scan.ecosystems) or "no known manifests"
+        print(f"[adapt] Scanned {scan.files_scanned} file(s) in {elapsed_ms:.0f}ms: {found}")
+        if scan.unresolved:
+            print("[adapt] Not resolved statically; asking the agent:")
+            for hint in scan.unresolved:
+                print(f"  - {hint}")
+            ask_agent = True
+
+    discovery_key = ""
+    discovery_cache = discovery_cache_file(store.config_dir, project.name)
+    if ask_agent:
+        if discover_mode == "agent":
+            print("[adapt] Step 1: Discover wishlist with agent")
+        discovery_key = _discovery_key(store, project_dir, project, agent, discover_mode)
+        cached = None
+        if not getattr(args, "no_cache", False):
+            cached = load_cached_discovery(discovery_cache, discovery_key)
+        if cached is not None:
+            write_image_request(request_path, cached)
+            print("[adapt] Dependency manifests unchanged since the last discovery; reusing its wishlist.")
+            print("  Use --no-cache to run the agent again.")
+        elif discover_mode == "static":
+            _run_agent_adapt_session(store, project, env, sec, agent, unresolved=scan.unresolved)
+            # Whatever the agent rewrote, the statically found needs stay.
+            write_image_request(request_path, merge_image_requests(scan.request(), load_image_request(request_path)))
+        else:
+            _run_agent_adapt_session(store, project, env, sec, agent)
 
     if request_from_flags is not None:
         request = request_from_flags
@@ -141,7 +173,9 @@ def cmd_adapt(args):
     if not args.clear and not request_has_updates(request):
         print("No requested image changes found.")
         if discover_mode:
-            print("Agent did not request any image customizations.")
+            if discovery_key:
+                save_cached_discovery(discovery_cache, discovery_key, request)
+            print("Discovery did not request any image customizations.")
         else:
             print("No latent image-request updates to apply.")
             print(f"Run 'skua adapt {project.name} --discover' to generate a new wishlist.")
@@ -173,6 +207,11 @@ def cmd_adapt(args):
     should_build = bool(getattr(args, "build", False) or discover_mode)
     if should_build:
         print("[adapt] Step 3: Build adapted image")
+        if store.get_container_dir() is None:
+            # Not something the agent can fix by revising the request.
+            print("Error: Cannot find container build assets (entrypoint.sh).")
+            print("Set toolDir in global.yaml or reinstall skua.")
+            sys.exit(1)
         build_error = _build_project_image(store, project, agent)
         retry_count = 0
         max_retries = 3
@@ -203,6 +242,10 @@ def cmd_adapt(args):
         if build_error:
             print("Error: Image build failed. Fix the image request and re-run 'skua adapt'.")
             sys.exit(1)
+        if discovery_key:
+            save_cached_discovery(discovery_cache, discovery_key, load_image_request(request_path))
+        from skua.commands.run import precreate_containers
+        precreate_containers(store, [project.name])
     else:
         image_name = _current_image_name(store, project)
         built = image_exists(image_name)
@@ -214,6 +257,28 @@ def cmd_adapt(args):
             print(f"Next: run 'skua adapt {project.name} --build' to build the image.")
 
 
+def _load_adapt_resources(store: ConfigStore, name: str) -> tuple:
+    """Return (project, env, sec, agent) for an adaptable project.
+
+    Raises AdaptError if a resource is missing or the environment is managed.
+    """
+    project = store.resolve_project(name)
+    if project is None:
+        raise AdaptError(f"Project '{name}' not found.")
+    env = store.load_environment(project.environment)
+    if env is None:
+        raise AdaptError(f"Environment '{project.environment}' not found.")
+    if env.mode != "unmanaged":
+        raise AdaptError(f"skua adapt currently supports unmanaged mode only (project uses mode '{env.mode}').")
+    sec = store.load_security(project.security)
+    if sec is None:
+        raise AdaptError(f"Security profile '{project.security}' not found.")
+    agent = store.load_agent(project.agent)
+    if agent is None:
+        raise AdaptError(f"Agent '{project.agent}' not found.")
+    return project, env, sec, agent
+
+
 def _project_has_pending_request(project) -> bool:
     """Return True when project has unapplied image-request changes."""
     directory = str(getattr(project, "directory", "") or "").strip()
@@ -260,62 +325,93 @@ def _cmd_adapt_all(store: ConfigStore, args):
         print("No projects with pending image-request changes.")
         return
 
-    print(f"Applying pending image-request changes for {len(pending_names)} project(s)...")
-    success = 0
-    failed = []
+    force = bool(getattr(args, "force", False))
     build_all = bool(getattr(args, "build", False))
+    jobs = max(1, int(getattr(args, "jobs", 1) or 1))
+    print(f"Applying pending image-request changes for {len(pending_names)} project(s)...")
 
+    # Applying is quick and may prompt, so it runs one project at a time;
+    # only the builds run concurrently.
+    errors = {}
+    targets = []
     for project_name in pending_names:
         print()
         print(f"[adapt --all] {project_name}")
-        project_args = SimpleNamespace(
-            name=project_name,
-            all=False,
-            show_prompt=False,
-            discover=False,
-            base_image="",
-            from_image="",
-            package=[],
-            extra_command=[],
-            apply_only=True,
-            clear=False,
-            write_only=False,
-            build=build_all,
-            force=bool(getattr(args, "force", False)),
-        )
         try:
-            cmd_adapt(project_args)
-            success += 1
-        except SystemExit as exc:
-            code = exc.code if isinstance(exc.code, int) else 1
-            if code == 0:
-                success += 1
-            else:
-                failed.append(project_name)
+            target = _apply_pending_request(store, project_name, force)
+        except AdaptError as exc:
+            print(f"Error: {exc}")
+            errors[project_name] = str(exc)
+            continue
+        if target is not None:
+            targets.append(target)
 
+    if build_all and targets:
+        print()
+        print(f"[adapt --all] Building images for {len(targets)} project(s) (jobs: {jobs})...")
+        try:
+            results = _build_adapted_images(store, targets, jobs)
+        except AdaptError as exc:
+            print(f"Error: {exc}")
+            results = {project.name: str(exc) for project, _ in targets}
+        errors.update({name: error for name, error in results.items() if error})
+        from skua.commands.run import precreate_containers
+        precreate_containers(store, [project.name for project, _ in targets if project.name not in errors])
+
+    failed = [name for name in pending_names if name in errors]
     print()
-    print(f"Adapted {success}/{len(pending_names)} pending project(s).")
+    print(f"Adapted {len(pending_names) - len(failed)}/{len(pending_names)} pending project(s).")
     if failed:
         print("Failed:")
         for name in failed:
             print(f"  - {name}")
+            lines = [line.rstrip() for line in errors[name].splitlines() if line.strip()]
+            if len(lines) > 1:
+                for line in lines[-12:]:
+                    print(f"      {line}")
+        if build_all:
+            print("Run 'skua adapt <name> --build' to let the agent revise a failed build.")
         sys.exit(1)
 
 
+def _apply_pending_request(store: ConfigStore, project_name: str, force: bool = False):
+    """Apply one project's pending image request for --all.
+
+    Returns (project, agent), or None if the user declined the wishlist.
+    Raises AdaptError instead of exiting so other projects carry on.
+    """
+    project, env, sec, agent = _load_adapt_resources(store, project_name)
+    result = validate_project(project, env, sec, agent)
+    for warning in result.warnings:
+        print(f"  Warning: {warning}")
+    if not result.valid:
+        raise AdaptError("Configuration validation failed: " + "; ".join(result.errors))
+
+    project_dir = Path(project.directory).expanduser().resolve()
+    _, request_path = ensure_adapt_workspace(project_dir, project.name, project.agent)
+    request = load_image_request(request_path)
+    if _is_interactive_tty() and not force:
+        if not _confirm_apply_wishlist(project.agent, request):
+            print("Adapt cancelled before applying wishlist.")
+            return None
+
+    if apply_image_request_to_project(project, request):
+        store.save_resource(project)
+        write_applied_image_request(request_path, request, project.image.version)
+        print(f"Applied image request from: {request_path}")
+        print(f"Project image version: v{project.image.version}")
+    else:
+        print("Project image configuration already matches request; no changes applied.")
+    return project, agent
+
+
 def _ensure_project_directory(store: ConfigStore, project) -> Path:
     """Ensure project.directory exists; clone repo when needed."""
     if project.repo:
         clone_dir = store.repo_dir(project.name)
         if not clone_dir.exists():
             print(f"Cloning {project.repo} into {clone_dir}...")
-            clone_cmd = ["git", "clone"]
-            if project.ssh.private_key:
-                ssh_cmd = f"ssh -i {project.ssh.private_key} -o StrictHostKeyChecking=no"
-                clone_cmd = ["git", "-c", f"core.sshCommand={ssh_cmd}", "clone"]
-            clone_cmd += [project.repo, str(clone_dir)]
-            try:
-                subprocess.run(clone_cmd, check=True)
-            except subprocess.CalledProcessError:
+            if not clone_repo(project.repo, clone_dir, store.git_cache_dir(), project.ssh.private_key):
                 print(f"Error: Failed to clone {project.repo}")
                 sys.exit(1)
         project.directory = str(clone_dir)
@@ -393,6 +489,7 @@ def _ensure_runtime_image(store: ConfigStore, project, sec, agent) -> str:
         extra_packages=extra_packages,
         extra_commands=extra_commands,
         quiet=True,
+        **build_cache_options(image_config),
     )
     if not success:
         print(f"Error: failed to build image '{image_name}'.")
@@ -416,7 +513,7 @@ def _shell_join(argv: list) -> str:
     return " ".join(shlex.quote(str(token)) for token in (argv or []))
 
 
-def _agent_prompt(project_name: str, agent_name: str, build_error: str = "") -> str:
+def _agent_prompt(project_name: str, agent_name: str, build_error: str = "", unresolved: list = None) -> str:
     base = (
         f"You are adapting the project '{project_name}'. "
         "You are running inside the project's Docker container environment. "
@@ -430,6 +527,12 @@ def _agent_prompt(project_name: str, agent_name: str, build_error: str = "") ->
         "baseImage or fromImage when needed. "
         "Do not modify any other file."
     )
+    if unresolved:
+        base += (
+            "\n\nA static scan of the project's manifests already wrote .skua/image-request.yaml. "
+            "Keep its packages and commands, and add only what is needed for these items it could not resolve:\n"
+            + "".join(f"- {item}\n" for item in unresolved)
+        )
     if build_error:
         base += (
             "\n\nThe previous Docker build FAILED. Update .skua/image-request.yaml to fix it. "
@@ -544,9 +647,9 @@ def _confirm_apply_wishlist(agent_name: str, request: dict) -> bool:
     return answer != "n"
 
 
-def _agent_adapt_command(agent, project_name: str, build_error: str = "") -> list:
+def _agent_adapt_command(agent, project_name: str, build_error: str = "", unresolved: list = None) -> list:
     agent_name = (agent.name or "").strip().lower()
-    prompt = _agent_prompt(project_name, agent_name, build_error)
+    prompt = _agent_prompt(project_name, agent_name, build_error, unresolved)
 
     template = str(getattr(agent.runtime, "adapt_command", "") or "").strip()
     if template:
@@ -622,8 +725,13 @@ def _ensure_agent_authenticated(store: ConfigStore, project, env, agent, cred, d
         sys.exit(1)
 
 
-def _run_agent_adapt_session(store: ConfigStore, project, env, sec, agent, build_error: str = ""):
-    """Start an adapt container session and ask the agent to update image-request.yaml."""
+def _run_agent_adapt_session(store: ConfigStore, project, env, sec, agent, build_error: str = "",
+                             unresolved: list = None):
+    """Start an adapt container session and ask the agent to update image-request.yaml.
+
+    unresolved lists what a static scan (already in the request file) left
+    for the agent to fill in.
+    """
     print("[adapt] Preparing runtime image...")
     image_name = _ensure_runtime_image(store, project, sec, agent)
     data_dir = store.project_data_dir(project.name, project.agent)
@@ -649,7 +757,7 @@ def _run_agent_adapt_session(store: ConfigStore, project, env, sec, agent, build
     else:
         print(f"[adapt] {agent.name} is generating wishlist...")
     run_cmd = _noninteractive_run_command(docker_cmd_base, project.name, "agent")
-    adapt_cmd = _agent_adapt_command(agent, project.name, build_error)
+    adapt_cmd = _agent_adapt_command(agent, project.name, build_error, unresolved)
     print(f"[adapt] Agent command: {_shell_join(adapt_cmd)}")
     run_cmd.extend(adapt_cmd)
     result = subprocess.run(run_cmd, capture_output=True, text=True)
@@ -672,6 +780,48 @@ def _run_agent_adapt_session(store: ConfigStore, project, env, sec, agent, build
         sys.exit(1)
 
 
+DISCOVER_MODES = ("agent", "static")
+
+
+def _split_discover_arg(args, name: str, all_mode: bool = False) -> str:
+    """Untangle `skua adapt --discover <name>`; returns the project name.
+
+    --discover takes an optional mode, so argparse hands a following project
+    name to it. Anything that is not a mode is the name when none was given.
+    """
+    value = getattr(args, "discover", False)
+    if not isinstance(value, str) or not value or value in DISCOVER_MODES:
+        return name
+    if name or all_mode:
+        print(f"Error: Unknown --discover mode '{value}' (choose from: {', '.join(DISCOVER_MODES)}).")
+        sys.exit(1)
+    args.discover = "agent"
+    return value
+
+
+def _discover_mode(args) -> str:
+    """Return "agent", "static" or "" for the --discover flag."""
+    value = getattr(args, "discover", False)
+    if value is True:
+        return "agent"
+    return str(value or "")
+
+
+def _discovery_key(store: ConfigStore, project_dir: Path, project, agent, mode: str = "agent") -> str:
+    """Cache key for a discovery run: the project's manifests plus what the agent runs on."""
+    g = store.load_global()
+    image_config = g.get("image", {})
+    return discovery_cache_key(
+        project_dir,
+        mode,
+        agent.name,
+        _shell_join(_agent_adapt_command(agent, project.name)),
+        g.get("baseImage", "debian:bookworm-slim"),
+        _shell_join(image_config.get("extraPackages", [])),
+        "\n".join(image_config.get("extraCommands", [])),
+    )
+
+
 def _request_from_flags(args):
     """Build an image request from CLI flags, or None when no request flags given."""
     has_flag_request = bool(
@@ -722,15 +872,12 @@ def _runtime_image_name(store: ConfigStore, project) -> str:
     return f"{image_name_for_project(image_name_base, project)}-runtime"
 
 
-def _read_last_dockerfile(container_dir: Path, max_chars: int = 8000) -> str:
-    """Return the last generated Dockerfile content, truncated."""
-    build_path = container_dir / ".build-context" / "Dockerfile"
-    if not build_path.is_file():
-        return ""
-    try:
-        text = build_path.read_text()
-    except OSError:
-        return ""
+def _failed_dockerfile_text(max_chars: int = 8000, **dockerfile_inputs) -> str:
+    """Regenerate the Dockerfile a failed build used, truncated.
+
+    Build contexts are streamed from memory, so there is no file on disk to read.
+    """
+    text = generate_dockerfile(**dockerfile_inputs)
     if max_chars and len(text) > max_chars:
         return text[:max_chars] + "\n... (truncated)"
     return text
@@ -746,54 +893,125 @@ def _format_build_error_context(error_output: str, dockerfile_text: str) -> str:
     return "\n\n".join(parts).strip()
 
 
-def _build_project_image(store: ConfigStore, project, agent) -> str:
-    """Build the adapted project image. Returns error output on failure, empty string on success."""
+def _project_build_inputs(store: ConfigStore, project, agent) -> dict:
+    """Return the image name and build_image inputs for the adapted project image."""
     g = store.load_global()
     image_name_base = g.get("imageName", "skua-base")
-    image_name = image_name_for_project(image_name_base, project)
-    if image_exists(image_name):
-        print(f"Image already exists: {image_name}")
-        return ""
-
-    container_dir = store.get_container_dir()
-    if container_dir is None:
-        print("Error: Cannot find container build assets (entrypoint.sh).")
-        print("Set toolDir in global.yaml or reinstall skua.")
-        sys.exit(1)
-
-    base_image = g.get("baseImage", "debian:bookworm-slim")
     image_config = g.get("image", {})
-    global_packages = image_config.get("extraPackages", [])
-    global_commands = image_config.get("extraCommands", [])
     resolved_base_image, extra_packages, extra_commands = resolve_project_image_inputs(
-        default_base_image=base_image,
+        default_base_image=g.get("baseImage", "debian:bookworm-slim"),
         agent=agent,
         project=project,
-        global_extra_packages=global_packages,
-        global_extra_commands=global_commands,
+        global_extra_packages=image_config.get("extraPackages", []),
+        global_extra_commands=image_config.get("extraCommands", []),
     )
     defaults = g.get("defaults", {})
-    build_security_name = defaults.get("security", "open")
-    build_security = store.load_security(build_security_name)
+    return {
+        "image_name": image_name_for_project(image_name_base, project),
+        "security": store.load_security(defaults.get("security", "open")),
+        "base_image": resolved_base_image,
+        "extra_packages": extra_packages,
+        "extra_commands": extra_commands,
+        "content_base": content_tag_base(image_name_base, image_config, project),
+        "image_config": image_config,
+    }
+
+
+def _build_project_image(store: ConfigStore, project, agent, log=print) -> str:
+    """Build the adapted project image. Returns error output on failure, empty string on success."""
+    inputs = _project_build_inputs(store, project, agent)
+    image_name = inputs["image_name"]
+    if image_exists(image_name):
+        log(f"Image already exists: {image_name}")
+        return ""
 
-    print(f"Building image: {image_name}")
-    print(f"  Base image: {resolved_base_image}")
-    if extra_packages:
-        print(f"  Packages:   {', '.join(extra_packages)}")
+    container_dir = store.get_container_dir()
+    if container_dir is None:
+        return "Cannot find container build assets (entrypoint.sh). Set toolDir in global.yaml or reinstall skua."
+
+    image_config = inputs["image_config"]
+    log(f"Building image: {image_name}")
+    log(f"  Base image: {inputs['base_image']}")
+    if inputs["extra_packages"]:
+        log(f"  Packages:   {', '.join(inputs['extra_packages'])}")
     success, error_output = build_image(
         container_dir=container_dir,
         image_name=image_name,
-        security=build_security,
+        security=inputs["security"],
         agent=agent,
-        base_image=resolved_base_image,
-        extra_packages=extra_packages,
-        extra_commands=extra_commands,
+        base_image=inputs["base_image"],
+        extra_packages=inputs["extra_packages"],
+        extra_commands=inputs["extra_commands"],
         quiet=True,
+        content_base=inputs["content_base"],
+        **build_cache_options(image_config),
     )
     if not success:
-        print(f"[adapt] Image build failed: {image_name}")
-        dockerfile_text = _read_last_dockerfile(container_dir)
+        log(f"[adapt] Image build failed: {image_name}")
+        dockerfile_text = _failed_dockerfile_text(
+            agent=agent,
+            security=inputs["security"],
+            base_image=inputs["base_image"],
+            extra_packages=inputs["extra_packages"],
+            extra_commands=inputs["extra_commands"],
+            buildkit=build_cache_options(image_config)["buildkit"],
+        )
         context = _format_build_error_context(error_output or "Docker build failed.", dockerfile_text)
         return context or "Docker build failed."
-    print(f"Image ready: {image_name}")
+    log(f"Image ready: {image_name}")
     return ""
+
+
+def _build_adapted_images(store: ConfigStore, targets: list, jobs: int = 1) -> dict:
+    """Build images for [(project, agent)] targets, up to jobs at a time.
+
+    Targets with the same build context are built once and the other image
+    names are tagged from the result. Each build's output is buffered and
+    printed as one block, prefixed with the project name, when it finishes.
+    Returns {project_name: error}, where error is "" on success.
+    """
+    container_dir = store.get_container_dir()
+    if container_dir is None:
+        raise AdaptError("Cannot find container build assets (entrypoint.sh). Set toolDir in global.yaml.")
+
+    groups = {}
+    for project, agent in targets:
+        inputs = _project_build_inputs(store, project, agent)
+        key = compute_build_context_hash(
+            container_dir=container_dir,
+            security=inputs["security"],
+            agent=agent,
+            base_image=inputs["base_image"],
+            extra_packages=inputs["extra_packages"],
+            extra_commands=inputs["extra_commands"],
+        )
+        groups.setdefault(key, []).append((project, agent, inputs["image_name"]))
+
+    print_lock = threading.Lock()
+
+    def _build_group(members: list) -> dict:
+        leader, agent, leader_image = members[0]
+        lines = []
+        try:
+            error = _build_project_image(store, leader, agent, log=lines.append)
+        except Exception as exc:  # one crashed build must not stop the others
+            error = str(exc) or type(exc).__name__
+        results = {leader.name: error}
+        for project, _, image_name in members[1:]:
+            if error:
+                results[project.name] = error
+            elif image_name == leader_image or image_exists(image_name) or tag_image(leader_image, image_name):
+                lines.append(f"Image ready: {image_name} (same build as '{leader.name}')")
+                results[project.name] = ""
+            else:
+                results[project.name] = f"Failed to tag '{leader_image}' as '{image_name}'."
+        with print_lock:
+            for line in lines:
+                print(f"[{leader.name}] {line}", flush=True)
+        return results
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for future in as_completed([pool.submit(_build_group, members) for members in groups.values()]):
+            results.update(future.result())
+    return results
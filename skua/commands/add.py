@@ -10,6 +10,7 @@ from skua.commands.credential import agent_default_source_dir, resolve_credentia
 from skua.config import ConfigStore, Credential, Project
 from skua.config.resources import ProjectGitSpec, ProjectSshSpec, ProjectImageSpec
 from skua.project_adapt import ADAPT_GUIDE_NAME, ensure_adapt_workspace
+from skua.ssh_mux import ssh_argv
 from skua.utils import find_ssh_keys, parse_ssh_config_hosts, select_option
 
 
@@ -38,12 +39,10 @@ def cmd_add(args):
         print("Error: --dir and --repo are mutually exclusive. Specify one or the other.")
         sys.exit(1)
 
-    # --host requires --repo and is incompatible with --dir
-    if host and args.dir:
-        print("Error: --host and --dir are mutually exclusive. Use --repo for remote projects.")
-        sys.exit(1)
-    if host and not repo_url:
-        print("Error: --host requires --repo. Remote projects must specify a git repository URL.")
+    # --host needs --repo (cloned on the host) or --dir (synced to the host)
+    if host and not repo_url and not args.dir:
+        print("Error: --host requires --repo or --dir. Remote projects clone a git repository")
+        print("  or sync a local directory into a volume on the host.")
         sys.exit(1)
 
     # Validate SSH config host
@@ -202,7 +201,7 @@ def cmd_add(args):
         vol_name = f"skua-{name}-repo"
         print(f"Creating Docker volume '{vol_name}' on {host}...")
         result = subprocess.run(
-            ["ssh", host, "docker", "volume", "create", vol_name],
+            ssh_argv(host, "docker", "volume", "create", vol_name),
             capture_output=True, text=True,
         )
         if result.returncode != 0:
@@ -215,8 +214,8 @@ def cmd_add(args):
     if host:
         _print_summary_attr("Host", f"{host} (remote)")
     _print_summary_attr("Repo", repo_url)
-    if not host:
-        _print_summary_attr("Directory", project_dir)
+    if not host or project_dir:
+        _print_summary_attr("Directory", f"{project_dir} (synced)" if host else project_dir)
     _print_summary_attr("Environment", env_name)
     _print_summary_attr("Security", sec_name)
     _print_summary_attr("Agent", agent_name)
@@ -230,6 +229,10 @@ def cmd_add(args):
     # Auto-validate
     _try_validate(store, project)
 
+    if not host:
+        from skua.commands.run import precreate_containers
+        precreate_containers(store, [name])
+
 
 def _cred_matches_agent(store, cred_name: str, agent_name: str) -> bool:
     """Return True if the credential is compatible with the given agent."""
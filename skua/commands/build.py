@@ -1,10 +1,15 @@
 # SPDX-License-Identifier: BUSL-1.1
 """skua build — ensure required project Docker images exist."""
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from skua.config import ConfigStore
 from skua.docker import (
+    build_cache_options,
     build_image,
+    content_tag_base,
     image_exists,
     image_matches_build_context,
     image_name_for_project,
@@ -22,6 +27,122 @@ def _required_projects(store: ConfigStore) -> list:
     return required
 
 
+def _plan_build_order(jobs: list) -> dict:
+    """Return {image: (hard_deps, soft_deps)} for a set of build jobs.
+
+    Hard deps: the job's resolved base image is another image in this run
+    (e.g. a project fromImage pointing at a skua image) and must be built first.
+    Soft deps: jobs sharing (base image, agent) share their leading Dockerfile
+    layers, so the first job of each group is built first to warm the layer
+    cache and the rest follow concurrently. A failed leader does not block them.
+    """
+    images = {job["image"] for job in jobs}
+    leaders = {}
+    plan = {}
+    for job in jobs:
+        hard = {job["base_image"]} & images
+        hard.discard(job["image"])
+        group = (job["base_image"], job["agent"].name)
+        leader = leaders.setdefault(group, job["image"])
+        soft = {leader} if leader != job["image"] else set()
+        plan[job["image"]] = (hard, soft - hard)
+    return plan
+
+
+def _run_build_jobs(jobs: list, build_one, max_jobs: int = 1) -> dict:
+    """Run build jobs in dependency order with up to max_jobs concurrent builds.
+
+    build_one(job) returns (success, output). Returns {image: (status, detail)}
+    where status is "ok", "failed", or "skipped". A failure only skips jobs
+    that use the failed image as their base.
+    """
+    plan = _plan_build_order(jobs)
+    by_image = {job["image"]: job for job in jobs}
+    order = [job["image"] for job in jobs]
+    results = {}
+    total = len(jobs)
+    started = {}
+    indices = {}
+    print_lock = threading.Lock()
+
+    def _log(message: str):
+        with print_lock:
+            print(message, flush=True)
+
+    def _ready(image: str):
+        hard, soft = plan[image]
+        if any(dep not in results for dep in hard | soft):
+            return None
+        failed_base = [dep for dep in hard if results[dep][0] != "ok"]
+        return failed_base[0] if failed_base else ""
+
+    def _start(image: str):
+        job = by_image[image]
+        index = indices[image] = len(started) + 1
+        started[image] = time.monotonic()
+        verb = "rebuilding" if job["rebuild"] else "building"
+        _log(f"[{index}/{total}] {verb} '{image}' (project: {job['project'].name})...")
+
+    def _finish(image: str, success: bool, output: str):
+        index = indices[image]
+        elapsed = time.monotonic() - started[image]
+        if success:
+            results[image] = ("ok", "")
+            _log(f"[{index}/{total}] done '{image}' ({elapsed:.1f}s)")
+        else:
+            results[image] = ("failed", output)
+            _log(f"[{index}/{total}] FAILED '{image}' ({elapsed:.1f}s)")
+
+    def _skip_blocked():
+        for image in order:
+            if image in results:
+                continue
+            blocker = _ready(image)
+            if blocker:
+                results[image] = ("skipped", f"base image '{blocker}' failed to build")
+                _log(f"[-/{total}] skipped '{image}': base image '{blocker}' failed to build")
+
+    if max_jobs <= 1:
+        pending = list(order)
+        while pending:
+            _skip_blocked()
+            pending = [image for image in pending if image not in results]
+            runnable = [image for image in pending if _ready(image) == ""]
+            if not runnable:
+                break
+            image = runnable[0]
+            _start(image)
+            try:
+                success, output = build_one(by_image[image])
+            except Exception as exc:  # a crashed build must not stop the others
+                success, output = False, str(exc)
+            _finish(image, success, output)
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_jobs) as pool:
+        running = {}
+        while True:
+            _skip_blocked()
+            for image in order:
+                if len(running) >= max_jobs:
+                    break
+                if image in results or image in running.values() or _ready(image) != "":
+                    continue
+                _start(image)
+                running[pool.submit(build_one, by_image[image])] = image
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                image = running.pop(future)
+                try:
+                    success, output = future.result()
+                except Exception as exc:  # a crashed build must not stop the others
+                    success, output = False, str(exc)
+                _finish(image, success, output)
+    return results
+
+
 def cmd_build(args):
     store = ConfigStore()
 
@@ -81,10 +202,8 @@ def cmd_build(args):
     print(f"  Source:      {container_dir}")
     print()
 
-    built = []
-    rebuilt = []
+    jobs = []
     existing = []
-    failed = []
     seen_images = set()
     for project, agent in project_specs:
         image_name = image_name_for_project(image_name_base, project)
@@ -120,28 +239,66 @@ def cmd_build(args):
                 f"-> Image '{image_name}' missing; building for project "
                 f"'{project.name}' (agent '{agent.name}') from '{resolved_base_image}'..."
             )
-        success, _ = build_image(
+        jobs.append({
+            "image": image_name,
+            "project": project,
+            "agent": agent,
+            "base_image": resolved_base_image,
+            "extra_packages": extra_packages,
+            "extra_commands": extra_commands,
+            "rebuild": needs_rebuild,
+            "content_base": content_tag_base(image_name_base, image_config, project),
+        })
+
+    max_jobs = max(1, int(getattr(args, "jobs", 1) or 1))
+    verbose = bool(getattr(args, "verbose", False))
+
+    cache_options = build_cache_options(image_config)
+
+    def _build_one(job):
+        return build_image(
             container_dir=container_dir,
-            image_name=image_name,
+            image_name=job["image"],
             security=security,
-            agent=agent,
-            base_image=resolved_base_image,
-            extra_packages=extra_packages,
-            extra_commands=extra_commands,
-            verbose=getattr(args, "verbose", False),
+            agent=job["agent"],
+            base_image=job["base_image"],
+            extra_packages=job["extra_packages"],
+            extra_commands=job["extra_commands"],
+            # Concurrent builds cannot share the terminal progress bar.
+            quiet=max_jobs > 1,
+            verbose=verbose and max_jobs == 1,
+            show_failure=max_jobs == 1,
+            content_base=job.get("content_base", ""),
+            **cache_options,
         )
-        if success:
-            if needs_rebuild:
-                rebuilt.append(image_name)
-            else:
-                built.append(image_name)
-        else:
-            failed.append(image_name)
+
+    results = _run_build_jobs(jobs, _build_one, max_jobs=max_jobs) if jobs else {}
+    built = [job["image"] for job in jobs if results.get(job["image"], ("",))[0] == "ok" and not job["rebuild"]]
+    rebuilt = [job["image"] for job in jobs if results.get(job["image"], ("",))[0] == "ok" and job["rebuild"]]
+    failed = [
+        (job["image"], results.get(job["image"], ("failed", ""))) for job in jobs
+        if results.get(job["image"], ("failed",))[0] != "ok"
+    ]
 
     if failed:
+        if existing or built or rebuilt:
+            print("\nBuild succeeded for:")
+            for name in existing:
+                print(f"  - {name} (existing)")
+            for name in built:
+                print(f"  - {name} (built)")
+            for name in rebuilt:
+                print(f"  - {name} (rebuilt)")
         print("\nBuild failed for:")
-        for name in failed:
+        for name, (status, detail) in failed:
+            if status == "skipped":
+                print(f"  - {name} (skipped: {detail})")
+                continue
             print(f"  - {name}")
+            lines = [line.rstrip() for line in (detail or "").splitlines() if line.strip()]
+            if max_jobs > 1:
+                for line in lines[-12:]:
+                    print(f"      {line}")
         sys.exit(1)
 
     print("\nBuild complete:")
@@ -152,3 +309,6 @@ def cmd_build(args):
     for name in rebuilt:
         print(f"  - {name} (rebuilt)")
     print("Use 'skua adapt <name>' to apply project image-request updates before running.")
+
+    from skua.commands.run import precreate_containers
+    precreate_containers(store, [project.name for project, _ in project_specs])
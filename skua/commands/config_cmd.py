@@ -11,6 +11,7 @@ def cmd_config(args):
     g = store.load_global()
     git = g.setdefault("git", {})
     defaults = g.setdefault("defaults", {})
+    run = g.setdefault("run", {})
     changed = False
 
     if args.git_name:
@@ -19,6 +20,22 @@ def cmd_config(args):
     if args.git_email:
         git["email"] = args.git_email
         changed = True
+    if getattr(args, "git_fetch_ttl", None) is not None:
+        git["fetchTtl"] = max(0, args.git_fetch_ttl)
+        changed = True
+    if getattr(args, "remote_clone_filter", None) is not None:
+        value = args.remote_clone_filter.strip()
+        git["remoteFilter"] = "" if value == "none" else value
+        changed = True
+    if getattr(args, "remote_clone_depth", None) is not None:
+        git["remoteDepth"] = max(0, args.remote_clone_depth)
+        changed = True
+    if getattr(args, "remote_mirror", None):
+        git["remoteMirror"] = args.remote_mirror == "on"
+        changed = True
+    if getattr(args, "precreate", None):
+        run["precreate"] = args.precreate == "on"
+        changed = True
     if args.tool_dir:
         p = Path(args.tool_dir).expanduser().resolve()
         if not (p / "Dockerfile").exists():
@@ -49,6 +66,11 @@ def cmd_config(args):
     print(f"\nGlobal config ({store.global_file}):")
     print(f"  git.name:            {git.get('name', '(not set)')}")
     print(f"  git.email:           {git.get('email', '(not set)')}")
+    print(f"  git.fetchTtl:        {git.get('fetchTtl', 300)}s")
+    print(f"  git.remoteFilter:    {git.get('remoteFilter') or '(none)'}")
+    print(f"  git.remoteDepth:     {git.get('remoteDepth') or '(full)'}")
+    print(f"  git.remoteMirror:    {'on' if git.get('remoteMirror') else 'off'}")
+    print(f"  run.precreate:       {'on' if run.get('precreate') else 'off'}")
     print(f"  toolDir:             {g.get('toolDir', '(auto-detect)')}")
     print(f"  imageName:           {g.get('imageName', 'skua-base')}")
     print(f"  defaults.sshKey:     {defaults.get('sshKey', '(not set)')}")
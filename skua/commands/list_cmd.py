@@ -1,16 +1,20 @@
 # SPDX-License-Identifier: BUSL-1.1
 """skua list — list projects and running containers."""
 
+import json
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlsplit
 
 from skua.config import ConfigStore
 from skua.docker import (
-    get_running_skua_containers,
-    image_exists,
+    DockerState,
     image_matches_build_context,
     image_name_for_project,
+    load_docker_state,
     resolve_project_image_inputs,
 )
 from skua.project_adapt import image_request_path, load_image_request, request_changes_project
@@ -82,12 +86,16 @@ def _has_pending_adapt_request(project) -> bool:
     return request_changes_project(project, request)
 
 
-def _git_status(project, store: ConfigStore) -> str:
-    """Return git status for repo projects: BEHIND/AHEAD/UNCLEAN/CURRENT."""
+DEFAULT_GIT_FETCH_TTL = 300
+GIT_PROBE_WORKERS = 8
+
+
+def _git_repo_dir(project, store: ConfigStore):
+    """Return the local clone for a repo project, or None when there is none."""
     if not project or not getattr(project, "repo", ""):
-        return ""
+        return None
     if getattr(project, "host", ""):
-        return ""
+        return None
 
     repo_dir = None
     if project.directory:
@@ -99,27 +107,71 @@ def _git_status(project, store: ConfigStore) -> str:
         if candidate.is_dir():
             repo_dir = candidate
     if repo_dir is None:
-        return ""
+        return None
     if not (repo_dir / ".git").exists():
-        return ""
+        return None
+    return repo_dir
+
+
+def _git_fetch_cache_path(store: ConfigStore) -> Path:
+    return store.config_dir / "cache" / "git-fetch.json"
+
+
+def _load_git_fetch_cache(store: ConfigStore) -> dict:
+    """Return {repo_dir: last successful fetch epoch} from the cache file."""
+    try:
+        data = json.loads(_git_fetch_cache_path(store).read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_git_fetch_cache(store: ConfigStore, cache: dict):
+    path = _git_fetch_cache_path(store)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache, indent=2, sort_keys=True))
+        tmp.replace(path)
+    except OSError:
+        pass
+
+
+def _git_fetch_ttl(store: ConfigStore) -> float:
+    """Return git.fetchTtl (seconds) from global config."""
+    value = (store.load_global().get("git") or {}).get("fetchTtl", DEFAULT_GIT_FETCH_TTL)
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return float(DEFAULT_GIT_FETCH_TTL)
+
 
+def _git_status(repo_dir: Path, fetch: bool = True) -> tuple:
+    """Return (status, fetched) for a local clone: BEHIND/AHEAD/UNCLEAN/CURRENT.
+
+    When fetch is False the comparison uses the existing remote-tracking refs.
+    fetched is True only when a `git fetch` ran and succeeded.
+    """
     try:
         dirty = subprocess.run(
             ["git", "-C", str(repo_dir), "status", "--porcelain"],
             capture_output=True, text=True, timeout=5,
         )
         if dirty.stdout.strip():
-            return "UNCLEAN"
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return ""
-
-    try:
-        subprocess.run(
-            ["git", "-C", str(repo_dir), "fetch", "--quiet", "--prune"],
-            capture_output=True, text=True, timeout=10,
-        )
+            return "UNCLEAN", False
     except (FileNotFoundError, subprocess.TimeoutExpired):
-        return ""
+        return "", False
+
+    fetched = False
+    if fetch:
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(repo_dir), "fetch", "--quiet", "--prune"],
+                capture_output=True, text=True, timeout=10,
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return "", False
+        fetched = result.returncode == 0
 
     try:
         ahead_behind = subprocess.run(
@@ -127,50 +179,69 @@ def _git_status(project, store: ConfigStore) -> str:
             capture_output=True, text=True, timeout=5,
         )
     except (FileNotFoundError, subprocess.TimeoutExpired):
-        return ""
+        return "", fetched
 
     if ahead_behind.returncode != 0:
-        return "CURRENT"
+        return "CURRENT", fetched
 
     parts = ahead_behind.stdout.strip().split()
     if len(parts) >= 2:
         behind = int(parts[0])
         ahead = int(parts[1])
         if behind > 0 and ahead > 0:
-            return "DIVERGED"
+            return "DIVERGED", fetched
         if behind > 0:
-            return "BEHIND"
+            return "BEHIND", fetched
         if ahead > 0:
-            return "AHEAD"
-    return "CURRENT"
+            return "AHEAD", fetched
+    return "CURRENT", fetched
 
 
-def _container_image_id(container_name: str, host: str = "") -> str:
-    """Return image ID used by a container, or empty string."""
-    cmd = ["docker", "inspect", "--format", "{{.Image}}", container_name]
-    if host:
-        cmd = ["ssh", host, *cmd]
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return ""
-    if result.returncode != 0:
-        return ""
-    return result.stdout.strip()
-
+def _git_statuses(projects: list, store: ConfigStore, refresh: bool = False) -> dict:
+    """Probe git status for all repo projects concurrently.
 
-def _container_image_name(container_name: str, host: str = "") -> str:
-    """Return image name recorded on the container, or empty string."""
-    cmd = ["docker", "inspect", "--format", "{{.Config.Image}}", container_name]
-    if host:
-        cmd = ["ssh", host, *cmd]
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return ""
-    if result.returncode != 0:
-        return ""
-    return result.stdout.strip()
+    A repo is fetched only when its last successful fetch (recorded under
+    the config dir) is older than git.fetchTtl, or when refresh is set.
+    Returns {project name: status}.
+    """
+    repo_dirs = {}
+    for name, project in projects:
+        repo_dir = _git_repo_dir(project, store)
+        if repo_dir is not None:
+            repo_dirs[name] = repo_dir
+    if not repo_dirs:
+        return {}
+
+    cache = _load_git_fetch_cache(store)
+    ttl = _git_fetch_ttl(store)
+    now = time.time()
+
+    def _needs_fetch(repo_dir: Path) -> bool:
+        if refresh:
+            return True
+        try:
+            last = float(cache.get(str(repo_dir), 0))
+        except (TypeError, ValueError):
+            last = 0.0
+        return now - last >= ttl
+
+    names = list(repo_dirs)
+    with ThreadPoolExecutor(max_workers=min(GIT_PROBE_WORKERS, len(names))) as pool:
+        results = list(pool.map(
+            lambda name: _git_status(repo_dirs[name], fetch=_needs_fetch(repo_dirs[name])),
+            names,
+        ))
+
+    statuses = {}
+    fetched_any = False
+    for name, (status, fetched) in zip(names, results):
+        statuses[name] = status
+        if fetched:
+            cache[str(repo_dirs[name])] = now
+            fetched_any = True
+    if fetched_any:
+        _save_git_fetch_cache(store, cache)
+    return statuses
 
 
 def _short_image_id(image_id: str) -> str:
@@ -182,35 +253,9 @@ def _short_image_id(image_id: str) -> str:
         cleaned = cleaned[7:]
     return cleaned[:12]
 
-def _container_image_name(container_name: str, host: str = "") -> str:
-    """Return image name recorded on the container, or empty string."""
-    cmd = ["docker", "inspect", "--format", "{{.Config.Image}}", container_name]
-    if host:
-        cmd = ["ssh", host, *cmd]
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return ""
-    if result.returncode != 0:
-        return ""
-    return result.stdout.strip()
-
-def _image_id(image_name: str, host: str = "") -> str:
-    """Return image ID for an image name, or empty string."""
-    cmd = ["docker", "image", "inspect", "--format", "{{.Id}}", image_name]
-    if host:
-        cmd = ["ssh", host, *cmd]
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return ""
-    if result.returncode != 0:
-        return ""
-    return result.stdout.strip()
-
 
-def _image_suffix(project, store: ConfigStore) -> tuple:
-    """Return (suffix, flags) for image status."""
+def _image_suffix(project, store: ConfigStore, state: DockerState) -> tuple:
+    """Return (suffix, flags) for image status, reading image state from a snapshot."""
     if not project:
         return "", set()
 
@@ -221,16 +266,16 @@ def _image_suffix(project, store: ConfigStore) -> tuple:
     g = store.load_global()
     image_name_base = g.get("imageName", "skua-base")
     image_name = image_name_for_project(image_name_base, project)
-    if image_exists(image_name):
+    if state.image_exists(image_name):
         container_dir = store.get_container_dir()
         if container_dir is None:
-            return "".join(flags)
+            return "".join(flags), flags
         defaults = g.get("defaults", {})
         security_name = defaults.get("security", "open")
         security = store.load_security(security_name)
         agent = store.load_agent(project.agent)
         if agent is None or security is None:
-            return "".join(flags)
+            return "".join(flags), flags
         image_config = g.get("image", {})
         global_packages = image_config.get("extraPackages", [])
         global_commands = image_config.get("extraCommands", [])
@@ -250,6 +295,7 @@ def _image_suffix(project, store: ConfigStore) -> tuple:
             base_image=resolved_base_image,
             extra_packages=extra_packages,
             extra_commands=extra_commands,
+            state=state,
         ):
             flags.add("(B)")
 
@@ -257,10 +303,40 @@ def _image_suffix(project, store: ConfigStore) -> tuple:
     return "".join(ordered), flags
 
 
+HOST_QUERY_DEADLINE = 8.0
+
+
+def _load_host_states(hosts: list, deadline: float = HOST_QUERY_DEADLINE) -> dict:
+    """Snapshot Docker state on every host concurrently, bounded by one deadline.
+
+    Hosts that have not answered when the deadline passes get an unreachable
+    DockerState. Each worker's docker/ssh calls share the time left and are
+    killed when it runs out; workers are daemon threads besides.
+    """
+    results = {}
+    end = time.monotonic() + deadline
+
+    def _worker(host: str):
+        results[host] = load_docker_state(host=host, timeout=end - time.monotonic())
+
+    threads = []
+    for host in hosts:
+        thread = threading.Thread(target=_worker, args=(host,), daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    for thread in threads:
+        thread.join(max(0.0, end - time.monotonic()))
+
+    return {
+        host: results.get(host) or DockerState(host=host, reachable=False)
+        for host in hosts
+    }
+
+
 def cmd_list(args):
     store = ConfigStore()
     project_names = store.list_resources("Project")
-    running_by_host = {"": set(get_running_skua_containers())}
     show_agent = bool(getattr(args, "agent", False))
     show_security = bool(getattr(args, "security", False))
     show_git = bool(getattr(args, "git", False))
@@ -278,30 +354,38 @@ def cmd_list(args):
     if local_only:
         projects = [(name, p) for name, p in projects if not getattr(p, "host", "")]
 
-    def _running_for_host(host: str) -> set:
-        normalized = host or ""
-        if normalized not in running_by_host:
-            running_by_host[normalized] = set(get_running_skua_containers(host=normalized))
-        return running_by_host[normalized]
+    hosts = [""]
+    for _, project in projects:
+        host = getattr(project, "host", "") or ""
+        if host not in hosts:
+            hosts.append(host)
+    deadline = float(getattr(args, "timeout", None) or HOST_QUERY_DEADLINE)
+    states_by_host = _load_host_states(hosts, deadline=deadline)
+
+    def _state_for_host(host: str) -> DockerState:
+        return states_by_host[host or ""]
 
     show_host = any(getattr(p, "host", "") for _, p in projects)
+    git_values = {}
+    if show_git:
+        git_values = _git_statuses(projects, store, refresh=bool(getattr(args, "refresh", False)))
     needs_running_image = False
     running_image_values = {}
     if show_image:
         for name, project in projects:
             container_name = f"skua-{name}"
-            host = getattr(project, "host", "") or ""
-            if container_name not in _running_for_host(host):
+            state = _state_for_host(getattr(project, "host", "") or "")
+            if not state.is_running(container_name):
                 running_image_values[name] = "-"
                 continue
             img_name = image_name_for_project(image_name_base, project)
-            project_id = _image_id(img_name, host=host)
-            container_id = _container_image_id(container_name, host=host)
+            project_id = state.image_id(img_name)
+            container_id = state.container_image_id(container_name)
             if project_id and container_id and project_id == container_id:
                 running_image_values[name] = "-"
                 continue
             display_id = _short_image_id(container_id)
-            running_name = display_id or _container_image_name(container_name, host=host) or "-"
+            running_name = display_id or state.container_image_name(container_name) or "-"
             running_image_values[name] = running_name
             if running_name != "-":
                 needs_running_image = True
@@ -320,7 +404,7 @@ def cmd_list(args):
         columns.extend([("AGENT", 10), ("CREDENTIAL", 20)])
     if show_security:
         columns.extend([("SECURITY", 12), ("NETWORK", 10)])
-    columns.append(("STATUS", 10))
+    columns.append(("STATUS", 11))
 
     print(" ".join(f"{title:<{width}}" for title, width in columns))
     print("-" * (sum(width for _, width in columns) + (len(columns) - 1)))
@@ -330,14 +414,15 @@ def cmd_list(args):
     needs_build = False
     for name, project in projects:
         container_name = f"skua-{name}"
-        host = getattr(project, "host", "") or ""
-        running = _running_for_host(host)
+        state = _state_for_host(getattr(project, "host", "") or "")
         pending_adapt = _has_pending_adapt_request(project)
         img_name = image_name_for_project(image_name_base, project)
-        if container_name in running:
+        if not state.reachable:
+            status = "unreachable"
+        elif state.is_running(container_name):
             status = "running"
         else:
-            status = "built" if image_exists(img_name) else "missing"
+            status = "built" if state.image_exists(img_name) else "missing"
         if pending_adapt:
             status += "*"
             pending_count += 1
@@ -347,10 +432,10 @@ def cmd_list(args):
             row.append(f"{_format_host(project):<14}")
         row.append(f"{_format_source(project):<38}")
         if show_git:
-            git_status = _git_status(project, store) or "-"
+            git_status = git_values.get(name) or "-"
             row.append(f"{git_status:<9}")
         if show_image:
-            suffix, flags = _image_suffix(project, store)
+            suffix, flags = _image_suffix(project, store, state)
             if "(A)" in flags:
                 needs_adapt = True
             if "(B)" in flags:
@@ -368,18 +453,25 @@ def cmd_list(args):
             network = env.network.mode if env else "?"
             row.extend([f"{project.security:<12}", f"{network:<10}"])
 
-        row.append(f"{status:<10}")
+        row.append(f"{status:<11}")
         print(" ".join(row))
 
     print()
     running_count = 0
     for name, project in projects:
-        host = getattr(project, "host", "") or ""
-        if f"skua-{name}" in _running_for_host(host):
+        if _state_for_host(getattr(project, "host", "") or "").is_running(f"skua-{name}"):
             running_count += 1
     print(f"{len(project_names)} project(s), {running_count} running, {pending_count} pending adapt")
     if pending_count:
         print("  * pending image-request changes")
+    unreachable = [
+        host for host in hosts
+        if not states_by_host[host].reachable
+        and any((getattr(p, "host", "") or "") == host for _, p in projects)
+    ]
+    if unreachable:
+        labels = ", ".join(host or "local" for host in unreachable)
+        print(f"  unreachable: no Docker response within {deadline:g}s from {labels}")
     if show_image and (needs_adapt or needs_build):
         if needs_adapt:
             print("  (A) image-request changes pending; run 'skua adapt'")
@@ -6,7 +6,8 @@ import subprocess
 import sys
 
 from skua.config import ConfigStore
-from skua.docker import is_container_running, image_name_for_project
+from skua.docker import image_name_for_project, inspect_container_state, is_container_running
+from skua.remote_sync import sync_state_file
 from skua.utils import confirm
 
 
@@ -54,10 +55,13 @@ def cmd_remove(args):
         else:
             print(f"Error: Container '{container_name}' is running. Stop it first.")
             sys.exit(1)
+    elif not host and inspect_container_state(container_name):
+        # Stopped container pre-created for fast starts (run.precreate).
+        _run_docker_remove(["docker", "rm", container_name], f"container '{container_name}'")
 
     if host:
         auth_vol = f"skua-{name}-{project.agent}"
-        repo_vol = f"skua-{name}-repo" if project.repo else ""
+        repo_vol = f"skua-{name}-repo" if project.repo or project.directory else ""
         image_base = store.load_global().get("imageName", "skua-base")
         image_name = image_name_for_project(image_base, project)
 
@@ -73,6 +77,7 @@ def cmd_remove(args):
             _run_docker_remove(["docker", "volume", "rm", auth_vol], f"remote volume '{auth_vol}'")
             if repo_vol:
                 _run_docker_remove(["docker", "volume", "rm", repo_vol], f"remote volume '{repo_vol}'")
+                sync_state_file(store.config_dir, name).unlink(missing_ok=True)
             _run_docker_remove(["docker", "image", "rm", "-f", image_name], f"remote image '{image_name}'")
     else:
         # Offer to clean local data
@@ -9,25 +9,48 @@ import sys
 import json
 import shlex
 import base64
+import hashlib
+import io
+import tarfile
 import tempfile
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from skua.config import ConfigStore, validate_project
 from skua.commands.credential import resolve_credential_sources, agent_default_source_dir
 from skua.docker import (
+    add_tar_member,
+    build_cache_options,
     is_container_running,
     exec_into_container,
     build_run_command,
     build_image,
+    container_config_hash,
+    container_create_command,
+    content_tag_base,
+    entrypoint_timings,
     image_exists,
+    image_id,
     image_name_for_project,
+    inspect_container_state,
+    remove_container,
     resolve_project_image_inputs,
-    start_container,
+    start_detached_container,
+    start_existing_container,
     wait_for_running_container,
     _project_mount_path,
 )
 from skua.project_adapt import ensure_adapt_workspace
+from skua import ssh_mux
+from skua.git_cache import clone_repo
+from skua.remote_sync import (
+    sync_directory_into_volume,
+    sync_options,
+    sync_repo_into_volume,
+    sync_state_file,
+)
+from skua.trace import span, traced
 
 
 def _is_snap_binary(path: str) -> bool:
@@ -174,6 +197,7 @@ def _enable_ssh_docker_wrapper(host: str):
     """Route `docker ...` calls through `ssh <host> docker ...` for this process."""
     wrapper_dir = Path(tempfile.mkdtemp(prefix="skua-ssh-docker-"))
     wrapper = wrapper_dir / "docker"
+    ssh_prefix = " ".join(shlex.quote(a) for a in ssh_mux.ssh_argv(host)[:-1])
     host_quoted = shlex.quote(host)
 
     wrapper.write_text(
@@ -186,7 +210,7 @@ def _enable_ssh_docker_wrapper(host: str):
         "    break\n"
         "  fi\n"
         "done\n"
-        f"exec ssh $tty_flag {host_quoted} docker \"$@\"\n"
+        f"exec {ssh_prefix} $tty_flag {host_quoted} docker \"$@\"\n"
     )
     wrapper.chmod(0o700)
 
@@ -197,6 +221,7 @@ def _enable_ssh_docker_wrapper(host: str):
     os.environ["SKUA_DOCKER_REMOTE_HOST"] = host
 
 
+@traced()
 def _configure_remote_docker_transport(host: str):
     """Try DOCKER_HOST transport first, then offer SSH wrapper fallback."""
     os.environ.pop("SKUA_DOCKER_TRANSPORT", None)
@@ -205,6 +230,7 @@ def _configure_remote_docker_transport(host: str):
     if selected_bin:
         print(f"Using docker CLI: {selected_bin}")
     os.environ["DOCKER_HOST"] = f"ssh://{host}"
+    ssh_mux.install_ssh_shim()
     print(f"Connecting to remote host '{host}' via DOCKER_HOST...")
 
     ok, err = _probe_current_docker_connection()
@@ -250,85 +276,7 @@ def _configure_remote_docker_transport(host: str):
         sys.exit(1)
 
 
-def _clone_repo_into_remote_volume(project, vol_name: str):
-    """Clone the project repo into a Docker named volume using alpine/git.
-
-    Requires the current process Docker transport to target the remote host.
-    Skips silently if the repo is already cloned in the volume.
-    """
-    check = subprocess.run(
-        [
-            "docker", "run", "--rm",
-            "-v", f"{vol_name}:/workspace",
-            "alpine", "sh", "-c",
-            "test -d /workspace/.git && echo cloned || echo empty",
-        ],
-        capture_output=True, text=True,
-    )
-    if check.returncode == 0 and "cloned" in check.stdout:
-        print(f"Using existing repo clone in volume '{vol_name}'.")
-        return
-
-    clone_env = os.environ.copy()
-    clone_env["SKUA_REMOTE_GIT_REPO"] = project.repo
-
-    ssh_cmd_parts = ["ssh", "-o", "StrictHostKeyChecking=accept-new"]
-    key_var = ""
-    known_hosts_var = ""
-    key_path_value = str(getattr(project.ssh, "private_key", "") or "").strip()
-    if key_path_value:
-        key_path = Path(key_path_value).expanduser()
-        if key_path.is_file():
-            key_b64 = base64.b64encode(key_path.read_bytes()).decode("ascii")
-            key_var = "SKUA_REMOTE_GIT_SSH_KEY_B64"
-            clone_env[key_var] = key_b64
-            ssh_cmd_parts.extend(["-i", "/tmp/skua-ssh/id_key", "-o", "IdentitiesOnly=yes"])
-
-            known_hosts_path = key_path.parent / "known_hosts"
-            if known_hosts_path.is_file():
-                known_hosts_b64 = base64.b64encode(known_hosts_path.read_bytes()).decode("ascii")
-                known_hosts_var = "SKUA_REMOTE_GIT_KNOWN_HOSTS_B64"
-                clone_env[known_hosts_var] = known_hosts_b64
-                ssh_cmd_parts.extend(["-o", "UserKnownHostsFile=/tmp/skua-ssh/known_hosts"])
-        else:
-            print(f"Warning: SSH key not found for remote clone: {key_path}")
-            print("  Falling back to remote host SSH defaults.")
-
-    setup_script = (
-        "set -eu\n"
-        "if [ -n \"${SKUA_REMOTE_GIT_SSH_KEY_B64:-}\" ]; then\n"
-        "  mkdir -p /tmp/skua-ssh\n"
-        "  printf '%s' \"$SKUA_REMOTE_GIT_SSH_KEY_B64\" | base64 -d > /tmp/skua-ssh/id_key\n"
-        "  chmod 600 /tmp/skua-ssh/id_key\n"
-        "fi\n"
-        "if [ -n \"${SKUA_REMOTE_GIT_KNOWN_HOSTS_B64:-}\" ]; then\n"
-        "  mkdir -p /tmp/skua-ssh\n"
-        "  printf '%s' \"$SKUA_REMOTE_GIT_KNOWN_HOSTS_B64\" | base64 -d > /tmp/skua-ssh/known_hosts\n"
-        "  chmod 600 /tmp/skua-ssh/known_hosts\n"
-        "fi\n"
-        f"export GIT_SSH_COMMAND={shlex.quote(' '.join(ssh_cmd_parts))}\n"
-        "git clone \"$SKUA_REMOTE_GIT_REPO\" /workspace\n"
-    )
-
-    clone_cmd = [
-        "docker", "run", "--rm",
-        "-v", f"{vol_name}:/workspace",
-        "-e", "SKUA_REMOTE_GIT_REPO",
-    ]
-    if key_var:
-        clone_cmd.extend(["-e", key_var])
-    if known_hosts_var:
-        clone_cmd.extend(["-e", known_hosts_var])
-    clone_cmd.extend(["--entrypoint", "sh", "alpine/git", "-lc", setup_script])
-
-    print(f"Cloning {project.repo} into remote volume '{vol_name}'...")
-    result = subprocess.run(clone_cmd, env=clone_env)
-    if result.returncode != 0:
-        print("Error: Failed to clone repository into remote volume.")
-        print("  Tip: Confirm repository access for the configured SSH key and remote host network reachability.")
-        sys.exit(1)
-
-
+@traced()
 def _seed_auth_from_host(data_dir: Path, cred, agent, overwrite: bool = False) -> int:
     """Seed missing auth files from the host into the container persistence directory.
 
@@ -348,48 +296,79 @@ def _seed_auth_from_host(data_dir: Path, cred, agent, overwrite: bool = False) -
     return copied
 
 
-def _seed_auth_into_remote_volume(project_name: str, agent_name: str, cred, agent, overwrite: bool = False) -> int:
-    """Seed auth files from local host into a remote Docker named volume."""
-    sources = resolve_credential_sources(cred, agent)
-    copied = 0
-    vol_name = f"skua-{project_name}-{agent_name}"
-
+# Helper script for _seed_auth_into_remote_volume. Reads a tar on stdin
+# holding files/<name> plus a manifest of "<sha256> <name>" lines, and
+# installs into /auth each file that is missing or (when overwriting) whose
+# checksum differs. Prints "synced <name>" per file written.
+_REMOTE_AUTH_SYNC_SCRIPT = """set -eu
+in=/tmp/skua-auth-in
+mkdir -p "$in"
+tar -xf - -C "$in"
+owner="$(stat -c %u:%g /auth/.)"
+while read -r sum name; do
+  [ -n "$name" ] || continue
+  dest="/auth/$name"
+  if [ -f "$dest" ]; then
+    [ "$SKUA_AUTH_OVERWRITE" = "1" ] || continue
+    [ "$(sha256sum "$dest" | cut -d' ' -f1)" = "$sum" ] && continue
+  fi
+  cp "$in/files/$name" "$dest.skua-tmp"
+  chmod 600 "$dest.skua-tmp"
+  chown "$owner" "$dest.skua-tmp"
+  mv -f "$dest.skua-tmp" "$dest"
+  rm -f /auth/.skua-setup-stamp
+  echo "synced $name"
+done < "$in/manifest"
+"""
+
+
+def _remote_auth_payload(sources) -> bytes:
+    """Return a tar of the existing credential files plus a checksum manifest."""
+    files = {}
     for src, dest_name in sources:
-        if not src.is_file():
-            continue
-
         safe_dest = Path(dest_name).name.strip()
-        if not safe_dest:
+        if not safe_dest or safe_dest in files or not src.is_file():
             continue
+        files[safe_dest] = src.read_bytes()
+    if not files:
+        return b""
 
-        if not overwrite:
-            exists = subprocess.run(
-                ["docker", "run", "--rm", "-v", f"{vol_name}:/auth", "alpine", "test", "-f", f"/auth/{safe_dest}"],
-                capture_output=True,
-                text=True,
-            )
-            if exists.returncode == 0:
-                continue
-
-        payload = base64.b64encode(src.read_bytes()).decode("ascii")
-        copy_env = os.environ.copy()
-        copy_env["SKUA_AUTH_DEST"] = safe_dest
-        copy_env["SKUA_AUTH_FILE_B64"] = payload
-        copy_cmd = [
-            "docker", "run", "--rm",
-            "-v", f"{vol_name}:/auth",
-            "-e", "SKUA_AUTH_DEST",
-            "-e", "SKUA_AUTH_FILE_B64",
-            "alpine", "sh", "-lc",
-            'set -eu; printf "%s" "$SKUA_AUTH_FILE_B64" | base64 -d > "/auth/$SKUA_AUTH_DEST"; chmod 600 "/auth/$SKUA_AUTH_DEST"',
-        ]
-        result = subprocess.run(copy_cmd, env=copy_env)
-        if result.returncode == 0:
-            copied += 1
-        else:
-            print(f"Warning: failed to sync remote auth file '{safe_dest}' into volume '{vol_name}'.")
+    manifest = "".join(f"{hashlib.sha256(data).hexdigest()} {name}\n" for name, data in files.items())
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        for name, data in files.items():
+            add_tar_member(tar, f"files/{name}", data, mode=0o600)
+        add_tar_member(tar, "manifest", manifest.encode("utf-8"))
+    return buf.getvalue()
 
-    return copied
+
+@traced()
+def _seed_auth_into_remote_volume(project_name: str, agent_name: str, cred, agent, overwrite: bool = False) -> int:
+    """Seed auth files from local host into a remote Docker named volume.
+
+    All files go through one helper container, so a remote run pays a single
+    container round trip however many credential files the agent has.
+    """
+    payload = _remote_auth_payload(resolve_credential_sources(cred, agent))
+    if not payload:
+        return 0
+
+    vol_name = f"skua-{project_name}-{agent_name}"
+    sync_cmd = [
+        "docker", "run", "--rm", "-i",
+        "-v", f"{vol_name}:/auth",
+        "-e", f"SKUA_AUTH_OVERWRITE={'1' if overwrite else '0'}",
+        "alpine", "sh", "-c", _REMOTE_AUTH_SYNC_SCRIPT,
+    ]
+    result = subprocess.run(sync_cmd, input=payload, capture_output=True)
+    if result.returncode != 0:
+        print(f"Warning: failed to sync remote auth files into volume '{vol_name}'.")
+        detail = result.stderr.decode("utf-8", errors="replace").strip()
+        if detail:
+            print(f"  {detail.splitlines()[-1]}")
+        return 0
+    stdout = result.stdout.decode("utf-8", errors="replace")
+    return sum(1 for line in stdout.splitlines() if line.startswith("synced "))
 
 
 def _parse_expiry_datetime(value):
@@ -534,6 +513,7 @@ def _run_local_login(login_cmd: str) -> bool:
     return True
 
 
+@traced()
 def _maybe_refresh_local_credentials(agent, cred) -> bool:
     """Prompt for local re-login if credentials look missing/stale."""
     reason = _credential_refresh_reason(cred, agent)
@@ -583,14 +563,147 @@ def _detached_run_command(docker_cmd: list) -> list:
     return cmd
 
 
-def cmd_run(args):
-    store = ConfigStore()
-    name = args.name
+def _print_entrypoint_timings(container_name: str):
+    """Print per-phase entrypoint durations recorded inside the container."""
+    timings = entrypoint_timings(container_name)
+    if not timings:
+        print("Entrypoint timings: not available (image predates timing support?)")
+        return
+    print(f"Entrypoint timings (total {timings.get('totalMs', 0)} ms):")
+    for phase in timings.get("phases", []):
+        note = "  (skipped, stamp current)" if phase.get("skipped") else ""
+        print(f"  {phase.get('phase', '?'):<12} {phase.get('ms', 0):>6} ms{note}")
+    print()
+
+
+def precreate_enabled(g: dict) -> bool:
+    """Return True when global.yaml sets run.precreate."""
+    return bool((g.get("run") or {}).get("precreate", False))
+
+
+def _start_precreated_container(container_name: str, detached_cmd: list, image_name: str) -> bool:
+    """Start the project's pre-created container, re-creating it if its config is stale."""
+    config_hash = container_config_hash(detached_cmd, image_id(image_name))
+    existing = inspect_container_state(container_name)
+    if existing and existing["config_hash"] == config_hash:
+        started_at = time.time()
+        if start_existing_container(container_name):
+            return wait_for_running_container(container_name, since=started_at, container_id=existing["id"])
+        print("Warning: could not start pre-created container; re-creating it.")
+    if existing:
+        remove_container(container_name)
+
+    container_id = start_detached_container(container_create_command(detached_cmd, config_hash))
+    if not container_id:
+        return False
+    started_at = time.time()
+    if not start_existing_container(container_id):
+        return False
+    return wait_for_running_container(container_name, since=started_at, container_id=container_id)
+
+
+def precreate_container(store: ConfigStore, name: str) -> str:
+    """Create a project's container stopped, ahead of `skua run`.
 
+    Uses the same argv `skua run` would, so run can just `docker start` it.
+    Returns "created" or "current", or a short reason the project was skipped.
+    Nothing is cloned, built or prompted for here.
+    """
     project = store.resolve_project(name)
     if project is None:
-        print(f"Error: Project '{name}' not found. Add it with: skua add {name}")
+        return "project not found"
+    if getattr(project, "host", ""):
+        return "remote host"
+    env = store.load_environment(project.environment)
+    sec = store.load_security(project.security)
+    agent = store.load_agent(project.agent)
+    if env is None or sec is None or agent is None:
+        return "missing resources"
+    if not validate_project(project, env, sec, agent).valid:
+        return "invalid configuration"
+    if project.repo:
+        clone_dir = store.repo_dir(project.name)
+        if not clone_dir.exists():
+            return "repository not cloned yet"
+        project.directory = str(clone_dir)
+    elif project.directory and not Path(project.directory).is_dir():
+        return "project directory missing"
+
+    g = store.load_global()
+    image_name = image_name_for_project(g.get("imageName", "skua-base"), project)
+    resolved_image_id = image_id(image_name)
+    if not resolved_image_id:
+        return "image not built"
+
+    container_name = f"skua-{project.name}"
+    existing = inspect_container_state(container_name)
+    if existing and existing["running"]:
+        return "running"
+
+    data_dir = store.project_data_dir(project.name, project.agent)
+    if env.persistence.mode == "bind":
+        data_dir.mkdir(parents=True, exist_ok=True)
+    detached_cmd = _detached_run_command(build_run_command(
+        project=project,
+        environment=env,
+        security=sec,
+        agent=agent,
+        image_name=image_name,
+        data_dir=data_dir,
+    ))
+    config_hash = container_config_hash(detached_cmd, resolved_image_id)
+    if existing:
+        if existing["config_hash"] == config_hash:
+            return "current"
+        remove_container(container_name)
+    if not start_detached_container(container_create_command(detached_cmd, config_hash)):
+        return "docker create failed"
+    return "created"
+
+
+def precreate_containers(store: ConfigStore, names: list):
+    """Pre-create stopped containers for projects when run.precreate is enabled."""
+    if not names or not precreate_enabled(store.load_global()):
+        return
+    for name in names:
+        status = precreate_container(store, name)
+        if status == "created":
+            print(f"Pre-created container skua-{name}.")
+        elif status not in ("current", "running"):
+            print(f"Skipped pre-creating skua-{name}: {status}.")
+
+
+def _sync_directory_for_run(store, project, vol_name: str):
+    """Push a remote project's local directory into its volume before start."""
+    directory = Path(project.directory)
+    if not directory.is_dir():
+        print(f"Error: Project directory does not exist: {directory}")
         sys.exit(1)
+    print(f"Syncing {directory} into remote volume '{vol_name}'...")
+    try:
+        changed, deleted = sync_directory_into_volume(
+            directory, vol_name, sync_state_file(store.config_dir, project.name),
+        )
+    except RuntimeError as exc:
+        print(f"Error: Failed to sync project directory: {exc}")
+        sys.exit(1)
+    if changed or deleted:
+        print(f"  Sent {len(changed)} changed file(s), removed {len(deleted)}.")
+    else:
+        print("  Remote copy is up to date.")
+    print(f"  Tip: 'skua sync {project.name} --watch' keeps it in sync while you work locally.")
+
+
+@traced("cmd_run")
+def cmd_run(args):
+    store = ConfigStore()
+    name = args.name
+
+    with span("resolve project"):
+        project = store.resolve_project(name)
+        if project is None:
+            print(f"Error: Project '{name}' not found. Add it with: skua add {name}")
+            sys.exit(1)
 
     host = getattr(project, "host", "") or ""
 
@@ -604,24 +717,27 @@ def cmd_run(args):
     # Check if already running
     if is_container_running(container_name):
         print(f"Container '{container_name}' is already running.")
+        if getattr(args, "timings", False):
+            _print_entrypoint_timings(container_name)
         print("Attaching to container tmux session (detach: Ctrl-b then d)...")
         exec_into_container(container_name)
         return
 
     # Load referenced resources
-    env = store.load_environment(project.environment)
-    sec = store.load_security(project.security)
-    agent = store.load_agent(project.agent)
+    with span("load resources"):
+        env = store.load_environment(project.environment)
+        sec = store.load_security(project.security)
+        agent = store.load_agent(project.agent)
 
-    if env is None:
-        print(f"Error: Environment '{project.environment}' not found.")
-        sys.exit(1)
-    if sec is None:
-        print(f"Error: Security profile '{project.security}' not found.")
-        sys.exit(1)
-    if agent is None:
-        print(f"Error: Agent '{project.agent}' not found.")
-        sys.exit(1)
+        if env is None:
+            print(f"Error: Environment '{project.environment}' not found.")
+            sys.exit(1)
+        if sec is None:
+            print(f"Error: Security profile '{project.security}' not found.")
+            sys.exit(1)
+        if agent is None:
+            print(f"Error: Agent '{project.agent}' not found.")
+            sys.exit(1)
 
     # Remote projects must use named volumes (bind mounts don't work across hosts)
     if host:
@@ -629,119 +745,121 @@ def cmd_run(args):
         env.persistence.mode = "volume"
 
     # Validate configuration
-    result = validate_project(project, env, sec, agent)
-    if result.warnings:
-        for w in result.warnings:
-            print(f"  Warning: {w}")
-    if not result.valid:
-        print("\nConfiguration validation failed:")
-        for e in result.errors:
-            print(f"  x {e}")
-        print("\nRun 'skua validate' for details, or fix the configuration.")
-        sys.exit(1)
+    with span("validate"):
+        result = validate_project(project, env, sec, agent)
+        if result.warnings:
+            for w in result.warnings:
+                print(f"  Warning: {w}")
+        if not result.valid:
+            print("\nConfiguration validation failed:")
+            for e in result.errors:
+                print(f"  x {e}")
+            print("\nRun 'skua validate' for details, or fix the configuration.")
+            sys.exit(1)
 
     # Handle repo — remote projects clone into a Docker volume, local projects clone to disk
-    repo_volume = ""
-    if host and project.repo:
-        repo_volume = f"skua-{name}-repo"
-        _clone_repo_into_remote_volume(project, repo_volume)
-    elif project.repo:
-        clone_dir = store.repo_dir(name)
-        if not clone_dir.exists():
-            print(f"Cloning {project.repo} into {clone_dir}...")
-            clone_cmd = ["git", "clone"]
-            if project.ssh.private_key:
-                ssh_cmd = f"ssh -i {project.ssh.private_key} -o StrictHostKeyChecking=no"
-                clone_cmd = ["git", "-c", f"core.sshCommand={ssh_cmd}", "clone"]
-            clone_cmd += [project.repo, str(clone_dir)]
-            try:
-                subprocess.run(clone_cmd, check=True)
-            except subprocess.CalledProcessError:
-                print(f"Error: Failed to clone {project.repo}")
-                sys.exit(1)
-        else:
-            print(f"Using existing clone at {clone_dir}")
-        project.directory = str(clone_dir)
+    with span("repo"):
+        repo_volume = ""
+        if host and project.repo:
+            repo_volume = f"skua-{name}-repo"
+            sync_repo_into_volume(project, repo_volume, sync_options(store.load_global()))
+        elif host and project.directory:
+            repo_volume = f"skua-{name}-repo"
+            _sync_directory_for_run(store, project, repo_volume)
+        elif project.repo:
+            clone_dir = store.repo_dir(name)
+            if not clone_dir.exists():
+                print(f"Cloning {project.repo} into {clone_dir}...")
+                if not clone_repo(project.repo, clone_dir, store.git_cache_dir(), project.ssh.private_key):
+                    print(f"Error: Failed to clone {project.repo}")
+                    sys.exit(1)
+            else:
+                print(f"Using existing clone at {clone_dir}")
+            project.directory = str(clone_dir)
 
     if not host and project.directory and Path(project.directory).is_dir():
         ensure_adapt_workspace(Path(project.directory), project.name, project.agent)
 
     # Determine image name
-    g = store.load_global()
-    image_name_base = g.get("imageName", "skua-base")
-    image_name = image_name_for_project(image_name_base, project)
-    if not image_exists(image_name):
-        print(f"Image '{image_name}' not found for agent '{project.agent}'.")
-        print("Building image lazily...")
-        container_dir = store.get_container_dir()
-        if container_dir is None:
-            print("Error: Cannot find container build assets (entrypoint.sh).")
-            print("Set toolDir in global.yaml or reinstall skua.")
-            sys.exit(1)
+    with span("image check"):
+        g = store.load_global()
+        image_name_base = g.get("imageName", "skua-base")
+        image_name = image_name_for_project(image_name_base, project)
+        if not image_exists(image_name):
+            print(f"Image '{image_name}' not found for agent '{project.agent}'.")
+            print("Building image lazily...")
+            container_dir = store.get_container_dir()
+            if container_dir is None:
+                print("Error: Cannot find container build assets (entrypoint.sh).")
+                print("Set toolDir in global.yaml or reinstall skua.")
+                sys.exit(1)
 
-        base_image = g.get("baseImage", "debian:bookworm-slim")
-        defaults = g.get("defaults", {})
-        build_security_name = defaults.get("security", "open")
-        build_security = store.load_security(build_security_name) or sec
-        image_config = g.get("image", {})
-        global_extra_packages = image_config.get("extraPackages", [])
-        global_extra_commands = image_config.get("extraCommands", [])
-        resolved_base_image, extra_packages, extra_commands = resolve_project_image_inputs(
-            default_base_image=base_image,
-            agent=agent,
-            project=project,
-            global_extra_packages=global_extra_packages,
-            global_extra_commands=global_extra_commands,
-        )
+            base_image = g.get("baseImage", "debian:bookworm-slim")
+            defaults = g.get("defaults", {})
+            build_security_name = defaults.get("security", "open")
+            build_security = store.load_security(build_security_name) or sec
+            image_config = g.get("image", {})
+            global_extra_packages = image_config.get("extraPackages", [])
+            global_extra_commands = image_config.get("extraCommands", [])
+            resolved_base_image, extra_packages, extra_commands = resolve_project_image_inputs(
+                default_base_image=base_image,
+                agent=agent,
+                project=project,
+                global_extra_packages=global_extra_packages,
+                global_extra_commands=global_extra_commands,
+            )
 
-        success, _ = build_image(
-            container_dir=container_dir,
-            image_name=image_name,
-            security=build_security,
-            agent=agent,
-            base_image=resolved_base_image,
-            extra_packages=extra_packages,
-            extra_commands=extra_commands,
-        )
-        if not success:
-            print(f"Error: failed to build image '{image_name}'.")
-            sys.exit(1)
+            success, _ = build_image(
+                container_dir=container_dir,
+                image_name=image_name,
+                security=build_security,
+                agent=agent,
+                base_image=resolved_base_image,
+                extra_packages=extra_packages,
+                extra_commands=extra_commands,
+                content_base=content_tag_base(image_name_base, image_config, project),
+                **build_cache_options(image_config),
+            )
+            if not success:
+                print(f"Error: failed to build image '{image_name}'.")
+                sys.exit(1)
 
     # Build persistence path
     data_dir = store.project_data_dir(name, project.agent)
 
     # Resolve credential (None is fine — resolve_credential_sources falls back to agent default dir)
-    cred = None
-    if project.credential:
-        cred = store.load_credential(project.credential)
-        if cred is None:
-            print(f"Warning: Credential '{project.credential}' not found.")
-
-    # Seed/sync persisted auth files from host if needed
-    if env.persistence.mode == "bind":
-        data_dir.mkdir(parents=True, exist_ok=True)
-        refreshed = _maybe_refresh_local_credentials(agent=agent, cred=cred)
-        copied = _seed_auth_from_host(
-            data_dir=data_dir,
-            cred=cred,
-            agent=agent,
-            overwrite=refreshed,
-        )
-        if copied:
-            action = "Synced" if refreshed else "Seeded"
-            print(f"{action} {copied} auth file(s).")
-    elif host:
-        refreshed = _maybe_refresh_local_credentials(agent=agent, cred=cred)
-        copied = _seed_auth_into_remote_volume(
-            project_name=name,
-            agent_name=project.agent,
-            cred=cred,
-            agent=agent,
-            overwrite=refreshed,
-        )
-        if copied:
-            action = "Synced" if refreshed else "Seeded"
-            print(f"{action} {copied} remote auth file(s).")
+    with span("credentials"):
+        cred = None
+        if project.credential:
+            cred = store.load_credential(project.credential)
+            if cred is None:
+                print(f"Warning: Credential '{project.credential}' not found.")
+
+        # Seed/sync persisted auth files from host if needed
+        if env.persistence.mode == "bind":
+            data_dir.mkdir(parents=True, exist_ok=True)
+            refreshed = _maybe_refresh_local_credentials(agent=agent, cred=cred)
+            copied = _seed_auth_from_host(
+                data_dir=data_dir,
+                cred=cred,
+                agent=agent,
+                overwrite=refreshed,
+            )
+            if copied:
+                action = "Synced" if refreshed else "Seeded"
+                print(f"{action} {copied} auth file(s).")
+        elif host:
+            refreshed = _maybe_refresh_local_credentials(agent=agent, cred=cred)
+            copied = _seed_auth_into_remote_volume(
+                project_name=name,
+                agent_name=project.agent,
+                cred=cred,
+                agent=agent,
+                overwrite=refreshed,
+            )
+            if copied:
+                action = "Synced" if refreshed else "Seeded"
+                print(f"{action} {copied} remote auth file(s).")
 
     # Build and exec docker command
     docker_cmd = build_run_command(
@@ -786,12 +904,26 @@ def cmd_run(args):
         print(f"  Auth dir:    volume skua-{name}-{project.agent} -> /home/dev/{auth_dir}")
     print()
 
-    detached_cmd = _detached_run_command(docker_cmd)
-    if not start_container(detached_cmd):
-        print(f"Error: failed to start container '{container_name}'.")
-        sys.exit(1)
-    if not wait_for_running_container(container_name):
-        print(f"Error: container '{container_name}' did not start correctly.")
-        sys.exit(1)
+    with span("start container"):
+        detached_cmd = _detached_run_command(docker_cmd)
+        if precreate_enabled(g):
+            if not _start_precreated_container(container_name, detached_cmd, image_name):
+                print(f"Error: container '{container_name}' did not start correctly.")
+                sys.exit(1)
+        else:
+            existing = inspect_container_state(container_name)
+            if existing and existing["config_hash"]:
+                # Left over from run.precreate; `docker run --name` would conflict.
+                remove_container(container_name)
+            started_at = time.time()
+            container_id = start_detached_container(detached_cmd)
+            if not container_id:
+                print(f"Error: failed to start container '{container_name}'.")
+                sys.exit(1)
+            if not wait_for_running_container(container_name, since=started_at, container_id=container_id):
+                print(f"Error: container '{container_name}' did not start correctly.")
+                sys.exit(1)
+    if getattr(args, "timings", False):
+        _print_entrypoint_timings(container_name)
     print("Attaching to container tmux session (detach: Ctrl-b then d)...")
     exec_into_container(container_name)
@@ -0,0 +1,54 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""skua ssh — inspect and close multiplexed SSH master connections."""
+
+import sys
+
+from skua import ssh_mux
+from skua.config import ConfigStore
+
+
+def _project_hosts(store: ConfigStore) -> list:
+    hosts = []
+    for name in store.list_resources("Project"):
+        project = store.load_project(name)
+        host = str(getattr(project, "host", "") or "").strip() if project else ""
+        if host and host not in hosts:
+            hosts.append(host)
+    return hosts
+
+
+def cmd_ssh(args):
+    action = getattr(args, "action", "") or "status"
+    host = str(getattr(args, "host", "") or "").strip()
+    store = ConfigStore()
+    hosts = [host] if host else _project_hosts(store)
+
+    if action == "status":
+        if not ssh_mux.enabled():
+            print("SSH multiplexing is disabled (SKUA_SSH_MUX).")
+        print(f"Control sockets: {ssh_mux.control_dir()}")
+        if not hosts:
+            print("No remote hosts configured.")
+        for h in hosts:
+            print(f"  {h:<30} {ssh_mux.master_status(h)}")
+        sockets = ssh_mux.control_sockets()
+        print(f"Open control sockets: {len(sockets)}")
+        return
+
+    if action == "close":
+        if not hosts:
+            print("No remote hosts configured.")
+            return
+        closed = 0
+        for h in hosts:
+            if ssh_mux.close_master(h):
+                print(f"Closed SSH master for '{h}'.")
+                closed += 1
+            elif host:
+                print(f"No active SSH master for '{h}'.")
+        if not host and closed == 0:
+            print("No active SSH masters.")
+        return
+
+    print(f"Error: Unknown ssh action '{action}'.")
+    sys.exit(1)
@@ -6,7 +6,7 @@ import sys
 from pathlib import Path
 
 from skua.config import ConfigStore
-from skua.docker import get_running_skua_containers
+from skua.docker import get_running_skua_containers, stop_container
 from skua.utils import confirm
 
 
@@ -108,11 +108,7 @@ def cmd_stop(args) -> bool:
         print("Stop cancelled.")
         return False
 
-    cmd = ["docker", "stop", container_name]
-    if host:
-        cmd = ["ssh", host, *cmd]
-    result = subprocess.run(cmd)
-    if result.returncode != 0:
+    if not stop_container(container_name, host=host):
         print(f"Error: Failed to stop container '{container_name}'.")
         sys.exit(1)
     print(f"Stopped '{container_name}'.")
@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""skua sync — push a remote project's local directory into its repo volume."""
+
+import sys
+from pathlib import Path
+
+from skua.config import ConfigStore
+from skua.remote_sync import sync_directory_into_volume, sync_state_file, watch_directory
+
+
+def _print_sync(changed: list, deleted: list):
+    parts = []
+    if changed:
+        parts.append(f"{len(changed)} changed")
+    if deleted:
+        parts.append(f"{len(deleted)} deleted")
+    print(f"Synced {', '.join(parts) or 'no changes'}.")
+
+
+def cmd_sync(args):
+    store = ConfigStore()
+    name = args.name
+
+    project = store.load_project(name)
+    if project is None:
+        print(f"Error: Project '{name}' not found.")
+        sys.exit(1)
+
+    host = getattr(project, "host", "") or ""
+    if not host or not project.directory:
+        print(f"Error: Project '{name}' is not a remote project with a local directory.")
+        print("  'skua sync' applies to projects added with --host and --dir.")
+        sys.exit(1)
+
+    directory = Path(project.directory)
+    if not directory.is_dir():
+        print(f"Error: Project directory does not exist: {directory}")
+        sys.exit(1)
+
+    from skua.commands.run import (
+        _ensure_local_ssh_client_for_remote_docker,
+        _configure_remote_docker_transport,
+    )
+    _ensure_local_ssh_client_for_remote_docker(host)
+    _configure_remote_docker_transport(host)
+
+    vol_name = f"skua-{name}-repo"
+    state_file = sync_state_file(store.config_dir, name)
+    print(f"Syncing {directory} -> {host}:{vol_name}...")
+    try:
+        if getattr(args, "watch", False):
+            interval = max(0.1, float(getattr(args, "interval", 1.0) or 1.0))
+            print(f"Watching for changes every {interval:g}s (Ctrl-C to stop).")
+            watch_directory(directory, vol_name, state_file, interval=interval, on_sync=_print_sync)
+        else:
+            _print_sync(*sync_directory_into_volume(directory, vol_name, state_file))
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    except RuntimeError as exc:
+        print(f"Error: Failed to sync into remote volume '{vol_name}': {exc}")
+        sys.exit(1)
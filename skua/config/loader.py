@@ -1,7 +1,11 @@
 # SPDX-License-Identifier: BUSL-1.1
 """YAML resource file discovery, loading, and saving."""
 
+import atexit
+import json
+import os
 import shutil
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -32,6 +36,115 @@ KIND_DIRS = {
 }
 
 
+# libyaml's C loader is several times faster than the pure-Python one.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed YAML documents, kept as JSON text keyed by path. Every load decodes a
+# fresh copy, so callers may mutate what they get back. Entries are validated
+# against the file's (mtime_ns, size) on each access. The same entries are
+# persisted per config dir in cache/resources.json so later processes skip
+# YAML parsing entirely.
+_PARSED = {}
+_DISK_CACHES = {}
+_PARSED_LOCK = threading.Lock()
+
+
+def _disk_cache_file(config_dir: Path) -> Path:
+    return config_dir / "cache" / "resources.json"
+
+
+def _disk_cache(config_dir: Path) -> dict:
+    """Return the (lazily loaded) on-disk parse cache for config_dir."""
+    key = str(config_dir)
+    cache = _DISK_CACHES.get(key)
+    if cache is None:
+        entries = {}
+        try:
+            raw = json.loads(_disk_cache_file(config_dir).read_text())
+            if isinstance(raw, dict) and isinstance(raw.get("entries"), dict):
+                entries = raw["entries"]
+        except (OSError, ValueError):
+            pass
+        cache = {"entries": entries, "dirty": False}
+        _DISK_CACHES[key] = cache
+    return cache
+
+
+def save_parse_cache():
+    """Persist new parse-cache entries. Runs at exit; call before exec."""
+    for key, cache in list(_DISK_CACHES.items()):
+        if not cache["dirty"]:
+            continue
+        config_dir = Path(key)
+        if not config_dir.is_dir():
+            continue
+        path = _disk_cache_file(config_dir)
+        entries = {p: e for p, e in cache["entries"].items() if os.path.exists(p)}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}")
+            tmp.write_text(json.dumps({"entries": entries}))
+            os.replace(tmp, path)
+            cache["dirty"] = False
+        except OSError:
+            pass
+
+
+atexit.register(save_parse_cache)
+
+
+def _load_yaml_cached(path: Path, config_dir: Path):
+    """Parse a YAML file, reusing cached results while its mtime/size match.
+
+    Returns None when the file does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = str(path)
+    stamp = [st.st_mtime_ns, st.st_size]
+
+    with _PARSED_LOCK:
+        entry = _PARSED.get(key)
+        if entry is None or entry["stamp"] != stamp:
+            entry = _disk_cache(config_dir)["entries"].get(key)
+            if entry is not None and entry.get("stamp") == stamp:
+                _PARSED[key] = entry
+            else:
+                entry = None
+    if entry is not None:
+        return json.loads(entry["json"])
+
+    with open(path) as f:
+        data = yaml.load(f, Loader=YAML_LOADER)
+    try:
+        text = json.dumps(data)
+    except (TypeError, ValueError):
+        # Values JSON cannot represent (e.g. YAML timestamps): don't cache.
+        return data
+    if json.loads(text) != data:
+        # Lossy round trip (e.g. non-string mapping keys): don't cache.
+        return data
+    entry = {"stamp": stamp, "json": text}
+    with _PARSED_LOCK:
+        _PARSED[key] = entry
+        cache = _disk_cache(config_dir)
+        cache["entries"][key] = entry
+        cache["dirty"] = True
+    return json.loads(text)
+
+
+def _forget_cached(path: Path, config_dir: Path):
+    """Drop any cached parse of path (after it is written or deleted)."""
+    key = str(path)
+    with _PARSED_LOCK:
+        _PARSED.pop(key, None)
+        cache = _disk_cache(config_dir)
+        if cache["entries"].pop(key, None) is not None:
+            cache["dirty"] = True
+
+
 class ConfigStore:
     """Manages YAML resource files on disk.
 
@@ -63,11 +176,7 @@ class ConfigStore:
         """Load global.yaml (git identity, default refs)."""
         if self._global_cache is not None:
             return self._global_cache
-        if self.global_file.exists():
-            with open(self.global_file) as f:
-                self._global_cache = yaml.safe_load(f) or {}
-        else:
-            self._global_cache = {}
+        self._global_cache = _load_yaml_cached(self.global_file, self.config_dir) or {}
         return self._global_cache
 
     def save_global(self, data: dict):
@@ -75,6 +184,7 @@ class ConfigStore:
         self.ensure_dirs()
         with open(self.global_file, "w") as f:
             yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+        _forget_cached(self.global_file, self.config_dir)
         self._global_cache = data
 
     def get_global_defaults(self) -> dict:
@@ -100,14 +210,11 @@ class ConfigStore:
         data = resource_to_dict(resource)
         with open(path, "w") as f:
             yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+        _forget_cached(path, self.config_dir)
 
     def load_resource(self, kind: str, name: str):
         """Load a single resource by kind and name. Returns None if not found."""
-        path = self._resource_path(kind, name)
-        if not path.exists():
-            return None
-        with open(path) as f:
-            data = yaml.safe_load(f)
+        data = _load_yaml_cached(self._resource_path(kind, name), self.config_dir)
         if data is None:
             return None
         return resource_from_dict(data)
@@ -117,6 +224,7 @@ class ConfigStore:
         path = self._resource_path(kind, name)
         if path.exists():
             path.unlink()
+            _forget_cached(path, self.config_dir)
             return True
         return False
 
@@ -223,6 +331,10 @@ class ConfigStore:
         """Return the clone directory for a specific project's repo."""
         return self.repos_dir() / project_name
 
+    def git_cache_dir(self) -> Path:
+        """Return the directory holding shared bare mirrors of project repos."""
+        return self.config_dir / "git-cache"
+
     # ── Tool directory ───────────────────────────────────────────────
 
     def get_container_dir(self) -> Optional[Path]:
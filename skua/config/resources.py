@@ -308,62 +308,99 @@ def resource_from_dict(data: dict):
     return _dict_to_dataclass(cls, spec)
 
 
-def _dataclass_to_dict(obj) -> dict:
-    """Recursively convert a dataclass to a plain dict."""
-    from dataclasses import fields, is_dataclass
-    if not is_dataclass(obj):
-        return obj
-    result = {}
-    for f in fields(obj):
-        val = getattr(obj, f.name)
-        if is_dataclass(val):
-            val = _dataclass_to_dict(val)
-        elif isinstance(val, list):
-            val = [_dataclass_to_dict(v) if is_dataclass(v) else v for v in val]
-        elif isinstance(val, dict):
-            val = {k: _dataclass_to_dict(v) if is_dataclass(v) else v for k, v in val.items()}
-        result[f.name] = val
-    return result
+# Per-class encoders/decoders, built on first use by _encoder()/_decoder().
+_ENCODERS = {}
+_DECODERS = {}
 
 
-def _dict_to_dataclass(cls, data: dict):
-    """Recursively construct a dataclass from a dict, using snake_case field matching."""
-    from dataclasses import fields, is_dataclass
+def _is_dataclass_instance(val) -> bool:
+    return hasattr(type(val), "__dataclass_fields__")
+
+
+def _encoder(cls):
+    """Return a function converting instances of dataclass cls to dicts."""
+    encode = _ENCODERS.get(cls)
+    if encode is None:
+        encode = _compile_encoder(cls)
+        _ENCODERS[cls] = encode
+    return encode
+
+
+def _compile_encoder(cls):
+    from dataclasses import fields
+
+    names = tuple(f.name for f in fields(cls))
+
+    def encode(obj) -> dict:
+        result = {}
+        for name in names:
+            val = getattr(obj, name)
+            if _is_dataclass_instance(val):
+                val = _encoder(type(val))(val)
+            elif isinstance(val, list):
+                val = [_encoder(type(v))(v) if _is_dataclass_instance(v) else v for v in val]
+            elif isinstance(val, dict):
+                val = {k: _encoder(type(v))(v) if _is_dataclass_instance(v) else v
+                       for k, v in val.items()}
+            result[name] = val
+        return result
+
+    return encode
+
 
-    if not isinstance(data, dict):
-        return data
+def _decoder(cls):
+    """Return a function constructing dataclass cls from a dict."""
+    decode = _DECODERS.get(cls)
+    if decode is None:
+        decode = _compile_decoder(cls)
+        _DECODERS[cls] = decode
+    return decode
 
-    kwargs = {}
-    field_map = {f.name: f for f in fields(cls)}
 
-    # Also build a camelCase → snake_case lookup
-    alias_map = {}
+def _compile_decoder(cls):
+    from dataclasses import fields, is_dataclass
+
+    # YAML key (snake_case field name or its camelCase alias) ->
+    # (field name, nested dataclass type or None).
+    slots = {}
     for f in fields(cls):
-        # Convert snake_case field name to camelCase for YAML compatibility
-        parts = f.name.split("_")
-        camel = parts[0] + "".join(p.capitalize() for p in parts[1:])
-        alias_map[camel] = f.name
-        alias_map[f.name] = f.name
-
-    for key, val in data.items():
-        field_name = alias_map.get(key, key)
-        if field_name not in field_map:
-            continue
-        f = field_map[field_name]
         field_type = f.type
-
         # Resolve string type annotations
         if isinstance(field_type, str):
             field_type = eval(field_type)
+        # list, dict, Optional etc. are passed through as-is
+        nested = None
+        if getattr(field_type, "__origin__", None) is None and is_dataclass(field_type):
+            nested = field_type
+        parts = f.name.split("_")
+        camel = parts[0] + "".join(p.capitalize() for p in parts[1:])
+        slots[camel] = (f.name, nested)
+        slots[f.name] = (f.name, nested)
+
+    def decode(data):
+        if not isinstance(data, dict):
+            return data
+        kwargs = {}
+        for key, val in data.items():
+            slot = slots.get(key)
+            if slot is None:
+                continue
+            name, nested = slot
+            if nested is not None and isinstance(val, dict):
+                val = _decoder(nested)(val)
+            kwargs[name] = val
+        return cls(**kwargs)
+
+    return decode
+
 
-        # Handle Optional types
-        origin = getattr(field_type, "__origin__", None)
-        if origin is not None:
-            # For list, dict, etc. just pass through
-            kwargs[field_name] = val
-        elif is_dataclass(field_type):
-            kwargs[field_name] = _dict_to_dataclass(field_type, val) if isinstance(val, dict) else val
-        else:
-            kwargs[field_name] = val
-
-    return cls(**kwargs)
+def _dataclass_to_dict(obj) -> dict:
+    """Recursively convert a dataclass to a plain dict."""
+    if not _is_dataclass_instance(obj):
+        return obj
+    return _encoder(type(obj))(obj)
+
+
+def _dict_to_dataclass(cls, data: dict):
+    """Recursively construct a dataclass from a dict, using snake_case field matching."""
+    return _decoder(cls)(data)
@@ -16,8 +16,31 @@ TMUX_SESSION="${SKUA_TMUX_SESSION:-skua}"
 CREDENTIAL_NAME="${SKUA_CREDENTIAL_NAME:-}"
 SSH_KEY_NAME="${SKUA_SSH_KEY_NAME:-}"
 STARTUP_INFO_FILE="/tmp/skua-entrypoint-info.txt"
+TIMINGS_FILE="/tmp/skua-entrypoint-timings.json"
 SSH_KEY_BASENAME="(none)"
 
+# ── Phase timings (read by `skua run --timings`) ─────────────────────
+# EPOCHREALTIME avoids forking `date` for every timestamp.
+_now_us() { NOW_US="${EPOCHREALTIME//[.,]/}"; }
+_now_us
+ENTRYPOINT_START_US="$NOW_US"
+PHASE_TIMINGS=()
+phase_begin() {
+    PHASE_NAME="$1"
+    _now_us
+    PHASE_START_US="$NOW_US"
+}
+phase_end() {
+    _now_us
+    PHASE_TIMINGS+=("{\"phase\":\"${PHASE_NAME}\",\"ms\":$(( (NOW_US - PHASE_START_US) / 1000 )),\"skipped\":${1:-false}}")
+}
+write_timings() {
+    local IFS=,
+    _now_us
+    printf '{"totalMs":%s,"phases":[%s]}\n' \
+        "$(( (NOW_US - ENTRYPOINT_START_US) / 1000 ))" "${PHASE_TIMINGS[*]}" > "$TIMINGS_FILE" || true
+}
+
 echo "============================================"
 echo "  skua — Dockerized Coding Agent"
 echo "============================================"
@@ -28,6 +51,7 @@ echo "Credential: ${CREDENTIAL_NAME:-"(none)"}"
 echo ""
 
 # ── Configure git identity from env vars ─────────────────────────────
+phase_begin git
 if [ -n "$GIT_AUTHOR_NAME" ]; then
     git config --global user.name "$GIT_AUTHOR_NAME"
     git config --global user.email "$GIT_AUTHOR_EMAIL"
@@ -35,8 +59,10 @@ if [ -n "$GIT_AUTHOR_NAME" ]; then
 else
     echo "[--] Git identity not set"
 fi
+phase_end
 
 # ── SSH key pair (read-only mount -> local copy with correct perms) ───
+phase_begin ssh
 SSH_KEY=""
 # Remote-host mode: SSH key/known_hosts can be passed via base64 env vars.
 if [ -n "${SKUA_SSH_KEY_B64:-}" ] || [ -n "${SKUA_SSH_PUB_KEY_B64:-}" ] || [ -n "${SKUA_SSH_KNOWN_HOSTS_B64:-}" ]; then
@@ -99,25 +125,52 @@ if [ -d /home/dev/.ssh ] && [ "$(ls -A /home/dev/.ssh 2>/dev/null)" ]; then
 else
     echo "[--] No SSH key provided"
 fi
+phase_end
 
-# ── Fix volume ownership (Docker creates named volumes as root) ───────
+# ── Setup stamp ──────────────────────────────────────────────────────
+# Ownership fix and defaults seeding only need to run again when the owner,
+# UID/GID or image change. The stamp lives in the persisted auth dir; root
+# helpers that write into it (remote credential seeding) remove it.
 DEV_GROUP="$(id -gn dev)"
 mkdir -p "$AUTH_DIR"
-sudo chown -R dev:"$DEV_GROUP" "$AUTH_DIR"
+STAMP_FILE="${AUTH_DIR}/.skua-setup-stamp"
+STAMP="owner=dev:${DEV_GROUP} uid=$(id -u dev) gid=$(id -g dev) image=${SKUA_IMAGE_HASH:-}"
+SETUP_CURRENT=false
+if [ -n "${SKUA_IMAGE_HASH:-}" ] && [ -O "$AUTH_DIR" ] && [ -f "$STAMP_FILE" ] \
+        && [ "$(cat "$STAMP_FILE" 2>/dev/null)" = "$STAMP" ]; then
+    SETUP_CURRENT=true
+fi
+
+# ── Fix volume ownership (Docker creates named volumes as root) ───────
+phase_begin ownership
+if [ "$SETUP_CURRENT" = "true" ]; then
+    phase_end true
+else
+    sudo chown -R dev:"$DEV_GROUP" "$AUTH_DIR"
+    phase_end
+fi
 
 # ── Seed Claude config defaults into persistent volume ──────────────
-if [ "$AUTH_DIR_REL" = ".claude" ] && [ -d /home/dev/.claude-defaults ]; then
-    for src in /home/dev/.claude-defaults/*; do
-        [ -f "$src" ] || continue
-        dest="${AUTH_DIR}/$(basename "$src")"
-        [ -f "$dest" ] || cp "$src" "$dest"
-    done
+phase_begin defaults
+if [ "$SETUP_CURRENT" = "true" ]; then
+    phase_end true
+else
+    if [ "$AUTH_DIR_REL" = ".claude" ] && [ -d /home/dev/.claude-defaults ]; then
+        for src in /home/dev/.claude-defaults/*; do
+            [ -f "$src" ] || continue
+            dest="${AUTH_DIR}/$(basename "$src")"
+            [ -f "$dest" ] || cp "$src" "$dest"
+        done
+    fi
+    printf '%s' "$STAMP" > "$STAMP_FILE" 2>/dev/null || true
+    phase_end
 fi
 
 # ── Symlink ~/.claude.json into the persistent volume ────────────────
 # Claude Code reads/writes ~/.claude.json (account metadata, onboarding
 # state, etc.) which lives OUTSIDE ~/.claude/. We store the real file
 # inside the persistent volume and symlink it so writes persist.
+phase_begin claude-json
 if [ "$AUTH_DIR_REL" = ".claude" ]; then
     rm -f /home/dev/.claude.json
     if [ ! -f "${AUTH_DIR}/.claude.json" ]; then
@@ -126,16 +179,24 @@ if [ "$AUTH_DIR_REL" = ".claude" ]; then
     fi
     ln -sf "${AUTH_DIR}/.claude.json" /home/dev/.claude.json
 fi
+phase_end
 
 # ── Shell aliases ────────────────────────────────────────────────────
+# Restarted containers keep their .bashrc, so only append once.
+phase_begin aliases
+add_alias() {
+    grep -qxF "$1" /home/dev/.bashrc 2>/dev/null || echo "$1" >> /home/dev/.bashrc
+}
 if [ "$AGENT_COMMAND" = "claude" ]; then
-    echo "alias claude-dsp='claude --dangerously-skip-permissions'" >> /home/dev/.bashrc
+    add_alias "alias claude-dsp='claude --dangerously-skip-permissions'"
 fi
 if [ "$AGENT_COMMAND" = "codex" ]; then
-    echo "alias codex-dsp='codex --dangerously-bypass-approvals-and-sandbox'" >> /home/dev/.bashrc
+    add_alias "alias codex-dsp='codex --dangerously-bypass-approvals-and-sandbox'"
 fi
+phase_end
 
 # ── Check tool availability ──────────────────────────────────────────
+phase_begin checks
 if command -v "$AGENT_COMMAND" &>/dev/null; then
     echo "[OK] ${AGENT_NAME} available"
 else
@@ -160,6 +221,7 @@ else
     fi
     NEEDS_LOGIN+=("$AGENT_LOGIN_COMMAND")
 fi
+phase_end
 
 echo ""
 
@@ -236,6 +298,8 @@ echo ""
 echo "============================================"
 echo ""
 
+write_timings
+
 # Drop into interactive shell or run provided command
 if [ $# -eq 0 ]; then
     if [ "$TMUX_ENABLE" = "1" ] && command -v tmux &>/dev/null; then
@@ -0,0 +1,278 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Static dependency analysis for `skua adapt --discover=static`.
+
+Walks a project tree once, matching file names against a table of
+ecosystem manifests and toolchain files, and maps them to Debian
+(bookworm) packages and setup commands for .skua/image-request.yaml.
+Only small manifests are read, to spot native build dependencies and
+toolchain versions newer than Debian ships. Anything that is recognised
+but cannot be mapped is reported as unresolved, so the caller can fall
+back to agent discovery.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+from skua.docker import CORE_PACKAGES, DEFAULT_PACKAGES
+from skua.project_adapt import normalize_image_request
+
+MAX_DEPTH = 4
+MAX_READ_BYTES = 256 * 1024
+
+SKIP_DIRS = {
+    "node_modules", "vendor", "target", "dist", "build", "out", "venv", "env",
+    "__pycache__", "site-packages", "bower_components", "third_party",
+}
+
+# Toolchain versions in Debian bookworm; newer requirements are unresolved.
+DEBIAN_NODE_MAJOR = 18
+DEBIAN_GO_VERSION = (1, 19)
+DEBIAN_PYTHON_VERSION = (3, 11)
+
+# File name -> (ecosystem, packages, commands).
+FILE_RULES = {
+    "pyproject.toml": ("python", ["python3-venv"], []),
+    "setup.py": ("python", ["python3-venv"], []),
+    "setup.cfg": ("python", ["python3-venv"], []),
+    "Pipfile": ("python", ["pipenv"], []),
+    "poetry.lock": ("python", ["python3-poetry"], []),
+    "uv.lock": ("python", [], ["python3 -m pip install --user --break-system-packages uv"]),
+    "tox.ini": ("python", ["tox"], []),
+    "package.json": ("node", ["nodejs", "npm"], []),
+    "yarn.lock": ("node", [], ["npm install -g --prefix /home/dev/.local yarn"]),
+    "pnpm-lock.yaml": ("node", [], ["npm install -g --prefix /home/dev/.local pnpm"]),
+    "Cargo.toml": ("rust", ["cargo", "rustc", "build-essential", "pkg-config"], []),
+    "go.mod": ("go", ["golang-go"], []),
+    "Gemfile": ("ruby", ["ruby-full", "ruby-bundler", "build-essential"], []),
+    "pom.xml": ("java", ["default-jdk", "maven"], []),
+    "build.gradle": ("java", ["default-jdk"], []),
+    "build.gradle.kts": ("java", ["default-jdk"], []),
+    "composer.json": ("php", ["php-cli", "composer"], []),
+    "mix.exs": ("elixir", ["elixir", "erlang"], []),
+    "stack.yaml": ("haskell", ["haskell-stack"], []),
+    "CMakeLists.txt": ("c", ["cmake", "build-essential"], []),
+    "Makefile": ("make", ["make"], []),
+    "meson.build": ("c", ["meson", "ninja-build", "build-essential"], []),
+    "configure.ac": ("c", ["autoconf", "automake", "libtool", "build-essential"], []),
+}
+
+# File suffix -> (ecosystem, packages, commands).
+SUFFIX_RULES = {
+    ".cabal": ("haskell", ["ghc", "cabal-install"], []),
+    ".proto": ("protobuf", ["protobuf-compiler"], []),
+}
+
+# Recognised, but needing a vendor repo or a pinned toolchain: left to the agent.
+UNRESOLVED_FILES = {
+    "rust-toolchain": "pinned Rust toolchain (rust-toolchain)",
+    "rust-toolchain.toml": "pinned Rust toolchain (rust-toolchain.toml)",
+    "deno.json": "Deno runtime (deno.json)",
+    "deno.jsonc": "Deno runtime (deno.jsonc)",
+    "bun.lockb": "Bun runtime (bun.lockb)",
+    "bun.lock": "Bun runtime (bun.lock)",
+    "build.zig": "Zig toolchain (build.zig)",
+    "pubspec.yaml": "Dart/Flutter SDK (pubspec.yaml)",
+    "Package.swift": "Swift toolchain (Package.swift)",
+}
+UNRESOLVED_SUFFIXES = {
+    ".csproj": ".NET SDK",
+    ".fsproj": ".NET SDK",
+    ".sln": ".NET SDK",
+    ".tf": "Terraform CLI",
+}
+
+# Files whose contents are read for apt hints, native deps and versions.
+PYTHON_MANIFESTS = {"pyproject.toml", "setup.py", "setup.cfg", "Pipfile"}
+APT_HINT_FILES = {"apt.txt", "Aptfile", "packages.txt", "apt-packages.txt"}
+
+# Python distributions that build from source against system libraries.
+PYTHON_NATIVE_DEPS = {
+    "psycopg2": ["libpq-dev", "python3-dev", "build-essential"],
+    "mysqlclient": ["default-libmysqlclient-dev", "pkg-config", "python3-dev", "build-essential"],
+    "python-ldap": ["libldap2-dev", "libsasl2-dev", "python3-dev", "build-essential"],
+    "pycairo": ["libcairo2-dev", "pkg-config", "python3-dev"],
+    "pygobject": ["libgirepository1.0-dev", "libcairo2-dev", "pkg-config", "python3-dev"],
+    "gdal": ["gdal-bin", "libgdal-dev", "python3-dev", "build-essential"],
+    "pyaudio": ["portaudio19-dev", "python3-dev", "build-essential"],
+    "xmlsec": ["libxmlsec1-dev", "pkg-config", "python3-dev", "build-essential"],
+    "pyodbc": ["unixodbc-dev", "python3-dev", "build-essential"],
+}
+
+# npm packages that compile native addons.
+NODE_NATIVE_DEPS = {
+    "canvas": ["build-essential", "libcairo2-dev", "libpango1.0-dev", "libjpeg-dev", "libgif-dev", "librsvg2-dev"],
+    "node-gyp": ["build-essential"],
+    "bcrypt": ["build-essential"],
+    "sqlite3": ["build-essential"],
+    "better-sqlite3": ["build-essential"],
+}
+
+_APT_PACKAGE_RE = re.compile(r"^[a-z0-9][a-z0-9+.-]+$")
+
+
+class ScanResult:
+    """Outcome of a static scan: what was found, the request, and what is left."""
+    def __init__(self):
+        self.ecosystems = []
+        self.packages = []
+        self.commands = []
+        self.unresolved = []
+        self.files_scanned = 0
+
+    def add(self, ecosystem: str = "", packages: list = (), commands: list = ()):
+        if ecosystem and ecosystem not in self.ecosystems:
+            self.ecosystems.append(ecosystem)
+        self.packages.extend(packages)
+        self.commands.extend(commands)
+
+    def unresolved_hint(self, hint: str):
+        if hint not in self.unresolved:
+            self.unresolved.append(hint)
+
+    def request(self) -> dict:
+        """Return the scan as a normalized image request."""
+        present = set(CORE_PACKAGES + DEFAULT_PACKAGES)
+        summary = "Static analysis"
+        if self.ecosystems:
+            summary += f": {', '.join(self.ecosystems)}"
+        return normalize_image_request({
+            "schemaVersion": 1,
+            "status": "ready",
+            "summary": summary + ".",
+            "packages": sorted({p for p in self.packages if p not in present}),
+            "commands": self.commands,
+        })
+
+
+def _read_text(path: Path) -> str:
+    try:
+        with open(path, "rb") as f:
+            return f.read(MAX_READ_BYTES).decode("utf-8", errors="replace")
+    except OSError:
+        return ""
+
+
+def _version_tuple(text: str) -> tuple:
+    match = re.search(r"(\d+)(?:\.(\d+))?", text or "")
+    if not match:
+        return ()
+    return (int(match.group(1)), int(match.group(2) or 0))
+
+
+def _mentions(text: str, name: str) -> bool:
+    """True when text names the distribution exactly (psycopg2 but not psycopg2-binary)."""
+    return re.search(rf"(?<![\w.-]){re.escape(name)}(?![\w.-])", text, re.IGNORECASE) is not None
+
+
+def _scan_python(path: Path, result: ScanResult):
+    text = _read_text(path)
+    for name, packages in PYTHON_NATIVE_DEPS.items():
+        if _mentions(text, name):
+            result.add("python", packages)
+    if path.name == "pyproject.toml" and re.search(r"^\[tool\.poetry\]", text, re.MULTILINE):
+        result.add("python", ["python3-poetry"])
+    match = re.search(r"""(?:requires-python|python_requires)\s*=\s*["']\s*>=?\s*([\d.]+)""", text)
+    if match and _version_tuple(match.group(1)) > DEBIAN_PYTHON_VERSION:
+        result.unresolved_hint(f"Python {match.group(1)}+ ({path.name})")
+
+
+def _scan_package_json(path: Path, result: ScanResult):
+    try:
+        data = json.loads(_read_text(path) or "{}")
+    except ValueError:
+        return
+    if not isinstance(data, dict):
+        return
+    deps = {}
+    for key in ("dependencies", "devDependencies", "optionalDependencies"):
+        if isinstance(data.get(key), dict):
+            deps.update(data[key])
+    for name, packages in NODE_NATIVE_DEPS.items():
+        if name in deps:
+            result.add("node", packages)
+    engines = data.get("engines") if isinstance(data.get("engines"), dict) else {}
+    wanted = _version_tuple(str(engines.get("node", "")))
+    if wanted and wanted[0] > DEBIAN_NODE_MAJOR:
+        result.unresolved_hint(f"Node.js {wanted[0]} (package.json engines)")
+    manager = str(data.get("packageManager", ""))
+    if manager.startswith(("yarn@", "pnpm@")):
+        tool = manager.split("@", 1)[0]
+        result.add("node", commands=[f"npm install -g --prefix /home/dev/.local {tool}"])
+
+
+def _scan_go_mod(path: Path, result: ScanResult):
+    match = re.search(r"^go\s+([\d.]+)", _read_text(path), re.MULTILINE)
+    if match and _version_tuple(match.group(1)) > DEBIAN_GO_VERSION:
+        result.unresolved_hint(f"Go {match.group(1)} (go.mod)")
+
+
+def _scan_apt_hints(path: Path, result: ScanResult):
+    for line in _read_text(path).splitlines():
+        name = line.split("#", 1)[0].strip()
+        if _APT_PACKAGE_RE.match(name):
+            result.add("apt", [name])
+
+
+def _scan_dockerfile(path: Path, result: ScanResult):
+    text = _read_text(path).replace("\\\n", " ")
+    for match in re.finditer(r"apt-get\s+install\s+([^&;|\n]+)", text):
+        names = [t for t in match.group(1).split() if not t.startswith("-")]
+        result.add("apt", [n for n in names if _APT_PACKAGE_RE.match(n)])
+
+
+def _scan_version_pins(path: Path, result: ScanResult):
+    """.nvmrc / .python-version: only versions newer than Debian's need help."""
+    wanted = _version_tuple(_read_text(path).strip().lstrip("v"))
+    if not wanted:
+        return
+    if path.name == ".nvmrc" and wanted[0] > DEBIAN_NODE_MAJOR:
+        result.unresolved_hint(f"Node.js {wanted[0]} (.nvmrc)")
+    elif path.name == ".python-version" and wanted > DEBIAN_PYTHON_VERSION:
+        result.unresolved_hint(f"Python {'.'.join(map(str, wanted))} (.python-version)")
+
+
+def _scan_file(path: Path, name: str, result: ScanResult):
+    rule = FILE_RULES.get(name) or SUFFIX_RULES.get(Path(name).suffix)
+    if rule:
+        ecosystem, packages, commands = rule
+        result.add(ecosystem, packages, commands)
+    if name in PYTHON_MANIFESTS or (name.startswith("requirements") and name.endswith(".txt")):
+        result.add("python", ["python3-venv"])
+        _scan_python(path, result)
+    elif name == "package.json":
+        _scan_package_json(path, result)
+    elif name == "go.mod":
+        _scan_go_mod(path, result)
+    elif name in APT_HINT_FILES:
+        _scan_apt_hints(path, result)
+    elif name == "Dockerfile" or name.endswith(".Dockerfile"):
+        _scan_dockerfile(path, result)
+    elif name in (".nvmrc", ".python-version"):
+        _scan_version_pins(path, result)
+    elif name == ".tool-versions":
+        tools = [line.split()[0] for line in _read_text(path).splitlines() if line.strip() and not line.startswith("#")]
+        if tools:
+            result.unresolved_hint(f"pinned tool versions: {', '.join(tools)} (.tool-versions)")
+    elif name in UNRESOLVED_FILES:
+        result.unresolved_hint(UNRESOLVED_FILES[name])
+    elif Path(name).suffix in UNRESOLVED_SUFFIXES:
+        result.unresolved_hint(f"{UNRESOLVED_SUFFIXES[Path(name).suffix]} ({name})")
+
+
+def scan_project(project_dir: Path) -> ScanResult:
+    """Scan project_dir in one pass and return what its image needs."""
+    project_dir = Path(project_dir)
+    result = ScanResult()
+    root_depth = len(project_dir.parts)
+    for dirpath, dirnames, filenames in os.walk(project_dir):
+        depth = len(Path(dirpath).parts) - root_depth
+        if depth >= MAX_DEPTH:
+            dirnames[:] = []
+        else:
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            result.files_scanned += 1
+            _scan_file(Path(dirpath) / name, name, result)
+    return result
@@ -3,20 +3,45 @@
 
 import base64
 import hashlib
+import io
+import json
 import os
 import re
+import select
+import shlex
 import shutil
 import subprocess
+import tarfile
+import threading
 import time
 from collections import deque
+from dataclasses import asdict
 from pathlib import Path
 from urllib.parse import urlparse
 
+from skua import __version__
+from skua.config.loader import CONFIG_DIR, save_parse_cache
 from skua.config.resources import Environment, SecurityProfile, AgentConfig, Project
+from skua.ssh_mux import ssh_argv
+from skua.trace import flush as flush_trace, traced
+
+
+def _engine_client():
+    """Return the local Engine API client, or None to use the docker CLI."""
+    from skua.docker_api import get_client
+    return get_client()
 
 
 def is_container_running(name: str) -> bool:
     """Check if a Docker container with the given name is running."""
+    client = _engine_client()
+    if client is not None:
+        from skua.docker_api import DockerAPIError
+        try:
+            data = client.inspect_container(name)
+            return bool(data and (data.get("State") or {}).get("Running"))
+        except DockerAPIError:
+            pass
     try:
         result = subprocess.run(
             ["docker", "ps", "-q", "--filter", f"name=^{name}$"],
@@ -29,15 +54,22 @@ def is_container_running(name: str) -> bool:
 
 def get_running_skua_containers(host: str = "") -> list:
     """Return list of running skua container names for local or remote host."""
+    if not host:
+        client = _engine_client()
+        if client is not None:
+            from skua.docker_api import DockerAPIError
+            try:
+                rows = client.list_containers(filters={"name": ["^skua-"]})
+                return [
+                    (row.get("Names") or [""])[0].lstrip("/")
+                    for row in rows
+                    if row.get("Names")
+                ]
+            except DockerAPIError:
+                pass
     cmd = ["docker", "ps", "--filter", "name=^skua-", "--format", "{{.Names}}"]
     if host:
-        cmd = [
-            "ssh",
-            "-o", "BatchMode=yes",
-            "-o", "ConnectTimeout=5",
-            host,
-            *cmd,
-        ]
+        cmd = ssh_argv(host, *cmd, batch=True)
 
     try:
         result = subprocess.run(
@@ -56,6 +88,314 @@ def get_running_skua_containers(host: str = "") -> list:
     return []
 
 
+# ── State snapshot ───────────────────────────────────────────────────────
+
+def _normalize_image_ref(ref: str) -> str:
+    """Return an image reference with an explicit tag (defaults to :latest)."""
+    value = (ref or "").strip()
+    if not value or "@" in value or value.startswith("sha256:"):
+        return value
+    repo, tag = _split_image_ref_tag(value)
+    return f"{repo}{tag or ':latest'}"
+
+
+def _parse_label_string(raw: str) -> dict:
+    """Parse the comma-joined `k=v` label string printed by `docker ps`."""
+    labels = {}
+    for part in (raw or "").split(","):
+        key, sep, value = part.partition("=")
+        if sep and key.strip():
+            labels[key.strip()] = value
+    return labels
+
+
+class DockerState:
+    """In-memory index of containers and images from one Docker snapshot.
+
+    Lookups never shell out; build an instance with :func:`load_docker_state`
+    once per host and query it for every project.
+    """
+
+    def __init__(self, containers: list = None, images: list = None, host: str = "", reachable: bool = True):
+        self.host = host or ""
+        self.reachable = reachable
+        self.containers = {}
+        self.images_by_id = {}
+        self.images_by_ref = {}
+        self.images_by_label = {}
+        for record in containers or []:
+            self._add_container(record)
+        for record in images or []:
+            self._add_image(record)
+
+    def _add_container(self, record: dict):
+        name = str(record.get("name", "") or "").lstrip("/")
+        if not name:
+            return
+        self.containers[name] = {
+            "name": name,
+            "id": str(record.get("id", "") or ""),
+            "running": bool(record.get("running", False)),
+            "image_id": str(record.get("image_id", "") or ""),
+            "image_name": str(record.get("image_name", "") or ""),
+            "labels": dict(record.get("labels") or {}),
+        }
+
+    def _add_image(self, record: dict):
+        image_id = str(record.get("id", "") or "")
+        if not image_id:
+            return
+        image = self.images_by_id.get(image_id)
+        if image is None:
+            image = {"id": image_id, "refs": [], "labels": {}}
+            self.images_by_id[image_id] = image
+        for ref in record.get("refs") or []:
+            normalized = _normalize_image_ref(ref)
+            if normalized and normalized not in image["refs"]:
+                image["refs"].append(normalized)
+                self.images_by_ref[normalized] = image
+        for key, value in (record.get("labels") or {}).items():
+            if image["labels"].get(key) == value:
+                continue
+            image["labels"][key] = value
+            self.images_by_label.setdefault((key, value), []).append(image)
+
+    # ── Containers ──
+
+    def container(self, name: str):
+        """Return the container record for a name, or None."""
+        return self.containers.get(name)
+
+    def is_running(self, name: str) -> bool:
+        record = self.containers.get(name)
+        return bool(record and record["running"])
+
+    def running_skua_containers(self) -> set:
+        return {name for name, c in self.containers.items() if c["running"] and name.startswith("skua-")}
+
+    def container_image_id(self, name: str) -> str:
+        record = self.containers.get(name)
+        return record["image_id"] if record else ""
+
+    def container_image_name(self, name: str) -> str:
+        record = self.containers.get(name)
+        return record["image_name"] if record else ""
+
+    # ── Images ──
+
+    def image(self, ref: str):
+        """Return the image record for a reference or ID, or None."""
+        value = (ref or "").strip()
+        if not value:
+            return None
+        if value in self.images_by_id:
+            return self.images_by_id[value]
+        found = self.images_by_ref.get(_normalize_image_ref(value))
+        if found is not None:
+            return found
+        if value.startswith("sha256:") or re.fullmatch(r"[0-9a-f]{12,64}", value):
+            digest = value if value.startswith("sha256:") else f"sha256:{value}"
+            for image_id, image in self.images_by_id.items():
+                if image_id.startswith(digest):
+                    return image
+        return None
+
+    def image_exists(self, ref: str) -> bool:
+        return self.image(ref) is not None
+
+    def image_id(self, ref: str) -> str:
+        image = self.image(ref)
+        return image["id"] if image else ""
+
+    def image_label(self, ref: str, label_key: str) -> str:
+        image = self.image(ref)
+        if image is None:
+            return ""
+        return str(image["labels"].get(label_key, "") or "")
+
+    def images_with_label(self, label_key: str, value: str) -> list:
+        return list(self.images_by_label.get((label_key, value), []))
+
+
+def _remote_docker_argv(argv: list, host: str = "") -> list:
+    """Return argv that runs a docker command locally or via ssh on host."""
+    if not host:
+        return list(argv)
+    return ssh_argv(host, " ".join(shlex.quote(str(a)) for a in argv), batch=True)
+
+
+def _docker_output(argv: list, host: str = "", timeout: float = 8):
+    """Run a docker query and return stdout, or None when it failed.
+
+    A query still running after `timeout` seconds is killed; none is started
+    once the timeout is used up.
+    """
+    if timeout <= 0:
+        return None
+    try:
+        result = subprocess.run(
+            _remote_docker_argv(argv, host),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def _json_lines(text: str) -> list:
+    rows = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rows.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return rows
+
+
+def _json_array(text: str) -> list:
+    try:
+        data = json.loads(text or "[]")
+    except json.JSONDecodeError:
+        return []
+    return data if isinstance(data, list) else []
+
+
+def _load_docker_state_via_api(client, host: str = ""):
+    """Snapshot state with two Engine API list calls, or None on API failure."""
+    from skua.docker_api import DockerAPIError
+    try:
+        container_rows = client.list_containers(all=True, filters={"name": ["^skua-"]})
+        image_rows = client.list_images()
+    except DockerAPIError:
+        return None
+
+    containers = []
+    for row in container_rows:
+        names = row.get("Names") or []
+        if not names:
+            continue
+        containers.append({
+            "name": str(names[0]).lstrip("/"),
+            "id": row.get("Id", ""),
+            "running": str(row.get("State", "")).lower() == "running",
+            "image_id": row.get("ImageID", ""),
+            "image_name": row.get("Image", ""),
+            "labels": row.get("Labels") or {},
+        })
+
+    images = []
+    for row in image_rows:
+        refs = [ref for ref in (row.get("RepoTags") or []) if ref and ref != "<none>:<none>"]
+        images.append({
+            "id": row.get("Id", ""),
+            "refs": refs,
+            "labels": row.get("Labels") or {},
+        })
+    return DockerState(containers=containers, images=images, host=host)
+
+
+def load_docker_state(host: str = "", timeout: float = 8) -> DockerState:
+    """Snapshot skua containers and local images on a host.
+
+    Costs a constant number of Docker calls regardless of project count:
+    one `docker ps -a`, one `docker image ls`, and one batched inspect each
+    for the listed containers and images (for image IDs and labels).
+    Locally, the Engine API answers the same question in two requests.
+    `timeout` bounds the whole snapshot: each call gets the time left.
+    """
+    end = time.monotonic() + timeout
+    if not host:
+        client = _engine_client()
+        if client is not None:
+            state = _load_docker_state_via_api(client, host=host)
+            if state is not None:
+                return state
+
+    ps_out = _docker_output(
+        ["docker", "ps", "-a", "--no-trunc", "--filter", "name=^skua-", "--format", "{{json .}}"],
+        host=host,
+        timeout=end - time.monotonic(),
+    )
+    if ps_out is None:
+        return DockerState(host=host, reachable=False)
+
+    containers = {}
+    for row in _json_lines(ps_out):
+        name = str(row.get("Names", "") or "").split(",")[0].strip()
+        if not name:
+            continue
+        containers[name] = {
+            "name": name,
+            "id": row.get("ID", ""),
+            "running": str(row.get("State", "")).lower() == "running",
+            "image_name": row.get("Image", ""),
+            "labels": _parse_label_string(row.get("Labels", "")),
+        }
+
+    if containers:
+        inspect_out = _docker_output(
+            ["docker", "container", "inspect", *sorted(containers)],
+            host=host,
+            timeout=end - time.monotonic(),
+        )
+        for row in _json_array(inspect_out):
+            name = str(row.get("Name", "") or "").lstrip("/")
+            record = containers.get(name)
+            if record is None:
+                continue
+            config = row.get("Config") or {}
+            record["image_id"] = row.get("Image", "")
+            record["image_name"] = config.get("Image", "") or record["image_name"]
+            record["labels"] = config.get("Labels") or record["labels"]
+            record["running"] = bool((row.get("State") or {}).get("Running", record["running"]))
+
+    images = {}
+    ls_out = _docker_output(
+        ["docker", "image", "ls", "--no-trunc", "--format", "{{json .}}"],
+        host=host,
+        timeout=end - time.monotonic(),
+    )
+    for row in _json_lines(ls_out):
+        image_id = str(row.get("ID", "") or "")
+        if not image_id:
+            continue
+        if not image_id.startswith("sha256:"):
+            image_id = f"sha256:{image_id}"
+        record = images.setdefault(image_id, {"id": image_id, "refs": [], "labels": {}})
+        repo = str(row.get("Repository", "") or "")
+        tag = str(row.get("Tag", "") or "")
+        if repo and repo != "<none>":
+            record["refs"].append(f"{repo}:{tag}" if tag and tag != "<none>" else repo)
+
+    if images:
+        inspect_out = _docker_output(
+            ["docker", "image", "inspect", *sorted(images)],
+            host=host,
+            timeout=end - time.monotonic(),
+        )
+        for row in _json_array(inspect_out):
+            record = images.get(str(row.get("Id", "") or ""))
+            if record is None:
+                continue
+            record["labels"] = (row.get("Config") or {}).get("Labels") or {}
+            for ref in row.get("RepoTags") or []:
+                if ref not in record["refs"]:
+                    record["refs"].append(ref)
+
+    return DockerState(
+        containers=list(containers.values()),
+        images=list(images.values()),
+        host=host,
+    )
+
+
 def image_name_for_agent(base_image_name: str, agent_name: str) -> str:
     """Return an agent-specific image name, preserving an optional tag."""
     base = (base_image_name or "skua-base").strip()
@@ -96,6 +436,13 @@ def _split_image_ref_tag(image_ref: str) -> tuple:
 
 def image_exists(name: str) -> bool:
     """Check if a Docker image exists locally."""
+    client = _engine_client()
+    if client is not None:
+        from skua.docker_api import DockerAPIError
+        try:
+            return client.inspect_image(name) is not None
+        except DockerAPIError:
+            pass
     try:
         result = subprocess.run(
             ["docker", "image", "inspect", name],
@@ -134,6 +481,38 @@ def image_name_for_project(base_image_name: str, project: Project) -> str:
     return f"{repo}-{project_part}-v{version}{tag}"
 
 
+def content_image_name(base_image_name: str, context_hash: str) -> str:
+    """Return the content-addressed tag for an image with this build-context hash."""
+    repo, tag = _split_image_ref_tag(base_image_name)
+    return f"{repo}-ctx-{context_hash[:12]}{tag}"
+
+
+def content_tag_base(base_image_name: str, image_config: dict, project: Project) -> str:
+    """Return the base name for content-addressed project tags, or "" if unused.
+
+    Enabled by image.contentTags in global.yaml; only customized project images
+    get content tags, since default agent images are already shared.
+    """
+    if not (image_config or {}).get("contentTags", False):
+        return ""
+    if not project_has_image_customizations(project):
+        return ""
+    return base_image_name
+
+
+def tag_image(source: str, target: str) -> bool:
+    """Point tag target at image source."""
+    try:
+        result = subprocess.run(
+            ["docker", "tag", source, target],
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        return False
+    return result.returncode == 0
+
+
 def _merge_unique(items: list) -> list:
     """Return unique non-empty strings in order."""
     out = []
@@ -284,6 +663,43 @@ def base_image_for_agent(default_base_image: str, agent: AgentConfig = None) ->
     return default_base_image
 
 
+# BuildKit cache mounts: apt keeps downloaded .debs and indexes across builds;
+# pip/npm (agent installs and project commands) share one cache directory.
+APT_CACHE_MOUNTS = (
+    "--mount=type=cache,target=/var/cache/apt,sharing=locked "
+    "--mount=type=cache,target=/var/lib/apt/lists,sharing=locked"
+)
+TOOL_CACHE_DIR = "/tmp/skua-build-cache"
+TOOL_CACHE_MOUNT = f"--mount=type=cache,target={TOOL_CACHE_DIR},mode=0777"
+
+
+def _apt_install_run(packages: list, buildkit: bool = False) -> str:
+    """Return a RUN instruction installing apt packages in a single layer."""
+    pkg_line = " \\\n    ".join(packages)
+    if buildkit:
+        return (
+            f"RUN {APT_CACHE_MOUNTS} \\\n"
+            "    rm -f /etc/apt/apt.conf.d/docker-clean \\\n"
+            "    && apt-get update && apt-get install -y --no-install-recommends \\\n"
+            f"    {pkg_line}"
+        )
+    return (
+        "RUN apt-get update && apt-get install -y --no-install-recommends \\\n"
+        f"    {pkg_line} \\\n"
+        "    && rm -rf /var/lib/apt/lists/*"
+    )
+
+
+def _run_line(cmd: str, buildkit: bool = False) -> str:
+    """Return a RUN instruction, pointing pip/npm at the shared cache under BuildKit."""
+    if not buildkit:
+        return f"RUN {cmd}"
+    return (
+        f"RUN {TOOL_CACHE_MOUNT} "
+        f"export npm_config_cache={TOOL_CACHE_DIR}/npm PIP_CACHE_DIR={TOOL_CACHE_DIR}/pip; {cmd}"
+    )
+
+
 def generate_dockerfile(
     agent: AgentConfig = None,
     agents: list = None,
@@ -291,6 +707,7 @@ def generate_dockerfile(
     base_image: str = "debian:bookworm-slim",
     extra_packages: list = None,
     extra_commands: list = None,
+    buildkit: bool = False,
 ) -> str:
     """Generate a Dockerfile from configuration.
 
@@ -301,9 +718,10 @@ def generate_dockerfile(
         base_image: Base Docker image.
         extra_packages: Additional apt packages to install.
         extra_commands: Additional RUN commands to execute.
+        buildkit: Use BuildKit cache mounts for apt, pip and npm downloads.
+            The resulting image content is the same, so build-context hashes
+            are always computed from the non-BuildKit form.
     """
-    packages = list(CORE_PACKAGES)
-
     # If security says no sudo, we still need sudo during build but remove it after
     remove_sudo = security and not security.agent.sudo
 
@@ -311,23 +729,24 @@ def generate_dockerfile(
     if not selected_agents and agent:
         selected_agents = [agent]
 
-    packages.extend(DEFAULT_PACKAGES)
-    for a in selected_agents:
-        packages.extend(DEFAULT_AGENT_REQUIRED_PACKAGES.get(a.name, []))
-        if a.install.required_packages:
-            packages.extend(a.install.required_packages)
-    if extra_packages:
-        packages.extend(extra_packages)
-
-    # Deduplicate while preserving order
+    # Packages are split into layers ordered from most to least shared, so a
+    # project-level change only rebuilds the trailing layers.
     seen = set()
-    unique_packages = []
-    for p in packages:
-        if p not in seen:
-            seen.add(p)
-            unique_packages.append(p)
 
-    pkg_line = " \\\n    ".join(unique_packages)
+    def _take(items) -> list:
+        unique = []
+        for p in items or []:
+            if p not in seen:
+                seen.add(p)
+                unique.append(p)
+        return unique
+
+    base_packages = _take(CORE_PACKAGES + DEFAULT_PACKAGES)
+    agent_packages = []
+    for a in selected_agents:
+        agent_packages.extend(_take(DEFAULT_AGENT_REQUIRED_PACKAGES.get(a.name, [])))
+        agent_packages.extend(_take(a.install.required_packages))
+    project_packages = _take(extra_packages)
 
     # Agent install commands
     install_cmds = []
@@ -350,12 +769,28 @@ def generate_dockerfile(
             unique_install_cmds.append(cmd)
     install_cmds = unique_install_cmds
 
-    install_lines = "\n".join(f"RUN {cmd}" for cmd in install_cmds)
+    install_lines = "\n".join(_run_line(cmd, buildkit) for cmd in install_cmds)
+
+    agent_packages_section = ""
+    if agent_packages:
+        agent_packages_section = f"""
+# ── Agent-required packages ──────────────────────────────────────────
+{_apt_install_run(agent_packages, buildkit)}
+"""
 
-    # Extra commands
-    extra_lines = ""
+    # Project-specific layers go last: adapt changes only rebuild from here.
+    project_section = ""
+    if project_packages:
+        project_section += f"""
+# ── Project packages ─────────────────────────────────────────────────
+USER root
+{_apt_install_run(project_packages, buildkit)}
+USER dev
+"""
     if extra_commands:
-        extra_lines = "\n" + "\n".join(f"RUN {cmd}" for cmd in extra_commands)
+        project_section += """
+# ── Project commands ─────────────────────────────────────────────────
+""" + "\n".join(_run_line(cmd, buildkit) for cmd in extra_commands) + "\n"
 
     # Sudo removal
     sudo_removal = ""
@@ -368,16 +803,15 @@ RUN sudo deluser dev sudo 2>/dev/null || true && \\
     sudo chmod 0440 /etc/sudoers
 """
 
-    dockerfile = f"""FROM {base_image}
+    syntax = "# syntax=docker/dockerfile:1\n" if buildkit else ""
+    dockerfile = f"""{syntax}FROM {base_image}
 
 ARG DEBIAN_FRONTEND=noninteractive
 ARG USER_UID=1000
 ARG USER_GID=1000
 
 # ── Core system packages ─────────────────────────────────────────────
-RUN apt-get update && apt-get install -y --no-install-recommends \\
-    {pkg_line} \\
-    && rm -rf /var/lib/apt/lists/*
+{_apt_install_run(base_packages, buildkit)}
 
 # ── Create non-root user (match host UID/GID when possible) ──────────
 RUN set -eux; \\
@@ -391,16 +825,12 @@ RUN set -eux; \\
         useradd --uid "$USER_UID" --gid "$USER_GID" -m -s /bin/bash dev; \\
     fi; \\
     echo "dev ALL=(ALL) NOPASSWD:ALL" >> /etc/sudoers
-
+{agent_packages_section}
 # ── Install agent ────────────────────────────────────────────────────
 ENV NPM_CONFIG_PREFIX="/home/dev/.local"
 USER dev
 {install_lines}
 WORKDIR /home/dev
-{extra_lines}
-
-# ── Non-sensitive config defaults (copied into volume on first run) ──
-COPY --chown=dev:dev claude-settings/ /home/dev/.claude-defaults/
 
 # ── Placeholder directories ─────────────────────────────────────────
 RUN mkdir -p /home/dev/.ssh /home/dev/project /home/dev/.claude
@@ -408,11 +838,18 @@ RUN mkdir -p /home/dev/.ssh /home/dev/project /home/dev/.claude
 # ── Environment ──────────────────────────────────────────────────────
 ENV EDITOR=vim
 ENV PATH="/home/dev/.local/bin:${{PATH}}"
+{project_section}
+# ── Non-sensitive config defaults (copied into volume on first run) ──
+COPY --chown=dev:dev claude-settings/ /home/dev/.claude-defaults/
 {sudo_removal}
 # ── Entrypoint ───────────────────────────────────────────────────────
 COPY --chown=dev:dev entrypoint.sh /home/dev/entrypoint.sh
 RUN chmod +x /home/dev/entrypoint.sh
 
+# Build-context hash, so the entrypoint can tell when its stamps are stale.
+ARG SKUA_BUILD_HASH=""
+ENV SKUA_IMAGE_HASH="${{SKUA_BUILD_HASH}}"
+
 ENTRYPOINT ["/home/dev/entrypoint.sh"]
 """
     return dockerfile
@@ -420,6 +857,7 @@ ENTRYPOINT ["/home/dev/entrypoint.sh"]
 
 # ── Build ────────────────────────────────────────────────────────────────
 
+@traced("build_image")
 def build_image(
     container_dir: Path,
     image_name: str,
@@ -431,10 +869,26 @@ def build_image(
     extra_commands: list = None,
     quiet: bool = False,
     verbose: bool = False,
+    show_failure: bool = True,
+    buildkit: bool = False,
+    cache_dir: str = "",
+    content_base: str = "",
 ):
     """Build a Docker image, generating the Dockerfile from config.
 
-    Uses container_dir for entrypoint.sh and default agent settings.
+    Uses container_dir for entrypoint.sh and default agent settings. The
+    build context is streamed from memory to `docker build -`, so builds may
+    run concurrently and nothing is written under container_dir.
+    With quiet=True and show_failure=False nothing is printed; the captured
+    output is returned for the caller to report.
+
+    buildkit=True builds with BuildKit cache mounts for apt/pip/npm. A
+    cache_dir additionally exports/imports layer cache there via buildx
+    (see build_cache_options).
+
+    With content_base, the image is also tagged by its build-context hash
+    (content_image_name); if that image already exists, image_name is made
+    an alias for it and nothing is built.
     """
     context_hash = compute_build_context_hash(
         container_dir=container_dir,
@@ -446,121 +900,268 @@ def build_image(
         extra_commands=extra_commands,
     )
 
-    build_path = container_dir / ".build-context"
-    try:
-        if build_path.exists():
-            shutil.rmtree(build_path)
-        build_path.mkdir()
-
-        # Generate Dockerfile
-        dockerfile_content = generate_dockerfile(
-            agent=agent,
-            agents=agents,
-            security=security,
-            base_image=base_image,
-            extra_packages=extra_packages,
-            extra_commands=extra_commands,
-        )
-        (build_path / "Dockerfile").write_text(dockerfile_content)
+    content_image = content_image_name(content_base, context_hash) if content_base else ""
+    if content_image and image_exists(content_image) and tag_image(content_image, image_name):
+        if not quiet:
+            print(f"  Reusing identical image {content_image}")
+        return True, ""
 
-        # Copy entrypoint
-        shutil.copy2(container_dir / "entrypoint.sh", build_path / "entrypoint.sh")
+    dockerfile_content = generate_dockerfile(
+        agent=agent,
+        agents=agents,
+        security=security,
+        base_image=base_image,
+        extra_packages=extra_packages,
+        extra_commands=extra_commands,
+        buildkit=buildkit or bool(cache_dir),
+    )
+    context = build_context_tar(dockerfile_content, container_dir)
+
+    uid = os.getuid()
+    gid = os.getgid()
+    build_args = [
+        "--build-arg", f"USER_UID={uid}",
+        "--build-arg", f"USER_GID={gid}",
+        "--build-arg", f"SKUA_BUILD_HASH={context_hash}",
+        "--label", f"{MANAGED_IMAGE_LABEL}=true",
+        "--label", f"{BUILD_CONTEXT_HASH_LABEL}={context_hash}",
+        "-t", image_name,
+    ]
+    if content_image:
+        build_args.extend(["-t", content_image])
+    env = None
+    cache_export = None
+    cmd = ["docker", "build", *build_args, "-"]
+    if buildkit or cache_dir:
+        env = dict(os.environ, DOCKER_BUILDKIT="1")
+    if cache_dir:
+        builder = _buildx_cache_builder(base_image)
+        if builder:
+            cache_flags, cache_export = _local_cache_flags(Path(cache_dir).expanduser(), image_name)
+            cmd = [
+                "docker", "buildx", "build", "--builder", builder, "--load",
+                *cache_flags, *build_args, "-",
+            ]
+        elif not quiet:
+            print("  Note: local build cache needs docker buildx; building without cache export.")
+
+    success, output = _run_docker_build(
+        cmd, context, env, quiet=quiet, verbose=verbose, show_failure=show_failure,
+    )
+    if cache_export is not None:
+        _finish_cache_export(*cache_export, success=success)
+    return success, output
+
+
+def add_tar_member(tar: tarfile.TarFile, name: str, data: bytes, mode: int = 0o644):
+    """Add an in-memory file to an open tar archive."""
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mode = mode
+    tar.addfile(info, io.BytesIO(data))
+
+
+def build_context_tar(dockerfile_content: str, container_dir: Path) -> bytes:
+    """Return the docker build context as an in-memory tar archive.
 
-        # Copy Claude settings (no credentials)
-        settings_dir = build_path / "claude-settings"
-        settings_dir.mkdir()
+    Contains the Dockerfile, entrypoint.sh and the user's Claude settings (no
+    credentials). Nothing is written to disk, so concurrent builds from the
+    same container_dir stay isolated.
+    """
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        add_tar_member(tar, "Dockerfile", dockerfile_content.encode("utf-8"))
+        entrypoint = container_dir / "entrypoint.sh"
+        add_tar_member(tar, "entrypoint.sh", entrypoint.read_bytes(), mode=0o755)
+        settings_dir = tarfile.TarInfo("claude-settings")
+        settings_dir.type = tarfile.DIRTYPE
+        settings_dir.mode = 0o755
+        tar.addfile(settings_dir)
         claude_home = Path.home() / ".claude"
         for fname in ("settings.json", "settings.local.json"):
             src = claude_home / fname
-            if src.exists():
-                shutil.copy2(src, settings_dir / fname)
-
-        uid = os.getuid()
-        gid = os.getgid()
-        cmd = [
-            "docker", "build",
-            "--build-arg", f"USER_UID={uid}",
-            "--build-arg", f"USER_GID={gid}",
-            "--label", f"{MANAGED_IMAGE_LABEL}=true",
-            "--label", f"{BUILD_CONTEXT_HASH_LABEL}={context_hash}",
-            "-t", image_name,
-            str(build_path),
-        ]
-        if quiet:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                combined = "\n".join(
-                    part for part in [result.stderr, result.stdout] if part
-                )
-                lines = [line.rstrip() for line in combined.splitlines() if line.strip()]
-                if lines:
-                    print("Docker build failed. Last output:")
-                    for line in lines[-12:]:
-                        print(f"  {line}")
-                return False, combined
-            return True, ""
-        if verbose:
-            result = subprocess.run(cmd)
-            return result.returncode == 0, ""
-
-        # Non-verbose: show a single-line progress bar based on build steps.
-        # --progress=plain is a BuildKit-only flag; check availability first.
-        progress_cmd = list(cmd)
-        has_buildx = subprocess.run(
-            ["docker", "buildx", "version"],
+            if src.is_file():
+                add_tar_member(tar, f"claude-settings/{fname}", src.read_bytes())
+    return buf.getvalue()
+
+
+BUILDX_CACHE_BUILDER = "skua-builder"
+
+
+def build_cache_options(image_config: dict) -> dict:
+    """Return build_image cache keyword options from global.yaml's `image` section.
+
+    image.buildkit: true enables BuildKit cache mounts; image.cacheDir also
+    exports/imports layer cache to that directory (and implies buildkit).
+    """
+    image_config = image_config or {}
+    cache_dir = str(image_config.get("cacheDir", "") or "").strip()
+    return {
+        "buildkit": bool(image_config.get("buildkit", False)) or bool(cache_dir),
+        "cache_dir": cache_dir,
+    }
+
+
+def _is_local_only_image(image_ref: str) -> bool:
+    """Return True for images that exist locally but were never pulled/pushed."""
+    try:
+        result = subprocess.run(
+            ["docker", "image", "inspect", "--format", "{{len .RepoDigests}}", image_ref],
             capture_output=True,
-        ).returncode == 0
-        if has_buildx:
-            # Insert before the build path (last element)
-            progress_cmd.insert(-1, "--progress=plain")
-        step_re = re.compile(r"^(step|STEP)\s+(\d+)\s*/\s*(\d+)")
-        tail = deque(maxlen=20)
-        printed_progress = False
-        current_step = 0
-        total_steps = 0
-
-        def render_progress(cur: int, total: int) -> None:
-            if total <= 0:
-                return
-            width = 28
-            filled = int(width * cur / total)
-            bar = "#" * filled + "-" * (width - filled)
-            msg = f"\r  Build progress: [{bar}] {cur}/{total}"
-            print(msg, end="", flush=True)
+            text=True,
+        )
+    except FileNotFoundError:
+        return False
+    return result.returncode == 0 and result.stdout.strip() == "0"
 
-        proc = subprocess.Popen(
-            progress_cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
+
+def _buildx_cache_builder(base_image: str) -> str:
+    """Return a buildx builder able to export local cache, creating it if needed.
+
+    Cache export needs the docker-container driver, which cannot see images
+    that only exist in the local daemon, so "" is returned for such bases.
+    """
+    if _is_local_only_image(base_image):
+        return ""
+    try:
+        inspect = subprocess.run(
+            ["docker", "buildx", "inspect", BUILDX_CACHE_BUILDER],
+            capture_output=True,
             text=True,
         )
-        assert proc.stdout is not None
-        for line in proc.stdout:
-            stripped = line.strip()
-            if stripped:
-                tail.append(stripped)
-            match = step_re.match(stripped)
-            if match:
-                current_step = int(match.group(2))
-                total_steps = int(match.group(3))
-                render_progress(current_step, total_steps)
-                printed_progress = True
+        if inspect.returncode == 0:
+            return BUILDX_CACHE_BUILDER
+        create = subprocess.run(
+            ["docker", "buildx", "create", "--name", BUILDX_CACHE_BUILDER, "--driver", "docker-container"],
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        return ""
+    return BUILDX_CACHE_BUILDER if create.returncode == 0 else ""
 
-        proc.wait()
-        if printed_progress:
-            print()
 
-        if proc.returncode != 0:
-            if tail:
+def _local_cache_flags(cache_root: Path, image_name: str) -> tuple:
+    """Return (buildx cache flags, (staging dir, final dir)) for an image.
+
+    Each image exports to its own subdirectory (so concurrent builds never
+    write the same cache), while every existing subdirectory is imported so
+    images sharing layers hit each other's cache.
+    """
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", image_name)
+    final = cache_root / safe
+    staging = cache_root / f".{safe}.new"
+    flags = []
+    if cache_root.is_dir():
+        for entry in sorted(cache_root.iterdir()):
+            if not entry.name.startswith(".") and (entry / "index.json").is_file():
+                flags.extend(["--cache-from", f"type=local,src={entry}"])
+    flags.extend(["--cache-to", f"type=local,dest={staging},mode=max"])
+    return flags, (staging, final)
+
+
+def _finish_cache_export(staging: Path, final: Path, success: bool):
+    """Swap a freshly exported cache into place (replacing, not growing, the old one)."""
+    if success and (staging / "index.json").is_file():
+        shutil.rmtree(final, ignore_errors=True)
+        staging.rename(final)
+    else:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _run_docker_build(
+    cmd: list, context: bytes, env: dict, quiet: bool, verbose: bool, show_failure: bool,
+) -> tuple:
+    """Run a docker build reading its context tar from stdin.
+
+    Returns (success, captured output).
+    """
+    if quiet:
+        result = subprocess.run(cmd, input=context, capture_output=True, env=env)
+        if result.returncode != 0:
+            combined = "\n".join(
+                part.decode("utf-8", errors="replace")
+                for part in [result.stderr, result.stdout] if part
+            )
+            lines = [line.rstrip() for line in combined.splitlines() if line.strip()]
+            if lines and show_failure:
                 print("Docker build failed. Last output:")
-                for line in tail:
+                for line in lines[-12:]:
                     print(f"  {line}")
-            return False, "\n".join(tail)
+            return False, combined
         return True, ""
-
-    finally:
-        if build_path.exists():
-            shutil.rmtree(build_path, ignore_errors=True)
+    if verbose:
+        result = subprocess.run(cmd, input=context, env=env)
+        return result.returncode == 0, ""
+
+    # Non-verbose: show a single-line progress bar based on build steps.
+    # --progress=plain is a BuildKit-only flag; check availability first.
+    progress_cmd = list(cmd)
+    has_buildx = subprocess.run(
+        ["docker", "buildx", "version"],
+        capture_output=True,
+    ).returncode == 0
+    if has_buildx:
+        # Insert before the context argument (last element)
+        progress_cmd.insert(-1, "--progress=plain")
+    step_re = re.compile(r"^(step|STEP)\s+(\d+)\s*/\s*(\d+)")
+    tail = deque(maxlen=20)
+    printed_progress = False
+    current_step = 0
+    total_steps = 0
+
+    def render_progress(cur: int, total: int) -> None:
+        if total <= 0:
+            return
+        width = 28
+        filled = int(width * cur / total)
+        bar = "#" * filled + "-" * (width - filled)
+        msg = f"\r  Build progress: [{bar}] {cur}/{total}"
+        print(msg, end="", flush=True)
+
+    proc = subprocess.Popen(
+        progress_cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        env=env,
+    )
+    assert proc.stdin is not None and proc.stdout is not None
+
+    def feed_context() -> None:
+        # Written from a thread so build output can be drained meanwhile.
+        try:
+            proc.stdin.buffer.write(context)
+            proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+    feeder = threading.Thread(target=feed_context, daemon=True)
+    feeder.start()
+    for line in proc.stdout:
+        stripped = line.strip()
+        if stripped:
+            tail.append(stripped)
+        match = step_re.match(stripped)
+        if match:
+            current_step = int(match.group(2))
+            total_steps = int(match.group(3))
+            render_progress(current_step, total_steps)
+            printed_progress = True
+
+    proc.wait()
+    feeder.join()
+    if printed_progress:
+        print()
+
+    if proc.returncode != 0:
+        if tail and show_failure:
+            print("Docker build failed. Last output:")
+            for line in tail:
+                print(f"  {line}")
+        return False, "\n".join(tail)
+    return True, ""
 
 
 # ── Run command construction ─────────────────────────────────────────────
@@ -702,12 +1303,43 @@ def exec_into_container(container_name: str):
         'session="${SKUA_TMUX_SESSION:-skua}"; '
         'tmux new-session -A -s "$session"'
     )
+    # execvp skips atexit handlers, so write the trace and parse cache now.
+    flush_trace()
+    save_parse_cache()
     os.execvp(
         "docker",
         ["docker", "exec", "-it", container_name, "bash", "-lc", attach_cmd],
     )
 
 
+ENTRYPOINT_TIMINGS_FILE = "/tmp/skua-entrypoint-timings.json"
+
+
+def entrypoint_timings(container_name: str, timeout_seconds: float = 10.0):
+    """Return the entrypoint's phase timings for a container, or None.
+
+    The entrypoint writes them just before handing off to the session
+    command, so this retries briefly while setup is still running.
+    """
+    deadline = time.time() + max(timeout_seconds, 0.1)
+    while True:
+        try:
+            result = subprocess.run(
+                ["docker", "exec", container_name, "cat", ENTRYPOINT_TIMINGS_FILE],
+                capture_output=True, text=True
+            )
+        except FileNotFoundError:
+            return None
+        if result.returncode == 0:
+            try:
+                return json.loads(result.stdout)
+            except json.JSONDecodeError:
+                pass
+        if time.time() >= deadline:
+            return None
+        time.sleep(0.2)
+
+
 def run_container(docker_cmd: list):
     """Replace this process with docker run (execvp)."""
     os.execvp("docker", docker_cmd)
@@ -726,6 +1358,86 @@ def _hash_with_marker(hasher, marker: str, value):
     hasher.update(b"\0")
 
 
+BUILD_HASH_CACHE_LIMIT = 512
+_BUILD_HASH_MEMO = {}
+_BUILD_HASH_LOCK = threading.Lock()
+
+
+def _build_hash_cache_file() -> Path:
+    return CONFIG_DIR / "cache" / "build-context-hashes.json"
+
+
+def _stat_fingerprint(path: Path) -> list:
+    try:
+        st = path.stat()
+    except OSError:
+        return [str(path), None]
+    return [str(path), st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _build_context_fingerprint(
+    container_dir: Path,
+    security: SecurityProfile,
+    agent: AgentConfig,
+    agents: list,
+    base_image: str,
+    extra_packages: list,
+    extra_commands: list,
+) -> str:
+    """Return a cheap key covering every input of compute_build_context_hash.
+
+    Specs and lists are hashed by value; files by path/size/mtime. This module's
+    own source is included so Dockerfile-generation changes invalidate entries.
+    """
+    claude_home = Path.home() / ".claude"
+    payload = {
+        "skua": __version__,
+        "generator": _stat_fingerprint(Path(__file__)),
+        "security": asdict(security) if security is not None else None,
+        "agent": asdict(agent) if agent is not None else None,
+        "agents": [asdict(a) for a in agents] if agents else None,
+        "base_image": base_image,
+        "extra_packages": list(extra_packages or []),
+        "extra_commands": list(extra_commands or []),
+        "uid": os.getuid(),
+        "gid": os.getgid(),
+        "files": [
+            _stat_fingerprint(container_dir / "entrypoint.sh"),
+            *[_stat_fingerprint(claude_home / f) for f in ("settings.json", "settings.local.json")],
+        ],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _load_build_hash_cache() -> dict:
+    try:
+        data = json.loads(_build_hash_cache_file().read_text())
+    except (OSError, ValueError):
+        return {}
+    entries = data.get("entries") if isinstance(data, dict) else None
+    return entries if isinstance(entries, dict) else {}
+
+
+def _store_build_hash(fingerprint: str, context_hash: str):
+    """Persist a fingerprint -> hash entry (only once skua's config dir exists)."""
+    if not CONFIG_DIR.is_dir():
+        return
+    path = _build_hash_cache_file()
+    entries = _load_build_hash_cache()
+    entries[fingerprint] = {"hash": context_hash, "used": time.time()}
+    if len(entries) > BUILD_HASH_CACHE_LIMIT:
+        ordered = sorted(entries.items(), key=lambda kv: kv[1].get("used", 0) if isinstance(kv[1], dict) else 0)
+        entries = dict(ordered[-BUILD_HASH_CACHE_LIMIT:])
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": 1, "entries": entries}))
+        tmp.replace(path)
+    except OSError:
+        pass
+
+
 def compute_build_context_hash(
     container_dir: Path,
     security: SecurityProfile = None,
@@ -735,7 +1447,47 @@ def compute_build_context_hash(
     extra_packages: list = None,
     extra_commands: list = None,
 ) -> str:
-    """Compute deterministic hash for skua-managed Docker build context."""
+    """Compute deterministic hash for skua-managed Docker build context.
+
+    Results are memoized per process and on disk, keyed on a fingerprint of
+    the inputs, so unchanged projects skip Dockerfile generation and file reads.
+    """
+    fingerprint = _build_context_fingerprint(
+        container_dir, security, agent, agents, base_image, extra_packages, extra_commands,
+    )
+    with _BUILD_HASH_LOCK:
+        cached = _BUILD_HASH_MEMO.get(fingerprint)
+        if cached is None:
+            entry = _load_build_hash_cache().get(fingerprint)
+            if isinstance(entry, dict) and entry.get("hash"):
+                cached = _BUILD_HASH_MEMO[fingerprint] = str(entry["hash"])
+    if cached is not None:
+        return cached
+
+    context_hash = _compute_build_context_hash(
+        container_dir=container_dir,
+        security=security,
+        agent=agent,
+        agents=agents,
+        base_image=base_image,
+        extra_packages=extra_packages,
+        extra_commands=extra_commands,
+    )
+    with _BUILD_HASH_LOCK:
+        _BUILD_HASH_MEMO[fingerprint] = context_hash
+        _store_build_hash(fingerprint, context_hash)
+    return context_hash
+
+
+def _compute_build_context_hash(
+    container_dir: Path,
+    security: SecurityProfile = None,
+    agent: AgentConfig = None,
+    agents: list = None,
+    base_image: str = "debian:bookworm-slim",
+    extra_packages: list = None,
+    extra_commands: list = None,
+) -> str:
     dockerfile_content = generate_dockerfile(
         agent=agent,
         agents=agents,
@@ -763,6 +1515,16 @@ def compute_build_context_hash(
 
 def _image_label(image_name: str, label_key: str) -> str:
     """Return a docker image label value, or empty string when unavailable."""
+    client = _engine_client()
+    if client is not None:
+        from skua.docker_api import DockerAPIError
+        try:
+            data = client.inspect_image(image_name)
+            if data is None:
+                return ""
+            return str(((data.get("Config") or {}).get("Labels") or {}).get(label_key, "") or "")
+        except DockerAPIError:
+            pass
     try:
         result = subprocess.run(
             [
@@ -796,8 +1558,13 @@ def image_matches_build_context(
     base_image: str = "debian:bookworm-slim",
     extra_packages: list = None,
     extra_commands: list = None,
+    state: DockerState = None,
 ) -> bool:
-    """Return True when image label hash matches current generated build context."""
+    """Return True when image label hash matches current generated build context.
+
+    When a :class:`DockerState` snapshot is given, the label is read from it
+    instead of inspecting the image.
+    """
     expected_hash = compute_build_context_hash(
         container_dir=container_dir,
         security=security,
@@ -807,7 +1574,10 @@ def image_matches_build_context(
         extra_packages=extra_packages,
         extra_commands=extra_commands,
     )
-    actual_hash = _image_label(image_name, BUILD_CONTEXT_HASH_LABEL)
+    if state is not None:
+        actual_hash = state.image_label(image_name, BUILD_CONTEXT_HASH_LABEL)
+    else:
+        actual_hash = _image_label(image_name, BUILD_CONTEXT_HASH_LABEL)
     return bool(actual_hash) and actual_hash == expected_hash
 
 
@@ -817,11 +1587,326 @@ def start_container(docker_cmd: list) -> bool:
     return result.returncode == 0
 
 
-def wait_for_running_container(name: str, timeout_seconds: float = 10.0) -> bool:
-    """Wait for a container to appear in docker ps."""
+def stop_container(name: str, host: str = "") -> bool:
+    """Stop a container locally (Engine API when available) or on an SSH host."""
+    if not host:
+        client = _engine_client()
+        if client is not None:
+            from skua.docker_api import DockerAPIError
+            try:
+                client.stop_container(name)
+                return True
+            except DockerAPIError:
+                pass
+    cmd = ["docker", "stop", name]
+    if host:
+        cmd = ssh_argv(host, *cmd)
+    try:
+        result = subprocess.run(cmd)
+    except FileNotFoundError:
+        return False
+    return result.returncode == 0
+
+
+def start_detached_container(docker_cmd: list) -> str:
+    """Run a `docker run -d ...` (or `docker create`) command and return the container ID.
+
+    Returns "" on failure.
+    """
+    try:
+        result = subprocess.run(docker_cmd, stdout=subprocess.PIPE, text=True)
+    except FileNotFoundError:
+        return ""
+    if result.returncode != 0:
+        return ""
+    lines = result.stdout.strip().splitlines()
+    return lines[-1].strip() if lines else ""
+
+
+CONTAINER_CONFIG_HASH_LABEL = "skua.container-config-hash"
+
+
+def container_config_hash(docker_cmd: list, image_id: str) -> str:
+    """Hash a `docker run` argv together with the image ID it resolves to.
+
+    A pre-created container is only reused while this matches, so config edits
+    and rebuilds under the same image tag both force a fresh container.
+    """
+    payload = json.dumps([image_id, *[str(t) for t in docker_cmd[2:]]])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def container_create_command(docker_cmd: list, config_hash: str) -> list:
+    """Turn a detached `docker run` argv into `docker create` with a config-hash label.
+
+    --rm is dropped so the container survives `skua stop` and the next run
+    only has to start it again.
+    """
+    args = [token for token in docker_cmd[2:] if token not in ("-d", "--rm")]
+    return ["docker", "create", "--label", f"{CONTAINER_CONFIG_HASH_LABEL}={config_hash}", *args]
+
+
+def image_id(name: str) -> str:
+    """Return the local image ID for name ("" when missing)."""
+    client = _engine_client()
+    if client is not None:
+        from skua.docker_api import DockerAPIError
+        try:
+            data = client.inspect_image(name)
+            return str((data or {}).get("Id", ""))
+        except DockerAPIError:
+            pass
+    try:
+        result = subprocess.run(
+            ["docker", "image", "inspect", "--format", "{{.Id}}", name],
+            capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        return ""
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def inspect_container_state(name: str):
+    """Return {"id", "running", "config_hash"} for a container, or None if absent."""
+    data = None
+    client = _engine_client()
+    if client is not None:
+        from skua.docker_api import DockerAPIError
+        try:
+            data = client.inspect_container(name)
+            if data is None:
+                return None
+        except DockerAPIError:
+            data = None
+    if data is None:
+        try:
+            result = subprocess.run(
+                ["docker", "container", "inspect", name],
+                capture_output=True, text=True
+            )
+        except FileNotFoundError:
+            return None
+        if result.returncode != 0:
+            return None
+        rows = _json_array(result.stdout)
+        if not rows:
+            return None
+        data = rows[0]
+    labels = (data.get("Config") or {}).get("Labels") or {}
+    return {
+        "id": str(data.get("Id", "")),
+        "running": bool((data.get("State") or {}).get("Running")),
+        "config_hash": str(labels.get(CONTAINER_CONFIG_HASH_LABEL, "")),
+    }
+
+
+def start_existing_container(name: str) -> bool:
+    """Start a stopped container (Engine API when available)."""
+    client = _engine_client()
+    if client is not None:
+        from skua.docker_api import DockerAPIError
+        try:
+            client.start_container(name)
+            return True
+        except DockerAPIError:
+            pass
+    try:
+        result = subprocess.run(["docker", "start", name], stdout=subprocess.DEVNULL)
+    except FileNotFoundError:
+        return False
+    return result.returncode == 0
+
+
+def remove_container(name: str) -> bool:
+    """Force-remove a container."""
+    try:
+        result = subprocess.run(["docker", "rm", "-f", name], capture_output=True, text=True)
+    except FileNotFoundError:
+        return False
+    return result.returncode == 0
+
+
+READINESS_EVENTS = ("start", "die")
+
+
+def _api_container_events(client, ref: str, since: float, deadline: float):
+    """Yield (action, exit_code) for start/die events from the Engine API."""
+    from skua.docker_api import DockerAPIError
+    filters = {"type": ["container"], "container": [ref], "event": list(READINESS_EVENTS)}
+    try:
+        for event in client.events(filters=filters, since=since, timeout=max(deadline - time.time(), 0.1)):
+            attrs = (event.get("Actor") or {}).get("Attributes") or {}
+            yield str(event.get("Action") or event.get("status") or ""), str(attrs.get("exitCode", ""))
+    except DockerAPIError:
+        return
+
+
+def _cli_container_events(ref: str, since: float, deadline: float):
+    """Yield (action, exit_code) for start/die events from `docker events`.
+
+    Uses the default text format (`<time> container <action> <id> (k=v, ...)`)
+    so the command also survives the ssh docker wrapper's word splitting.
+    """
+    argv = [
+        "docker", "events",
+        "--since", str(int(since)),
+        "--filter", "type=container",
+        "--filter", f"container={ref}",
+        *[arg for event in READINESS_EVENTS for arg in ("--filter", f"event={event}")],
+    ]
+    try:
+        proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return
+    buffer = b""
+    try:
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            ready, _, _ = select.select([proc.stdout], [], [], remaining)
+            if not ready:
+                return
+            chunk = os.read(proc.stdout.fileno(), 4096)
+            if not chunk:
+                return
+            buffer += chunk
+            while b"\n" in buffer:
+                raw, buffer = buffer.split(b"\n", 1)
+                parts = raw.decode("utf-8", errors="replace").split()
+                if len(parts) < 3:
+                    continue
+                match = re.search(r"exitCode=(\d+)", raw.decode("utf-8", errors="replace"))
+                yield parts[2], match.group(1) if match else ""
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def _follow_container_logs(ref: str, tail: int = 20):
+    """Follow a container's output in the background, keeping the last lines.
+
+    Detached runs use --rm, so by the time a `die` event arrives Docker may
+    already have removed the container and its log. Returns
+    (proc, lines, reader thread), or None if docker cannot be run.
+    """
+    try:
+        proc = subprocess.Popen(
+            ["docker", "logs", "--follow", "--tail", str(tail), ref],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+    except OSError:
+        return None
+    lines = deque(maxlen=tail)
+
+    def _read():
+        for raw in proc.stdout:
+            lines.append(raw.decode("utf-8", errors="replace").rstrip("\n"))
+
+    reader = threading.Thread(target=_read, daemon=True)
+    reader.start()
+    return proc, lines, reader
+
+
+def _stop_following(follower, drain_seconds: float = 0.0) -> list:
+    """Stop a log follower and return the lines it captured.
+
+    With drain_seconds, first give the stream that long to end on its own
+    (it does once the container has exited) so the final lines are kept.
+    """
+    if follower is None:
+        return []
+    proc, lines, reader = follower
+    if drain_seconds:
+        reader.join(drain_seconds)
+    if proc.poll() is None:
+        proc.kill()
+    proc.wait()
+    reader.join(1)
+    return [line for line in lines if line.strip()]
+
+
+def _report_container_exit(name: str, exit_code: str, tail: int = 20, captured: list = None):
+    """Print a container's exit code and the last lines of its log.
+
+    captured holds output collected while the container ran; without it the
+    log is read from Docker, which fails once an --rm container is gone.
+    """
+    code = exit_code or "unknown"
+    print(f"Container '{name}' exited during startup (exit code {code}).")
+    lines = list(captured or [])[-tail:]
+    if not lines:
+        try:
+            result = subprocess.run(
+                ["docker", "logs", "--tail", str(tail), name],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                timeout=10,
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return
+        lines = result.stdout.rstrip().splitlines() if result.returncode == 0 else []
+    if lines:
+        print(f"Last {len(lines)} log line(s):")
+        for line in lines:
+            print(f"  {line}")
+    else:
+        print("  (no log output available; the container was removed)")
+
+
+@traced()
+def wait_for_running_container(
+    name: str,
+    timeout_seconds: float = 10.0,
+    since: float = None,
+    container_id: str = "",
+) -> bool:
+    """Wait for a container's `start` event; fail fast on `die`.
+
+    Subscribes to container events (Engine API stream locally, `docker events`
+    otherwise) instead of polling. `since` should be taken before the container
+    was started so events that already happened are replayed; `container_id`
+    narrows the filter so events from an earlier container with the same name
+    are ignored and the container's output is followed while waiting. On
+    `die`, prints the exit code and log tail and returns False.
+    Falls back to polling if the event stream ends before the deadline.
+    """
     deadline = time.time() + max(timeout_seconds, 0.1)
-    while time.time() < deadline:
+    if since is None:
+        since = time.time()
         if is_container_running(name):
             return True
-        time.sleep(0.2)
-    return is_container_running(name)
+    # Allow for clock skew between this host and a remote daemon.
+    since = since - 5 if container_id else since
+    ref = container_id or name
+
+    # A freshly started container is followed from the start so its output
+    # survives auto-removal.
+    follower = _follow_container_logs(container_id) if container_id else None
+    try:
+        client = _engine_client()
+        if client is not None:
+            events = _api_container_events(client, ref, since, deadline)
+        else:
+            events = _cli_container_events(ref, since, deadline)
+        for action, exit_code in events:
+            if action == "start":
+                # A replayed start may belong to a container that already died;
+                # its die event follows in that case.
+                if is_container_running(name):
+                    return True
+            elif action == "die":
+                captured = _stop_following(follower, drain_seconds=2.0)
+                follower = None
+                _report_container_exit(name, exit_code, captured=captured)
+                return False
+
+        while time.time() < deadline:
+            if is_container_running(name):
+                return True
+            time.sleep(0.2)
+        return is_container_running(name)
+    finally:
+        _stop_following(follower)
@@ -0,0 +1,267 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Minimal Docker Engine API client over the local unix socket.
+
+skua.docker uses this opportunistically to skip docker CLI startup cost.
+Every caller falls back to the CLI when no client is available (remote
+DOCKER_HOST, non-default docker context, unreachable socket, or
+SKUA_DOCKER_API=0).
+"""
+
+import http.client
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+from urllib.parse import quote, urlencode
+
+
+DEFAULT_SOCKET = "/var/run/docker.sock"
+API_VERSION = "v1.41"
+
+
+class DockerAPIError(Exception):
+    """Raised when an Engine API request fails or returns an error status."""
+
+    def __init__(self, message: str, status: int = 0):
+        super().__init__(message)
+        self.status = status
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection that connects to a unix domain socket."""
+
+    def __init__(self, socket_path: str, timeout: float = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class DockerEngineClient:
+    """Engine API client reusing one keep-alive connection per socket and thread.
+
+    Build workers share one client; an HTTPConnection carries only one
+    request at a time, so each thread gets its own.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, timeout: float = 10.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @property
+    def _conn(self):
+        return getattr(self._local, "conn", None)
+
+    @_conn.setter
+    def _conn(self, conn):
+        self._local.conn = conn
+
+    def close(self):
+        """Close the calling thread's connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _path(self, path: str, params: dict = None) -> str:
+        url = f"/{API_VERSION}{path}"
+        query = {k: v for k, v in (params or {}).items() if v is not None}
+        if query:
+            url += "?" + urlencode(query)
+        return url
+
+    def _request(self, method: str, path: str, params: dict = None, body=None):
+        """Send a request and return (status, decoded JSON or None)."""
+        url = self._path(path, params)
+        headers = {"Host": "docker"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        # A kept-alive connection may have been closed by the daemon; retry once.
+        for attempt in (1, 2):
+            if self._conn is None:
+                self._conn = _UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+            try:
+                self._conn.request(method, url, body=payload, headers=headers)
+                response = self._conn.getresponse()
+                raw = response.read()
+                break
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as exc:
+                self.close()
+                if attempt == 2:
+                    raise DockerAPIError(f"{method} {path}: {exc}") from exc
+            except (OSError, http.client.HTTPException) as exc:
+                self.close()
+                raise DockerAPIError(f"{method} {path}: {exc}") from exc
+
+        if response.will_close:
+            self.close()
+
+        data = None
+        if raw:
+            try:
+                data = json.loads(raw.decode("utf-8"))
+            except (ValueError, UnicodeDecodeError):
+                data = raw.decode("utf-8", errors="replace")
+        return response.status, data
+
+    def _checked(self, method: str, path: str, params: dict = None, body=None, ok=(200,)):
+        status, data = self._request(method, path, params=params, body=body)
+        if status not in ok:
+            message = data.get("message", "") if isinstance(data, dict) else str(data or "")
+            raise DockerAPIError(f"{method} {path}: {status} {message}".strip(), status=status)
+        return data
+
+    # ── Queries ──
+
+    def ping(self) -> bool:
+        try:
+            status, _ = self._request("GET", "/_ping")
+        except DockerAPIError:
+            return False
+        return status == 200
+
+    def inspect_container(self, name: str):
+        """Return container inspect data, or None when it does not exist."""
+        status, data = self._request("GET", f"/containers/{quote(name, safe='')}/json")
+        if status == 404:
+            return None
+        if status != 200:
+            raise DockerAPIError(f"inspect container {name}: {status}", status=status)
+        return data
+
+    def inspect_image(self, name: str):
+        """Return image inspect data, or None when it does not exist."""
+        status, data = self._request("GET", f"/images/{quote(name, safe='')}/json")
+        if status == 404:
+            return None
+        if status != 200:
+            raise DockerAPIError(f"inspect image {name}: {status}", status=status)
+        return data
+
+    def list_containers(self, all: bool = False, filters: dict = None) -> list:
+        params = {"all": "1" if all else "0"}
+        if filters:
+            params["filters"] = json.dumps(filters)
+        return self._checked("GET", "/containers/json", params=params) or []
+
+    def list_images(self, filters: dict = None) -> list:
+        params = {}
+        if filters:
+            params["filters"] = json.dumps(filters)
+        return self._checked("GET", "/images/json", params=params) or []
+
+    # ── Lifecycle ──
+
+    def create_container(self, name: str, config: dict) -> str:
+        data = self._checked("POST", "/containers/create", params={"name": name}, body=config, ok=(201,))
+        return str((data or {}).get("Id", ""))
+
+    def start_container(self, name: str):
+        self._checked("POST", f"/containers/{quote(name, safe='')}/start", ok=(204, 304))
+
+    def stop_container(self, name: str, timeout: int = None):
+        self._checked(
+            "POST",
+            f"/containers/{quote(name, safe='')}/stop",
+            params={"t": timeout},
+            ok=(204, 304),
+        )
+
+    def events(self, filters: dict = None, since: float = None, until: float = None, timeout: float = None):
+        """Yield decoded events from the streaming /events endpoint.
+
+        Uses a dedicated connection so the keep-alive connection stays free.
+        Stops at `until` (daemon side) or raises DockerAPIError on socket timeout.
+        """
+        params = {}
+        if filters:
+            params["filters"] = json.dumps(filters)
+        if since is not None:
+            params["since"] = f"{since:.9f}"
+        if until is not None:
+            params["until"] = f"{until:.9f}"
+        conn = _UnixHTTPConnection(self.socket_path, timeout=timeout)
+        try:
+            conn.request("GET", self._path("/events", params), headers={"Host": "docker"})
+            response = conn.getresponse()
+            if response.status != 200:
+                raise DockerAPIError(f"GET /events: {response.status}", status=response.status)
+            while True:
+                line = response.readline()
+                if not line:
+                    return
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line.decode("utf-8"))
+                except (ValueError, UnicodeDecodeError):
+                    continue
+        except (OSError, http.client.HTTPException) as exc:
+            raise DockerAPIError(f"GET /events: {exc}") from exc
+        finally:
+            conn.close()
+
+
+def _current_docker_context() -> str:
+    """Return the active docker CLI context name ("default" when unset)."""
+    env_context = os.environ.get("DOCKER_CONTEXT", "").strip()
+    if env_context:
+        return env_context
+    config_dir = os.environ.get("DOCKER_CONFIG", "").strip()
+    config_path = Path(config_dir or Path.home() / ".docker") / "config.json"
+    try:
+        data = json.loads(config_path.read_text())
+    except (OSError, ValueError):
+        return "default"
+    return str(data.get("currentContext", "") or "default") if isinstance(data, dict) else "default"
+
+
+def socket_path_from_env() -> str:
+    """Return the unix socket the docker CLI would use, or "" when not local."""
+    if os.environ.get("SKUA_DOCKER_API", "").strip().lower() in ("0", "false", "no", "off"):
+        return ""
+    if os.environ.get("SKUA_DOCKER_TRANSPORT", "").strip():
+        return ""
+    docker_host = os.environ.get("DOCKER_HOST", "").strip()
+    if docker_host:
+        if docker_host.startswith("unix://"):
+            return docker_host[len("unix://"):]
+        return ""
+    if _current_docker_context() != "default":
+        return ""
+    return DEFAULT_SOCKET
+
+
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_client():
+    """Return a cached client for the current socket, or None when unusable."""
+    path = socket_path_from_env()
+    if not path:
+        return None
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(path)
+        if client is None:
+            client = DockerEngineClient(path)
+            if not os.path.exists(path) or not client.ping():
+                client.close()
+                client = False
+            _CLIENTS[path] = client
+    return client or None
+
@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Shared bare mirrors for local repo clones.
+
+Each upstream repo gets one bare mirror under ~/.config/skua/git-cache/,
+named by its normalized URL (utils.repo_cache_key), so `git@host:org/x.git`
+and `https://host/org/x` share it. Project clones are made from the mirror
+with `git clone --local`, which hardlinks its object files instead of
+downloading them. The clone is then pointed back at the upstream URL, and
+it never depends on the mirror afterwards. The mirror is refreshed with an
+incremental fetch before each clone.
+"""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+from skua.utils import repo_cache_key
+
+MIRROR_REFSPECS = ("+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*")
+
+
+def _git_prefix(ssh_key: str = "") -> list:
+    if ssh_key:
+        ssh_cmd = f"ssh -i {ssh_key} -o StrictHostKeyChecking=no"
+        return ["git", "-c", f"core.sshCommand={ssh_cmd}"]
+    return ["git"]
+
+
+def mirror_path(cache_dir: Path, repo_url: str) -> Path:
+    """Return the bare mirror location for repo_url."""
+    return Path(cache_dir) / f"{repo_cache_key(repo_url)}.git"
+
+
+def refresh_mirror(cache_dir: Path, repo_url: str, ssh_key: str = "") -> Path:
+    """Create or incrementally update the mirror for repo_url.
+
+    Returns the mirror path, or None if it could not be created. A failed
+    update of an existing mirror still returns it (it is just older).
+    """
+    git = _git_prefix(ssh_key)
+    mirror = mirror_path(cache_dir, repo_url)
+    if (mirror / "HEAD").is_file():
+        result = subprocess.run(
+            git + ["-C", str(mirror), "fetch", "--prune", "--quiet", "origin"],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            print(f"Warning: could not refresh git cache for {repo_url}; using cached objects.")
+        return mirror
+
+    mirror.parent.mkdir(parents=True, exist_ok=True)
+    tmp = mirror.with_name(f".{mirror.name}.{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    try:
+        subprocess.run(git + ["clone", "--bare", "--quiet", repo_url, str(tmp)], check=True)
+        subprocess.run(["git", "-C", str(tmp), "config", "--unset-all", "remote.origin.fetch"],
+                       capture_output=True)
+        for refspec in MIRROR_REFSPECS:
+            subprocess.run(["git", "-C", str(tmp), "config", "--add", "remote.origin.fetch", refspec],
+                           check=True, capture_output=True)
+        os.replace(tmp, mirror)
+    except (subprocess.CalledProcessError, OSError):
+        shutil.rmtree(tmp, ignore_errors=True)
+        # Another process may have created it meanwhile.
+        return mirror if (mirror / "HEAD").is_file() else None
+    return mirror
+
+
+def clone_repo(repo_url: str, dest: Path, cache_dir: Path, ssh_key: str = "") -> bool:
+    """Clone repo_url into dest, borrowing objects from the shared mirror.
+
+    Falls back to a plain clone from upstream when the mirror is unavailable.
+    Returns True on success.
+    """
+    git = _git_prefix(ssh_key)
+    mirror = refresh_mirror(cache_dir, repo_url, ssh_key)
+    if mirror is not None:
+        result = subprocess.run(["git", "clone", "--local", "--quiet", str(mirror), str(dest)])
+        if result.returncode == 0:
+            # The mirror was just fetched, so its branches (now this clone's
+            # remote-tracking refs) are current; only the URL needs fixing.
+            result = subprocess.run(["git", "-C", str(dest), "remote", "set-url", "origin", repo_url])
+            if result.returncode == 0:
+                return True
+        shutil.rmtree(dest, ignore_errors=True)
+        print("Warning: clone from git cache failed; cloning from upstream.")
+
+    result = subprocess.run(git + ["clone", repo_url, str(dest)])
+    return result.returncode == 0
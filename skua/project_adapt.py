@@ -1,9 +1,13 @@
 # SPDX-License-Identifier: BUSL-1.1
 """Project image-adapt helpers.
 
-This module manages per-project adapt guidance and image request templates.
+This module manages per-project adapt guidance and image request templates,
+and the cache of agent discovery results.
 """
 
+import hashlib
+import json
+import os
 from pathlib import Path
 
 import yaml
@@ -15,6 +19,16 @@ IMAGE_REQUEST_NAME = "image-request.yaml"
 AGENTS_HINT_NAME = "AGENTS.md"
 CLAUDE_HINT_NAME = "CLAUDE.md"
 
+# Files whose contents decide what an agent's discovery asks for. Matched in
+# the project root and one directory below it (for monorepo packages).
+DEPENDENCY_MANIFESTS = (
+    "pyproject.toml", "setup.py", "setup.cfg", "requirements*.txt", "Pipfile", "Pipfile.lock",
+    "poetry.lock", "uv.lock", "environment.yml", ".python-version",
+    "package.json", "package-lock.json", "yarn.lock", "pnpm-lock.yaml", ".nvmrc",
+    "Cargo.toml", "Cargo.lock", "go.mod", "go.sum", "Gemfile", "Gemfile.lock",
+    "Makefile", "Dockerfile", ".tool-versions", "apt.txt", "Aptfile", "packages.txt",
+)
+
 
 def adapt_dir(project_dir: Path) -> Path:
     """Return the .skua adapt directory path for a project."""
@@ -189,6 +203,83 @@ def write_applied_image_request(path: Path, request: dict, version: int):
         yaml.dump(req, f, default_flow_style=False, sort_keys=False)
 
 
+def merge_image_requests(base: dict, update: dict) -> dict:
+    """Return base extended by update: lists are joined, update's images and summary win."""
+    base = normalize_image_request(base or {})
+    update = normalize_image_request(update or {})
+    return normalize_image_request({
+        "schemaVersion": 1,
+        "status": "ready",
+        "summary": update["summary"] or base["summary"],
+        "baseImage": update["baseImage"] or base["baseImage"],
+        "fromImage": update["fromImage"] or base["fromImage"],
+        "packages": base["packages"] + update["packages"],
+        "commands": base["commands"] + update["commands"],
+    })
+
+
+def write_image_request(path: Path, request: dict):
+    """Write request to the image-request file, ready to be applied."""
+    req = normalize_image_request(request or {})
+    req["status"] = "ready"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        yaml.dump(req, f, default_flow_style=False, sort_keys=False)
+
+
+def dependency_manifests(project_dir: Path) -> list:
+    """Return the dependency manifest files of a project, sorted."""
+    found = set()
+    for pattern in DEPENDENCY_MANIFESTS:
+        found.update(project_dir.glob(pattern))
+        for path in project_dir.glob(f"*/{pattern}"):
+            if not path.parent.name.startswith(".") and path.parent.name != "node_modules":
+                found.add(path)
+    return sorted(p for p in found if p.is_file())
+
+
+def discovery_cache_key(project_dir: Path, *context: str) -> str:
+    """Digest the project's dependency manifests plus context (agent, base image, ...)."""
+    h = hashlib.sha256()
+    for item in context:
+        h.update(f"{item}\0".encode())
+    for path in dependency_manifests(project_dir):
+        h.update(f"{path.relative_to(project_dir).as_posix()}\0".encode())
+        try:
+            h.update(hashlib.sha256(path.read_bytes()).digest())
+        except OSError:
+            h.update(b"unreadable")
+    return h.hexdigest()
+
+
+def discovery_cache_file(config_dir: Path, project_name: str) -> Path:
+    """Record of a project's last agent discovery and the key it was made under."""
+    return Path(config_dir) / "cache" / "adapt-discovery" / f"{project_name}.json"
+
+
+def load_cached_discovery(cache_file: Path, key: str):
+    """Return the cached image request for key, or None on a miss."""
+    try:
+        entry = json.loads(Path(cache_file).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("key") != key or not isinstance(entry.get("request"), dict):
+        return None
+    return normalize_image_request(entry["request"])
+
+
+def save_cached_discovery(cache_file: Path, key: str, request: dict):
+    """Remember request as the discovery result for key."""
+    cache_file = Path(cache_file)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_name(f".{cache_file.name}.{os.getpid()}")
+        tmp.write_text(json.dumps({"key": key, "request": normalize_image_request(request or {})}))
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+
+
 def _adapt_guide_text(project_name: str, agent_name: str) -> str:
     return f"""# SPDX-License-Identifier: BUSL-1.1
 # Skua Image Adapt ({project_name})
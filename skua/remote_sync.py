@@ -0,0 +1,443 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Keep remote-host repo volumes in sync with their upstream repository.
+
+Remote projects (Project.host) work on a clone inside the `skua-<name>-repo`
+Docker volume on the remote daemon. sync_repo_into_volume() creates that
+clone on first use and fetches + fast-forwards it on later runs, all in one
+alpine/git helper container. Clones can be partial (`git.remoteFilter`) or
+shallow (`git.remoteDepth`), and with `git.remoteMirror` each host keeps
+bare mirrors in a shared volume that new clones borrow objects from, so
+projects on the same upstream download its history once per host.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import shlex
+import stat
+import subprocess
+import sys
+import tarfile
+import time
+from pathlib import Path
+
+from skua.trace import traced
+from skua.utils import repo_cache_key
+
+MIRROR_VOLUME = "skua-git-mirrors"
+STATUS_PREFIX = "skua-sync: "
+
+
+def sync_options(g: dict) -> dict:
+    """Return remote clone options from global config (the `git` section)."""
+    git = g.get("git", {}) or {}
+    try:
+        depth = max(0, int(git.get("remoteDepth", 0) or 0))
+    except (TypeError, ValueError):
+        depth = 0
+    return {
+        "filter": str(git.get("remoteFilter", "") or "").strip(),
+        "depth": depth,
+        "mirror": bool(git.get("remoteMirror", False)),
+    }
+
+
+def sync_script(ssh_cmd_parts: list, options: dict) -> str:
+    """Return the helper-container script that clones or updates /workspace.
+
+    Prints one "skua-sync: <status>" line on stdout: cloned, updated,
+    current, diverged or fetch-failed.
+    """
+    clone_args = []
+    if options.get("filter"):
+        clone_args.append(f"--filter={options['filter']}")
+    if options.get("depth"):
+        # Later fetches of a shallow clone only bring in new commits (down to
+        # ones it already has), so the depth is applied at clone time only.
+        clone_args.append(f"--depth={options['depth']}")
+    clone_args = " ".join(shlex.quote(a) for a in clone_args)
+
+    return (
+        "set -eu\n"
+        "if [ -n \"${SKUA_REMOTE_GIT_SSH_KEY_B64:-}\" ]; then\n"
+        "  mkdir -p /tmp/skua-ssh\n"
+        "  printf '%s' \"$SKUA_REMOTE_GIT_SSH_KEY_B64\" | base64 -d > /tmp/skua-ssh/id_key\n"
+        "  chmod 600 /tmp/skua-ssh/id_key\n"
+        "fi\n"
+        "if [ -n \"${SKUA_REMOTE_GIT_KNOWN_HOSTS_B64:-}\" ]; then\n"
+        "  mkdir -p /tmp/skua-ssh\n"
+        "  printf '%s' \"$SKUA_REMOTE_GIT_KNOWN_HOSTS_B64\" | base64 -d > /tmp/skua-ssh/known_hosts\n"
+        "  chmod 600 /tmp/skua-ssh/known_hosts\n"
+        "fi\n"
+        f"export GIT_SSH_COMMAND={shlex.quote(' '.join(ssh_cmd_parts))}\n"
+        # The clone is owned by the container user, not the helper's root.
+        "git config --global --add safe.directory '*'\n"
+        "repo=\"$SKUA_REMOTE_GIT_REPO\"\n"
+        "ref_args=\"\"\n"
+        "if [ -n \"${SKUA_MIRROR_KEY:-}\" ]; then\n"
+        "  m=\"/mirrors/$SKUA_MIRROR_KEY.git\"\n"
+        "  if [ -d \"$m\" ]; then\n"
+        "    git -C \"$m\" remote update --prune >/dev/null"
+        " || echo \"warning: could not refresh mirror $m\" >&2\n"
+        "  else\n"
+        "    tmp=\"$m.tmp.$$\"\n"
+        "    if git clone --mirror \"$repo\" \"$tmp\"; then\n"
+        "      mv \"$tmp\" \"$m\" 2>/dev/null || rm -rf \"$tmp\"\n"
+        "    else\n"
+        "      rm -rf \"$tmp\"\n"
+        "    fi\n"
+        "  fi\n"
+        # --dissociate copies borrowed objects, so the clone never depends on
+        # the mirror volume (which the project container does not mount).
+        "  if [ -d \"$m\" ]; then ref_args=\"--reference-if-able $m --dissociate\"; fi\n"
+        "fi\n"
+        "if [ -d /workspace/.git ]; then\n"
+        "  owner=$(stat -c %u:%g /workspace/.git)\n"
+        "  cd /workspace\n"
+        "  before=$(git rev-parse -q --verify HEAD || true)\n"
+        "  if git fetch --prune origin; then\n"
+        "    status=current\n"
+        "    if git rev-parse -q --verify '@{u}' >/dev/null; then\n"
+        "      if git merge --ff-only -q '@{u}' >/dev/null; then\n"
+        "        [ \"$(git rev-parse -q --verify HEAD)\" = \"$before\" ] || status=updated\n"
+        "      else\n"
+        "        status=diverged\n"
+        "      fi\n"
+        "    fi\n"
+        "  else\n"
+        "    status=fetch-failed\n"
+        "  fi\n"
+        "  find /workspace -xdev ! -user \"${owner%%:*}\" -exec chown \"$owner\" {} + 2>/dev/null || true\n"
+        f"  echo \"{STATUS_PREFIX}$status\"\n"
+        "else\n"
+        f"  git clone {clone_args} $ref_args \"$repo\" /workspace\n"
+        f"  echo \"{STATUS_PREFIX}cloned\"\n"
+        "fi\n"
+    )
+
+
+@traced()
+def sync_repo_into_volume(project, vol_name: str, options: dict = None):
+    """Clone or update the project repo in a Docker named volume.
+
+    Requires the current process Docker transport to target the remote host.
+    Exits if the initial clone fails; a failed fetch of an existing clone only
+    warns, since the clone is still usable.
+    """
+    options = options or {}
+    sync_env = os.environ.copy()
+    sync_env["SKUA_REMOTE_GIT_REPO"] = project.repo
+
+    ssh_cmd_parts = ["ssh", "-o", "StrictHostKeyChecking=accept-new"]
+    env_vars = ["SKUA_REMOTE_GIT_REPO"]
+    key_path_value = str(getattr(project.ssh, "private_key", "") or "").strip()
+    if key_path_value:
+        key_path = Path(key_path_value).expanduser()
+        if key_path.is_file():
+            sync_env["SKUA_REMOTE_GIT_SSH_KEY_B64"] = base64.b64encode(key_path.read_bytes()).decode("ascii")
+            env_vars.append("SKUA_REMOTE_GIT_SSH_KEY_B64")
+            ssh_cmd_parts.extend(["-i", "/tmp/skua-ssh/id_key", "-o", "IdentitiesOnly=yes"])
+
+            known_hosts_path = key_path.parent / "known_hosts"
+            if known_hosts_path.is_file():
+                sync_env["SKUA_REMOTE_GIT_KNOWN_HOSTS_B64"] = base64.b64encode(
+                    known_hosts_path.read_bytes()
+                ).decode("ascii")
+                env_vars.append("SKUA_REMOTE_GIT_KNOWN_HOSTS_B64")
+                ssh_cmd_parts.extend(["-o", "UserKnownHostsFile=/tmp/skua-ssh/known_hosts"])
+        else:
+            print(f"Warning: SSH key not found for remote clone: {key_path}")
+            print("  Falling back to remote host SSH defaults.")
+
+    sync_cmd = ["docker", "run", "--rm", "-v", f"{vol_name}:/workspace"]
+    if options.get("mirror"):
+        sync_env["SKUA_MIRROR_KEY"] = repo_cache_key(project.repo)
+        env_vars.append("SKUA_MIRROR_KEY")
+        sync_cmd.extend(["-v", f"{MIRROR_VOLUME}:/mirrors"])
+    for var in env_vars:
+        sync_cmd.extend(["-e", var])
+    sync_cmd.extend(["--entrypoint", "sh", "alpine/git", "-c", sync_script(ssh_cmd_parts, options)])
+
+    print(f"Syncing {project.repo} into remote volume '{vol_name}'...")
+    # stdout carries only the status line; git progress goes to stderr.
+    result = subprocess.run(sync_cmd, env=sync_env, stdout=subprocess.PIPE, text=True)
+    status = ""
+    for line in (result.stdout or "").splitlines():
+        if line.startswith(STATUS_PREFIX):
+            status = line[len(STATUS_PREFIX):].strip()
+
+    if result.returncode != 0 or not status:
+        print("Error: Failed to clone repository into remote volume.")
+        print("  Tip: Confirm repository access for the configured SSH key and remote host network reachability.")
+        sys.exit(1)
+    if status == "updated":
+        print("  Fast-forwarded to the latest upstream commit.")
+    elif status == "current":
+        print("  Repo clone is up to date.")
+    elif status == "diverged":
+        print("  Warning: repo clone has local commits that diverge from upstream; left as is.")
+    elif status == "fetch-failed":
+        print("  Warning: could not fetch from upstream; using the existing clone.")
+    return status
+
+
+# ── Directory delta sync ─────────────────────────────────────────────────
+#
+# Remote projects with a local directory (Project.host + Project.directory)
+# are pushed into the same repo volume. The volume keeps a manifest of
+# "<digest> <path>" lines for what skua last wrote. A push sends a gzipped
+# tar of only the files whose digest differs, the paths to delete (applied
+# first, pruning directories they leave empty), the new manifest, and the checksum of the manifest it assumed was there. The
+# helper applies the delta only if that checksum still matches; otherwise it
+# replies with the real manifest and skua recomputes the delta once. The
+# last known remote manifest is cached locally, so an in-sync push costs one
+# container round trip and an unchanged tree costs none.
+
+SYNC_MANIFEST = ".skua-sync-manifest"
+
+_DIR_SYNC_SCRIPT = f"""set -eu
+in=/tmp/skua-sync-in
+mkdir -p "$in"
+tar -xzf - -C "$in"
+m=/workspace/{SYNC_MANIFEST}
+cur=none
+if [ -f "$m" ]; then cur=$(sha256sum "$m" | cut -d' ' -f1); fi
+if [ "$cur" != "$(cat "$in/base")" ]; then
+  if [ -f "$m" ]; then
+    echo "{STATUS_PREFIX}stale"
+    cat "$m"
+  else
+    echo "{STATUS_PREFIX}missing"
+  fi
+  exit 0
+fi
+owner=$(stat -c %u:%g /workspace)
+while IFS= read -r p; do
+  [ -n "$p" ] || continue
+  t="/workspace/$p"
+  if [ -L "$t" ] || [ ! -d "$t" ]; then rm -f "$t"; fi
+  d=$(dirname "$p")
+  while [ "$d" != "." ] && rmdir "/workspace/$d" 2>/dev/null; do d=$(dirname "$d"); done
+done < "$in/deleted"
+if [ -d "$in/files" ]; then
+  chown -R "$owner" "$in/files"
+  # A path that changed between file and directory would make cp fail.
+  (cd "$in/files" && find . -mindepth 1) | while IFS= read -r rel; do
+    src="$in/files/$rel"
+    t="/workspace/$rel"
+    if [ -d "$src" ] && [ ! -L "$src" ]; then
+      if [ -L "$t" ] || {{ [ -e "$t" ] && [ ! -d "$t" ]; }}; then rm -f "$t"; fi
+    elif [ -d "$t" ] && [ ! -L "$t" ]; then
+      rm -rf "$t"
+    fi
+  done
+  cp -a "$in/files/." /workspace/
+fi
+cp "$in/manifest" "$m.tmp"
+mv -f "$m.tmp" "$m"
+echo "{STATUS_PREFIX}synced"
+"""
+
+
+def _entry_digest(path: str, st) -> str:
+    """Digest of a file's content and mode (or a symlink's target)."""
+    h = hashlib.sha256()
+    if stat.S_ISLNK(st.st_mode):
+        h.update(b"link\0" + os.readlink(path).encode("utf-8", "surrogateescape"))
+    else:
+        h.update(b"%o\0" % stat.S_IMODE(st.st_mode))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def local_manifest(directory: Path, hash_cache: dict = None) -> dict:
+    """Return {relative path: digest} for regular files and symlinks.
+
+    hash_cache maps path -> [mtime_ns, size, mode, digest] and is updated in
+    place; files whose stat matches are not re-read.
+    """
+    directory = Path(directory)
+    cache = hash_cache if hash_cache is not None else {}
+    manifest = {}
+    seen = set()
+    for root, dirs, files in os.walk(directory):
+        rel_root = os.path.relpath(root, directory)
+        names = list(files)
+        # Symlinked directories are synced as links, not descended into.
+        for d in list(dirs):
+            if os.path.islink(os.path.join(root, d)):
+                dirs.remove(d)
+                names.append(d)
+        for fname in names:
+            rel = fname if rel_root == "." else f"{rel_root}/{fname}".replace(os.sep, "/")
+            if rel == SYNC_MANIFEST or "\n" in rel:
+                continue
+            path = os.path.join(root, fname)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            if not (stat.S_ISREG(st.st_mode) or stat.S_ISLNK(st.st_mode)):
+                continue
+            key = [st.st_mtime_ns, st.st_size, st.st_mode]
+            cached = cache.get(rel)
+            if cached is not None and cached[:3] == key:
+                digest = cached[3]
+            else:
+                try:
+                    digest = _entry_digest(path, st)
+                except OSError:
+                    continue
+                cache[rel] = key + [digest]
+            manifest[rel] = digest
+            seen.add(rel)
+    for rel in set(cache) - seen:
+        del cache[rel]
+    return manifest
+
+
+def manifest_text(manifest: dict) -> str:
+    return "".join(f"{digest} {rel}\n" for rel, digest in sorted(manifest.items()))
+
+
+def parse_manifest(text: str) -> dict:
+    manifest = {}
+    for line in text.splitlines():
+        digest, sep, rel = line.partition(" ")
+        if sep and rel:
+            manifest[rel] = digest
+    return manifest
+
+
+def _manifest_checksum(manifest) -> str:
+    if manifest is None:
+        return "none"
+    return hashlib.sha256(manifest_text(manifest).encode("utf-8")).hexdigest()
+
+
+def delta_payload(directory: Path, local: dict, remote) -> tuple:
+    """Return (tar.gz bytes, changed paths, deleted paths) to turn remote into local.
+
+    remote is the manifest believed to be in the volume (None = no manifest).
+    """
+    base = _manifest_checksum(remote)
+    remote = remote or {}
+    changed = sorted(rel for rel, digest in local.items() if remote.get(rel) != digest)
+    deleted = sorted(rel for rel in remote if rel not in local)
+
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz", compresslevel=6) as tar:
+        for rel in changed:
+            tar.add(os.path.join(directory, rel), arcname=f"files/{rel}", recursive=False)
+        for name, text in (
+            ("deleted", "".join(f"{rel}\n" for rel in deleted)),
+            ("manifest", manifest_text(local)),
+            ("base", base + "\n"),
+        ):
+            data = text.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue(), changed, deleted
+
+
+def sync_state_file(config_dir: Path, project_name: str) -> Path:
+    """Local record of the last pushed manifest and file digests for a project."""
+    return Path(config_dir) / "cache" / "dir-sync" / f"{project_name}.json"
+
+
+def _load_sync_state(state_file: Path) -> dict:
+    try:
+        state = json.loads(Path(state_file).read_text())
+    except (OSError, ValueError):
+        return {"remote": None, "hashes": {}}
+    if not isinstance(state, dict):
+        return {"remote": None, "hashes": {}}
+    state.setdefault("remote", None)
+    state.setdefault("hashes", {})
+    return state
+
+
+def _save_sync_state(state_file: Path, state: dict):
+    state_file = Path(state_file)
+    try:
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = state_file.with_name(f".{state_file.name}.{os.getpid()}")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, state_file)
+    except OSError:
+        pass
+
+
+def _push_delta(vol_name: str, payload: bytes) -> tuple:
+    """Run the helper container once.
+
+    Returns ("synced", None), ("stale", actual manifest) or ("missing", None).
+    """
+    cmd = [
+        "docker", "run", "--rm", "-i",
+        "-v", f"{vol_name}:/workspace",
+        "alpine", "sh", "-c", _DIR_SYNC_SCRIPT,
+    ]
+    result = subprocess.run(cmd, input=payload, capture_output=True)
+    stdout = result.stdout.decode("utf-8", errors="surrogateescape")
+    lines = stdout.splitlines()
+    status_idx = next((i for i, line in enumerate(lines) if line.startswith(STATUS_PREFIX)), None)
+    if result.returncode != 0 or status_idx is None:
+        detail = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(detail.splitlines()[-1] if detail else f"helper exited {result.returncode}")
+    status = lines[status_idx][len(STATUS_PREFIX):].strip()
+    if status == "stale":
+        return status, parse_manifest("\n".join(lines[status_idx + 1:]))
+    return status, None
+
+
+@traced()
+def sync_directory_into_volume(directory: Path, vol_name: str, state_file: Path,
+                               verify: bool = True) -> tuple:
+    """Push local changes in directory into vol_name.
+
+    With verify=False an unchanged tree is assumed to be in sync and no
+    container is started (used between watch polls). Returns (changed
+    paths, deleted paths). Raises RuntimeError when the helper fails.
+    """
+    state = _load_sync_state(state_file)
+    local = local_manifest(directory, state["hashes"])
+    remote = state["remote"]
+
+    if not verify and remote == local:
+        _save_sync_state(state_file, state)
+        return [], []
+
+    for _ in range(2):
+        payload, changed, deleted = delta_payload(directory, local, remote)
+        status, actual = _push_delta(vol_name, payload)
+        if status == "synced":
+            state["remote"] = local
+            _save_sync_state(state_file, state)
+            return changed, deleted
+        # The volume differs from what we last pushed (first sync, another
+        # machine, or a recreated volume): diff against what is there.
+        remote = actual
+    raise RuntimeError("remote manifest changed during sync")
+
+
+def watch_directory(directory: Path, vol_name: str, state_file: Path,
+                    interval: float = 1.0, on_sync=None, stop=None):
+    """Keep vol_name in sync with directory, polling every interval seconds.
+
+    Each poll is a stat walk (files are re-hashed only when their stat
+    changes) and starts no container when the tree is unchanged. Runs until
+    stop() returns True or KeyboardInterrupt.
+    """
+    verify = True
+    while stop is None or not stop():
+        changed, deleted = sync_directory_into_volume(directory, vol_name, state_file, verify=verify)
+        verify = False
+        if (changed or deleted) and on_sync is not None:
+            on_sync(changed, deleted)
+        time.sleep(interval)
@@ -0,0 +1,134 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Persistent multiplexed SSH connections to remote docker hosts.
+
+Every remote `ssh` invocation skua makes carries ControlMaster/ControlPersist
+options pointing at a per-host socket under ~/.config/skua/ssh/, so repeated
+calls to the same host share a single handshake. The `docker` CLI's own ssh
+transport (DOCKER_HOST=ssh://) is routed through the same masters with a small
+`ssh` shim placed first on PATH.
+
+Set SKUA_SSH_MUX=0 to disable multiplexing; SKUA_SSH_PERSIST overrides how long
+an idle master stays alive (ssh ControlPersist syntax, default 10m).
+"""
+
+import os
+import shlex
+import shutil
+import subprocess
+from pathlib import Path
+
+from skua.config.loader import CONFIG_DIR
+
+DEFAULT_PERSIST = "10m"
+# %C is ssh's hash of (local host, remote host, port, user): short, unique,
+# and identical for skua's own calls and the docker CLI's.
+CONTROL_NAME = "%C"
+
+
+def enabled() -> bool:
+    if os.name == "nt":
+        return False
+    return os.environ.get("SKUA_SSH_MUX", "").strip().lower() not in ("0", "false", "no", "off")
+
+
+def control_dir() -> Path:
+    return CONFIG_DIR / "ssh"
+
+
+def control_persist() -> str:
+    return os.environ.get("SKUA_SSH_PERSIST", "").strip() or DEFAULT_PERSIST
+
+
+def mux_options() -> list:
+    """Return ssh `-o` options that attach to (or start) the host's master."""
+    if not enabled():
+        return []
+    directory = control_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        directory.chmod(0o700)
+    except OSError:
+        return []
+    return [
+        "-o", "ControlMaster=auto",
+        "-o", f"ControlPath={directory / CONTROL_NAME}",
+        "-o", f"ControlPersist={control_persist()}",
+    ]
+
+
+def ssh_argv(host: str, *remote_args, batch: bool = False, tty: bool = False) -> list:
+    """Return an ssh argv for host that reuses the multiplexed master.
+
+    batch=True adds BatchMode/ConnectTimeout for non-interactive probes.
+    """
+    argv = ["ssh", *mux_options()]
+    if batch:
+        argv.extend(["-o", "BatchMode=yes", "-o", "ConnectTimeout=5"])
+    if tty:
+        argv.append("-tt")
+    argv.append(host)
+    argv.extend(str(a) for a in remote_args)
+    return argv
+
+
+def _control_command(host: str, command: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["ssh", "-o", f"ControlPath={control_dir() / CONTROL_NAME}", "-O", command, host],
+        capture_output=True,
+        text=True,
+        timeout=10,
+    )
+
+
+def master_status(host: str) -> str:
+    """Return "active", "inactive", or "unknown" for host's master connection."""
+    try:
+        result = _control_command(host, "check")
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return "unknown"
+    return "active" if result.returncode == 0 else "inactive"
+
+
+def close_master(host: str) -> bool:
+    """Ask host's master to exit. Returns True when a master was closed."""
+    try:
+        result = _control_command(host, "exit")
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def control_sockets() -> list:
+    """Return control socket paths currently present under the control dir."""
+    directory = control_dir()
+    if not directory.is_dir():
+        return []
+    return sorted(p for p in directory.iterdir() if p.is_socket())
+
+
+def install_ssh_shim() -> str:
+    """Put an `ssh` shim that adds mux options first on PATH.
+
+    Used for DOCKER_HOST=ssh:// so the docker CLI's own ssh calls share skua's
+    masters. Returns the shim directory, or "" when multiplexing is disabled
+    or no ssh client is available.
+    """
+    options = mux_options()
+    if not options:
+        return ""
+    shim_dir = control_dir() / "bin"
+    path_parts = [p for p in os.environ.get("PATH", "").split(os.pathsep) if p and p != str(shim_dir)]
+    real_ssh = shutil.which("ssh", path=os.pathsep.join(path_parts))
+    if not real_ssh:
+        return ""
+
+    shim_dir.mkdir(parents=True, exist_ok=True)
+    shim = shim_dir / "ssh"
+    quoted = " ".join(shlex.quote(o) for o in options)
+    shim.write_text(
+        "#!/bin/sh\n"
+        f"exec {shlex.quote(real_ssh)} {quoted} \"$@\"\n"
+    )
+    shim.chmod(0o700)
+    os.environ["PATH"] = os.pathsep.join([str(shim_dir), *path_parts])
+    return str(shim_dir)
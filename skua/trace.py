@@ -0,0 +1,173 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Span tracing written as Chrome trace-event JSON.
+
+Enabled with `skua --trace FILE ...` or SKUA_TRACE=FILE. Open the file in
+chrome://tracing or https://ui.perfetto.dev. Spans are "complete" (X) events
+per thread, so nesting follows from timing. While tracing is on, every
+subprocess started through `subprocess.Popen` (which `subprocess.run` uses)
+is recorded as a span carrying its argv, from spawn until it is waited for.
+When disabled, span()/traced() cost a single flag check.
+"""
+
+import atexit
+import functools
+import json
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_events = []
+_open = {}
+_path = ""
+_real_popen = subprocess.Popen
+
+
+def enabled() -> bool:
+    return bool(_path)
+
+
+def _now_us() -> float:
+    return time.perf_counter_ns() / 1000.0
+
+
+def _record(name: str, start_us: float, end_us: float, cat: str = "skua", args: dict = None):
+    event = {
+        "name": name,
+        "cat": cat,
+        "ph": "X",
+        "ts": start_us,
+        "dur": max(end_us - start_us, 0.0),
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+    }
+    if args:
+        event["args"] = args
+    with _lock:
+        _events.append(event)
+
+
+@contextmanager
+def span(name: str, **args):
+    """Record the enclosed block as a span named name."""
+    if not _path:
+        yield
+        return
+    start = _now_us()
+    key = object()
+    span_args = {k: str(v) for k, v in args.items()} or None
+    with _lock:
+        _open[key] = (name, start, threading.get_ident(), span_args)
+    try:
+        yield
+    finally:
+        with _lock:
+            _open.pop(key, None)
+        _record(name, start, _now_us(), args=span_args)
+
+
+def traced(name: str = ""):
+    """Decorator recording each call of the function as a span."""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*a, **kw):
+            if not _path:
+                return func(*a, **kw)
+            with span(label):
+                return func(*a, **kw)
+        return wrapper
+    return decorator
+
+
+class _TracedPopen(_real_popen):
+    """Popen that records a span from spawn until the process is reaped."""
+
+    def __init__(self, args, *a, **kw):
+        self._trace_start = _now_us()
+        self._trace_tid = threading.get_ident()
+        self._trace_done = False
+        self._trace_argv = [str(x) for x in args] if isinstance(args, (list, tuple)) else [str(args)]
+        super().__init__(args, *a, **kw)
+
+    def wait(self, timeout=None):
+        code = super().wait(timeout=timeout)
+        self._trace_finish()
+        return code
+
+    def poll(self):
+        code = super().poll()
+        if code is not None:
+            self._trace_finish()
+        return code
+
+    def _trace_finish(self):
+        if self._trace_done:
+            return
+        self._trace_done = True
+        argv = self._trace_argv
+        event = {
+            "name": " ".join(argv[:2]) or "subprocess",
+            "cat": "subprocess",
+            "ph": "X",
+            "ts": self._trace_start,
+            "dur": max(_now_us() - self._trace_start, 0.0),
+            "pid": os.getpid(),
+            "tid": self._trace_tid,
+            "args": {"argv": argv, "returncode": self.returncode},
+        }
+        with _lock:
+            _events.append(event)
+
+
+def enable(path: str):
+    """Start recording spans; they are written to path at exit (or flush())."""
+    global _path
+    if not path or _path:
+        return
+    _path = str(path)
+    subprocess.Popen = _TracedPopen
+    atexit.register(flush)
+
+
+def enable_from_env():
+    enable(os.environ.get("SKUA_TRACE", "").strip())
+
+
+def flush():
+    """Write all spans recorded so far. Called at exit and before exec.
+
+    Spans still open (e.g. cmd_run when skua execs into the container) are
+    written as ending now.
+    """
+    if not _path:
+        return
+    now = _now_us()
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        for name, start, tid, args in _open.values():
+            event = {"name": name, "cat": "skua", "ph": "X", "ts": start,
+                     "dur": max(now - start, 0.0), "pid": pid, "tid": tid}
+            if args:
+                event["args"] = args
+            events.append(event)
+    payload = {"traceEvents": events, "displayTimeUnit": "ms"}
+    try:
+        with open(_path, "w") as f:
+            json.dump(payload, f)
+    except OSError as exc:
+        print(f"Warning: could not write trace file {_path}: {exc}")
+
+
+def disable():
+    """Stop tracing and drop recorded spans (used by tests)."""
+    global _path
+    _path = ""
+    subprocess.Popen = _real_popen
+    with _lock:
+        _events.clear()
+        _open.clear()
@@ -1,10 +1,12 @@
 # SPDX-License-Identifier: BUSL-1.1
 """Shared utilities for skua."""
 
+import hashlib
 import subprocess
 import sys
 import shutil
 from pathlib import Path
+from urllib.parse import urlsplit
 
 
 def detect_git_identity() -> tuple:
@@ -37,6 +39,39 @@ def die(msg: str, code: int = 1):
     sys.exit(code)
 
 
+def normalize_repo_url(url: str) -> str:
+    """Reduce a git URL to "host/path" so equivalent URLs compare equal.
+
+    git@github.com:Org/Repo.git, ssh://git@github.com/Org/Repo and
+    https://github.com/Org/Repo/ all normalize to "github.com/Org/Repo".
+    """
+    url = (url or "").strip()
+    if "://" in url:
+        parsed = urlsplit(url)
+        host = (parsed.hostname or "").lower()
+        if parsed.port:
+            host = f"{host}:{parsed.port}"
+        path = parsed.path
+    elif ":" in url and "/" not in url.split(":", 1)[0]:
+        # SCP-like syntax: [user@]host:path
+        host, path = url.split(":", 1)
+        host = host.rsplit("@", 1)[-1].lower()
+    else:
+        host, path = "", url
+    path = path.rstrip("/")
+    if path.endswith(".git"):
+        path = path[:-4]
+    return f"{host}/{path.lstrip('/')}" if host else path
+
+
+def repo_cache_key(url: str) -> str:
+    """Return a filesystem-safe, stable key for a repo URL (e.g. "repo-1a2b3c4d5e6f")."""
+    normalized = normalize_repo_url(url)
+    name = "".join(c if c.isalnum() or c in "._-" else "-" for c in normalized.rsplit("/", 1)[-1])
+    digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:12]
+    return f"{name.strip('.-') or 'repo'}-{digest}"
+
+
 def confirm(prompt: str, default: bool = False) -> bool:
     """Ask a yes/no question. Returns True for yes."""
     suffix = "[Y/n]" if default else "[y/N]"
@@ -439,6 +439,141 @@ class TestAdaptCommand(unittest.TestCase):
             mock_session.assert_called_once()
             mock_build.assert_called_once()
 
+    def test_cmd_adapt_discover_reuses_cached_wishlist_until_manifests_change(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_dir = Path(tmpdir) / "repo"
+            project_dir.mkdir()
+            (project_dir / "requirements.txt").write_text("psycopg2\n")
+            store = self._new_store(Path(tmpdir) / "cfg")
+            store.save_resource(Project(name="proj", directory=str(project_dir), agent="codex"))
+            _, request_path = ensure_adapt_workspace(project_dir, "proj", "codex")
+
+            def fake_session(store, project, env, sec, agent, build_error=""):
+                with open(request_path, "w") as f:
+                    yaml.dump({"schemaVersion": 1, "status": "ready", "packages": ["libpq-dev"]}, f)
+
+            def discover(**kwargs):
+                args = self._adapt_args("proj", discover=True)
+                args.no_cache = kwargs.get("no_cache", False)
+                with (
+                    mock.patch("skua.commands.adapt.ConfigStore", return_value=store),
+                    mock.patch("skua.commands.adapt._run_agent_adapt_session", side_effect=fake_session) as session,
+                    mock.patch("skua.commands.adapt._build_project_image", return_value=""),
+                    mock.patch("skua.commands.run.precreate_containers"),
+                    mock.patch("builtins.print"),
+                ):
+                    cmd_adapt(args)
+                return session.call_count
+
+            self.assertEqual(1, discover())
+            request_path.write_text("")
+            # Unrelated edits keep the cache; the wishlist file is restored from it.
+            (project_dir / "main.py").write_text("print('hi')\n")
+            self.assertEqual(0, discover())
+            self.assertEqual(["libpq-dev"], load_image_request(request_path)["packages"])
+            self.assertEqual(1, discover(no_cache=True))
+            (project_dir / "requirements.txt").write_text("psycopg2\nlxml\n")
+            self.assertEqual(1, discover())
+            self.assertEqual(0, discover())
+
+    def test_cmd_adapt_static_discovery_asks_agent_only_when_unresolved(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_dir = Path(tmpdir) / "repo"
+            project_dir.mkdir()
+            (project_dir / "requirements.txt").write_text("psycopg2\n")
+            store = self._new_store(Path(tmpdir) / "cfg")
+            store.save_resource(Project(name="proj", directory=str(project_dir), agent="codex"))
+
+            request_path = project_dir / ".skua" / "image-request.yaml"
+
+            def fake_session(store, project, env, sec, agent, build_error="", unresolved=None):
+                # The agent rewrites the file with only what it added.
+                with open(request_path, "w") as f:
+                    yaml.dump({"schemaVersion": 1, "status": "ready", "commands": ["install-go 1.22"]}, f)
+
+            def discover():
+                with (
+                    mock.patch("skua.commands.adapt.ConfigStore", return_value=store),
+                    mock.patch("skua.commands.adapt._run_agent_adapt_session", side_effect=fake_session) as session,
+                    mock.patch("skua.commands.adapt._build_project_image", return_value="") as build,
+                    mock.patch("skua.commands.run.precreate_containers"),
+                    mock.patch("builtins.print"),
+                ):
+                    cmd_adapt(self._adapt_args("proj", discover="static"))
+                build.assert_called_once()
+                return session
+
+            self.assertEqual(0, discover().call_count)
+            self.assertIn("libpq-dev", store.load_project("proj").image.extra_packages)
+
+            (project_dir / "go.mod").write_text("module x\n\ngo 1.22\n")
+            session = discover()
+            self.assertEqual(1, session.call_count)
+            self.assertEqual(["Go 1.22 (go.mod)"], session.call_args.kwargs["unresolved"])
+            image = store.load_project("proj").image
+            self.assertIn("libpq-dev", image.extra_packages)
+            self.assertIn("golang-go", image.extra_packages)
+            self.assertEqual(["install-go 1.22"], image.extra_commands)
+
+    def test_agent_prompt_lists_what_static_scan_left_unresolved(self):
+        from skua.commands.adapt import _agent_prompt
+
+        prompt = _agent_prompt("proj", "codex", unresolved=["Go 1.22 (go.mod)"])
+        self.assertIn("Keep its packages and commands", prompt)
+        self.assertIn("- Go 1.22 (go.mod)", prompt)
+        self.assertNotIn("static scan", _agent_prompt("proj", "codex"))
+
+    def test_discover_flag_accepts_project_name_in_either_position(self):
+        from skua.cli import _add_adapt_args
+
+        parser = argparse.ArgumentParser()
+        _add_adapt_args(parser)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_dir = Path(tmpdir) / "repo"
+            project_dir.mkdir()
+            store = self._new_store(Path(tmpdir) / "cfg")
+            store.save_resource(Project(name="proj", directory=str(project_dir), agent="codex"))
+
+            for argv in (["--discover", "proj"], ["proj", "--discover"], ["--discover=agent", "proj"]):
+                args = parser.parse_args([*argv, "--no-cache"])
+                with (
+                    mock.patch("skua.commands.adapt.ConfigStore", return_value=store),
+                    mock.patch("skua.commands.adapt._run_agent_adapt_session") as session,
+                    mock.patch("skua.commands.adapt._build_project_image", return_value=""),
+                    mock.patch("skua.commands.run.precreate_containers"),
+                    mock.patch("builtins.print"),
+                ):
+                    cmd_adapt(args)
+                self.assertEqual("proj", session.call_args.args[1].name, argv)
+
+            args = parser.parse_args(["--discover=bogus", "proj"])
+            with (
+                mock.patch("skua.commands.adapt.ConfigStore", return_value=store),
+                mock.patch("builtins.print") as mock_print,
+                self.assertRaises(SystemExit),
+            ):
+                cmd_adapt(args)
+            self.assertIn("Unknown --discover mode 'bogus'", mock_print.call_args_list[0].args[0])
+
+    def test_discovery_key_covers_manifests_only(self):
+        from skua.project_adapt import discovery_cache_key
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "package.json").write_text("{}")
+            (root / "web").mkdir()
+            (root / "web" / "Cargo.toml").write_text("[package]")
+            (root / "node_modules").mkdir()
+            (root / "node_modules" / "package.json").write_text("{}")
+            key = discovery_cache_key(root, "codex", "debian:bookworm-slim")
+
+            (root / "README.md").write_text("docs")
+            (root / "node_modules" / "package.json").write_text('{"v": 2}')
+            self.assertEqual(key, discovery_cache_key(root, "codex", "debian:bookworm-slim"))
+            self.assertNotEqual(key, discovery_cache_key(root, "claude", "debian:bookworm-slim"))
+            (root / "web" / "Cargo.toml").write_text("[package]\nname = 'web'")
+            self.assertNotEqual(key, discovery_cache_key(root, "codex", "debian:bookworm-slim"))
+
     def test_cmd_adapt_discover_retries_build_after_agent_revises_request(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             project_dir = Path(tmpdir) / "repo"
@@ -583,53 +718,123 @@ class TestAdaptCommand(unittest.TestCase):
                 cmd_adapt(self._adapt_args("proj", apply_only=True, discover=True))
             self.assertEqual(1, ctx.exception.code)
 
-    def test_cmd_adapt_all_dispatches_pending_projects(self):
+    def _add_pending_project(self, store: ConfigStore, tmp: Path, name: str, packages: list, **kwargs):
+        project_dir = tmp / name
+        project_dir.mkdir()
+        store.save_resource(Project(name=name, directory=str(project_dir), agent="codex", **kwargs))
+        ensure_adapt_workspace(project_dir, name, "codex")
+        if packages:
+            (project_dir / ".skua" / "image-request.yaml").write_text(
+                yaml.dump(
+                    {"schemaVersion": 1, "status": "ready", "packages": packages},
+                    default_flow_style=False,
+                    sort_keys=False,
+                )
+            )
+
+    def _adapt_all_args(self, build: bool = False, jobs: int = 1):
+        args = self._adapt_args("", build=build, force=True)
+        args.all = True
+        args.jobs = jobs
+        return args
+
+    def _run_adapt_all(self, store: ConfigStore, args, build_results=None):
+        """Run _cmd_adapt_all with docker faked; returns (build_image mock, tag_image mock, output)."""
         from skua.commands.adapt import _cmd_adapt_all
 
+        build_results = build_results or {}
+
+        def fake_build(**kwargs):
+            return build_results.get(kwargs["image_name"], (True, ""))
+
+        out = io.StringIO()
+        with (
+            mock.patch.object(store, "get_container_dir", return_value=Path("/container")),
+            mock.patch("skua.commands.adapt.compute_build_context_hash",
+                       side_effect=lambda **kw: ",".join(kw["extra_packages"])),
+            mock.patch("skua.commands.adapt.image_exists", return_value=False),
+            mock.patch("skua.commands.adapt.build_image", side_effect=fake_build) as build,
+            mock.patch("skua.commands.adapt.tag_image", return_value=True) as tag,
+            mock.patch("skua.commands.run.precreate_containers"),
+            mock.patch("sys.stdout", out),
+        ):
+            try:
+                _cmd_adapt_all(store, args)
+            finally:
+                self.output = out.getvalue()
+        return build, tag, self.output
+
+    def test_cmd_adapt_all_applies_only_pending_projects(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             tmp = Path(tmpdir)
             store = self._new_store(tmp / "cfg")
+            self._add_pending_project(store, tmp, "proj-a", ["git"])
+            self._add_pending_project(store, tmp, "proj-b", [])
 
-            p1_dir = tmp / "proj-a"
-            p1_dir.mkdir()
-            p2_dir = tmp / "proj-b"
-            p2_dir.mkdir()
+            build, _, output = self._run_adapt_all(store, self._adapt_all_args())
 
-            store.save_resource(Project(name="proj-a", directory=str(p1_dir), agent="codex"))
-            store.save_resource(Project(name="proj-b", directory=str(p2_dir), agent="codex"))
+            build.assert_not_called()
+            self.assertEqual(["git"], store.load_project("proj-a").image.extra_packages)
+            self.assertEqual(0, store.load_project("proj-b").image.version)
+            self.assertIn("Adapted 1/1 pending project(s).", output)
 
-            ensure_adapt_workspace(p1_dir, "proj-a", "codex")
-            ensure_adapt_workspace(p2_dir, "proj-b", "codex")
-            (p1_dir / ".skua" / "image-request.yaml").write_text(
-                yaml.dump(
-                    {"schemaVersion": 1, "status": "ready", "packages": ["git"]},
-                    default_flow_style=False,
-                    sort_keys=False,
+    def test_cmd_adapt_all_builds_identical_images_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            store = self._new_store(tmp / "cfg")
+            self._add_pending_project(store, tmp, "proj-a", ["git"])
+            self._add_pending_project(store, tmp, "proj-b", ["git"])
+            self._add_pending_project(store, tmp, "proj-c", ["make"])
+
+            build, tag, output = self._run_adapt_all(store, self._adapt_all_args(build=True, jobs=3))
+
+            built = sorted(c.kwargs["image_name"] for c in build.call_args_list)
+            self.assertEqual(2, len(built))
+            self.assertTrue(any("proj-c" in image for image in built))
+            tag.assert_called_once()
+            self.assertNotEqual(tag.call_args.args[0], tag.call_args.args[1])
+            self.assertIn("Adapted 3/3 pending project(s).", output)
+
+    def test_cmd_adapt_all_reports_failures_per_project(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            store = self._new_store(tmp / "cfg")
+            self._add_pending_project(store, tmp, "proj-a", ["git"])
+            self._add_pending_project(store, tmp, "proj-b", ["broken"])
+            self._add_pending_project(store, tmp, "proj-c", ["make"], security="missing")
+            with self.assertRaises(SystemExit) as ctx:
+                self._run_adapt_all(
+                    store,
+                    self._adapt_all_args(build=True, jobs=2),
+                    build_results={"skua-base-codex-proj-b-v1": (False, "E: Unable to locate package broken")},
                 )
-            )
 
-            args = argparse.Namespace(
-                all=True,
-                show_prompt=False,
-                discover=False,
-                clear=False,
-                write_only=False,
-                base_image="",
-                from_image="",
-                package=[],
-                extra_command=[],
-                build=False,
-                apply_only=False,
-                force=False,
-            )
+            self.assertEqual(1, ctx.exception.code)
+            self.assertIn("Adapted 1/3 pending project(s).", self.output)
+            failed = self.output.split("Failed:")[1]
+            self.assertIn("- proj-b", failed)
+            self.assertIn("Unable to locate package broken", failed)
+            self.assertIn("- proj-c", failed)
+            self.assertNotIn("proj-a", failed)
+            self.assertIn("[proj-a] Image ready:", self.output)
 
-            with mock.patch("skua.commands.adapt.cmd_adapt") as mock_cmd:
-                _cmd_adapt_all(store, args)
+    def test_build_project_image_returns_error_without_build_assets(self):
+        from skua.commands.adapt import _build_project_image
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            store = self._new_store(tmp / "cfg")
+            self._add_pending_project(store, tmp, "proj-a", ["git"])
+            project = store.load_project("proj-a")
+            with (
+                mock.patch.object(store, "get_container_dir", return_value=None),
+                mock.patch("skua.commands.adapt.image_exists", return_value=False),
+                mock.patch("skua.commands.adapt.build_image") as build,
+            ):
+                error = _build_project_image(store, project, store.load_agent("codex"), log=lambda _: None)
 
-            self.assertEqual(1, mock_cmd.call_count)
-            called_args = mock_cmd.call_args.args[0]
-            self.assertEqual("proj-a", called_args.name)
-            self.assertFalse(called_args.all)
+        self.assertIn("Cannot find container build assets", error)
+        build.assert_not_called()
 
     def test_agent_adapt_command_simple_template_avoids_shell(self):
         from skua.commands.adapt import _agent_adapt_command
@@ -15,6 +15,7 @@ from unittest import mock
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from skua.config.resources import AgentAuthSpec, AgentConfig, Credential, Project
+from skua.docker import DockerState
 
 
 class TestAddCredentialSelection(unittest.TestCase):
@@ -241,10 +242,17 @@ class TestAddCredentialSelection(unittest.TestCase):
 
 
 class TestListColumns(unittest.TestCase):
-    @mock.patch("skua.commands.list_cmd.get_running_skua_containers")
+    @staticmethod
+    def _state(running=(), images=()):
+        return DockerState(
+            containers=[{"name": name, "running": True} for name in running],
+            images=[{"id": f"sha256:{i:064x}", "refs": [ref]} for i, ref in enumerate(images, start=1)],
+        )
+
+    @mock.patch("skua.commands.list_cmd.load_docker_state")
     @mock.patch("skua.commands.list_cmd._has_pending_adapt_request", return_value=True)
     @mock.patch("skua.commands.list_cmd.ConfigStore")
-    def test_list_default_shows_minimal_columns(self, MockStore, _mock_pending, mock_running):
+    def test_list_default_shows_minimal_columns(self, MockStore, _mock_pending, mock_state):
         from skua.commands.list_cmd import cmd_list
 
         store = MockStore.return_value
@@ -261,7 +269,7 @@ class TestListColumns(unittest.TestCase):
         store.load_environment.return_value = SimpleNamespace(
             network=SimpleNamespace(mode="bridge")
         )
-        mock_running.return_value = {"skua-demo"}
+        mock_state.return_value = self._state(running=["skua-demo"])
 
         buf = io.StringIO()
         with redirect_stdout(buf):
@@ -279,9 +287,9 @@ class TestListColumns(unittest.TestCase):
         self.assertIn("1 pending adapt", out)
         self.assertIn("* pending image-request changes", out)
 
-    @mock.patch("skua.commands.list_cmd.get_running_skua_containers")
+    @mock.patch("skua.commands.list_cmd.load_docker_state")
     @mock.patch("skua.commands.list_cmd.ConfigStore")
-    def test_list_with_agent_and_security_flags_shows_extra_columns(self, MockStore, mock_running):
+    def test_list_with_agent_and_security_flags_shows_extra_columns(self, MockStore, mock_state):
         from skua.commands.list_cmd import cmd_list
 
         store = MockStore.return_value
@@ -298,7 +306,7 @@ class TestListColumns(unittest.TestCase):
         store.load_environment.return_value = SimpleNamespace(
             network=SimpleNamespace(mode="bridge")
         )
-        mock_running.return_value = {"skua-demo"}
+        mock_state.return_value = self._state(running=["skua-demo"])
 
         buf = io.StringIO()
         with redirect_stdout(buf):
@@ -314,10 +322,9 @@ class TestListColumns(unittest.TestCase):
         self.assertIn("open", out)
         self.assertIn("bridge", out)
 
-    @mock.patch("skua.commands.list_cmd.image_exists", return_value=False)
-    @mock.patch("skua.commands.list_cmd.get_running_skua_containers")
+    @mock.patch("skua.commands.list_cmd.load_docker_state")
     @mock.patch("skua.commands.list_cmd.ConfigStore")
-    def test_list_checks_remote_host_status(self, MockStore, mock_running, _mock_image_exists):
+    def test_list_checks_remote_host_status(self, MockStore, mock_state):
         from skua.commands.list_cmd import cmd_list
 
         store = MockStore.return_value
@@ -346,10 +353,8 @@ class TestListColumns(unittest.TestCase):
             network=SimpleNamespace(mode="bridge")
         )
 
-        mock_running.side_effect = [
-            [],
-            ["skua-qar"],
-        ]
+        states = {"": self._state(), "qar": self._state(running=["skua-qar"])}
+        mock_state.side_effect = lambda host="", timeout=None: states[host]
 
         buf = io.StringIO()
         with redirect_stdout(buf):
@@ -359,14 +364,12 @@ class TestListColumns(unittest.TestCase):
         self.assertIn("SSH:qar", out)
         self.assertIn("running", out)
         self.assertIn("2 project(s), 1 running", out)
-        self.assertEqual(2, mock_running.call_count)
-        mock_running.assert_any_call()
-        mock_running.assert_any_call(host="qar")
+        self.assertEqual(2, mock_state.call_count)
+        self.assertEqual({"", "qar"}, {c.kwargs["host"] for c in mock_state.call_args_list})
 
-    @mock.patch("skua.commands.list_cmd.image_exists")
-    @mock.patch("skua.commands.list_cmd.get_running_skua_containers", return_value=[])
+    @mock.patch("skua.commands.list_cmd.load_docker_state")
     @mock.patch("skua.commands.list_cmd.ConfigStore")
-    def test_list_status_reflects_image_existence(self, MockStore, _mock_running, mock_image_exists):
+    def test_list_status_reflects_image_existence(self, MockStore, mock_state):
         from skua.commands.list_cmd import cmd_list
 
         store = MockStore.return_value
@@ -377,24 +380,26 @@ class TestListColumns(unittest.TestCase):
             "built-proj": Project(name="built-proj", directory="/tmp/bp", agent="claude"),
             "missing-proj": Project(name="missing-proj", directory="/tmp/mp", agent="claude"),
         }
+        projects["built-proj"].image.extra_packages = ["jq"]
+        projects["missing-proj"].image.extra_packages = ["jq"]
         store.resolve_project.side_effect = lambda name: projects[name]
         store.load_environment.return_value = SimpleNamespace(network=SimpleNamespace(mode="bridge"))
 
         # built-proj has image, missing-proj does not
-        mock_image_exists.side_effect = lambda name: "built-proj" in str(name)
+        mock_state.return_value = self._state(images=["skua-base-claude-built-proj-v1"])
 
         buf = io.StringIO()
         with redirect_stdout(buf):
             cmd_list(argparse.Namespace())
-        out = buf.getvalue()
+        lines = {line.split()[0]: line for line in buf.getvalue().splitlines() if line.strip()}
 
-        self.assertIn("built", out)
-        self.assertIn("missing", out)
-        self.assertNotIn("stopped", out)
+        self.assertTrue(lines["built-proj"].rstrip().endswith("built"))
+        self.assertTrue(lines["missing-proj"].rstrip().endswith("missing"))
+        self.assertEqual(1, mock_state.call_count)
 
-    @mock.patch("skua.commands.list_cmd.get_running_skua_containers")
+    @mock.patch("skua.commands.list_cmd.load_docker_state")
     @mock.patch("skua.commands.list_cmd.ConfigStore")
-    def test_list_caches_remote_host_status_per_host(self, MockStore, mock_running):
+    def test_list_caches_remote_host_status_per_host(self, MockStore, mock_state):
         from skua.commands.list_cmd import cmd_list
 
         store = MockStore.return_value
@@ -416,10 +421,8 @@ class TestListColumns(unittest.TestCase):
             network=SimpleNamespace(mode="bridge")
         )
 
-        mock_running.side_effect = [
-            [],
-            ["skua-qar-a", "skua-qar-b"],
-        ]
+        states = {"": self._state(), "qar": self._state(running=["skua-qar-a", "skua-qar-b"])}
+        mock_state.side_effect = lambda host="", timeout=None: states[host]
 
         buf = io.StringIO()
         with redirect_stdout(buf):
@@ -427,6 +430,206 @@ class TestListColumns(unittest.TestCase):
         out = buf.getvalue()
 
         self.assertIn("2 project(s), 2 running", out)
-        self.assertEqual(2, mock_running.call_count)
-        mock_running.assert_any_call()
-        mock_running.assert_any_call(host="qar")
+        self.assertEqual(2, mock_state.call_count)
+        self.assertEqual({"", "qar"}, {c.kwargs["host"] for c in mock_state.call_args_list})
+
+    @mock.patch("skua.commands.list_cmd.load_docker_state")
+    @mock.patch("skua.commands.list_cmd.ConfigStore")
+    def test_list_marks_slow_host_unreachable_at_deadline(self, MockStore, mock_state):
+        import threading
+        import time
+        from skua.commands.list_cmd import cmd_list
+
+        store = MockStore.return_value
+        store.load_global.return_value = {}
+        store.list_resources.return_value = ["fast", "slow"]
+        projects = {
+            "fast": Project(name="fast", repo="git@github.com:o/r.git", host="fast-host"),
+            "slow": Project(name="slow", repo="git@github.com:o/r.git", host="slow-host"),
+        }
+        store.resolve_project.side_effect = lambda name: projects[name]
+
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def _load(host="", timeout=None):
+            if host == "slow-host":
+                release.wait(5)
+            return self._state(running=["skua-fast"] if host == "fast-host" else [])
+
+        mock_state.side_effect = _load
+
+        buf = io.StringIO()
+        started = time.monotonic()
+        with redirect_stdout(buf):
+            cmd_list(argparse.Namespace(timeout=0.3))
+        elapsed = time.monotonic() - started
+        lines = {line.split()[0]: line for line in buf.getvalue().splitlines() if line.strip()}
+
+        self.assertLess(elapsed, 2)
+        self.assertTrue(lines["fast"].rstrip().endswith("running"))
+        self.assertTrue(lines["slow"].rstrip().endswith("unreachable"))
+        self.assertIn("unreachable: no Docker response within 0.3s from slow-host", buf.getvalue())
+
+
+class TestListGitStatus(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.store = mock.Mock()
+        self.store.config_dir = self.root / "config"
+        self.store.load_global.return_value = {"git": {"fetchTtl": 300}}
+        self.projects = []
+        for name in ("alpha", "beta"):
+            repo = self.root / name
+            (repo / ".git").mkdir(parents=True)
+            self.projects.append((name, Project(name=name, directory=str(repo), repo="git@github.com:o/r.git")))
+
+    def test_git_probes_run_concurrently(self):
+        import threading
+        from skua.commands.list_cmd import _git_statuses
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def _probe(repo_dir, fetch=True):
+            barrier.wait()
+            return "BEHIND" if repo_dir.name == "alpha" else "CURRENT", fetch
+
+        with mock.patch("skua.commands.list_cmd._git_status", side_effect=_probe):
+            statuses = _git_statuses(self.projects, self.store)
+
+        self.assertEqual({"alpha": "BEHIND", "beta": "CURRENT"}, statuses)
+
+    def test_recent_fetch_is_reused_until_refresh(self):
+        from skua.commands.list_cmd import _git_fetch_cache_path, _git_statuses
+
+        with mock.patch("skua.commands.list_cmd._git_status", return_value=("CURRENT", True)) as probe:
+            _git_statuses(self.projects, self.store)
+            self.assertEqual([True, True], [c.kwargs["fetch"] for c in probe.call_args_list])
+            self.assertTrue(_git_fetch_cache_path(self.store).is_file())
+
+            probe.reset_mock()
+            _git_statuses(self.projects, self.store)
+            self.assertEqual([False, False], [c.kwargs["fetch"] for c in probe.call_args_list])
+
+            probe.reset_mock()
+            _git_statuses(self.projects, self.store, refresh=True)
+            self.assertEqual([True, True], [c.kwargs["fetch"] for c in probe.call_args_list])
+
+    def test_zero_ttl_always_fetches(self):
+        from skua.commands.list_cmd import _git_statuses
+
+        self.store.load_global.return_value = {"git": {"fetchTtl": 0}}
+        with mock.patch("skua.commands.list_cmd._git_status", return_value=("CURRENT", True)) as probe:
+            _git_statuses(self.projects, self.store)
+            _git_statuses(self.projects, self.store)
+
+        self.assertTrue(all(c.kwargs["fetch"] for c in probe.call_args_list))
+
+
+class TestDockerStateSnapshot(unittest.TestCase):
+    def setUp(self):
+        # Exercise the CLI path even on hosts with a reachable docker socket.
+        patcher = mock.patch("skua.docker._engine_client", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        env = mock.patch.dict("os.environ", {"SKUA_SSH_MUX": "0"})
+        env.start()
+        self.addCleanup(env.stop)
+
+    @staticmethod
+    def _completed(stdout):
+        return mock.Mock(returncode=0, stdout=stdout, stderr="")
+
+    @mock.patch("skua.docker.subprocess.run")
+    def test_load_docker_state_uses_constant_docker_calls(self, mock_run):
+        import json
+        from skua.docker import BUILD_CONTEXT_HASH_LABEL, load_docker_state
+
+        image_a = "sha256:" + "a" * 64
+        image_b = "sha256:" + "b" * 64
+        ps_rows = [
+            {"Names": f"skua-p{i}", "ID": f"c{i}", "State": "running" if i % 2 else "exited",
+             "Image": "skua-base-claude", "Labels": ""}
+            for i in range(20)
+        ]
+        container_rows = [
+            {"Name": f"/skua-p{i}", "Image": image_a, "State": {"Running": bool(i % 2)},
+             "Config": {"Image": "skua-base-claude", "Labels": {}}}
+            for i in range(20)
+        ]
+        ls_rows = [
+            {"ID": image_a, "Repository": "skua-base-claude", "Tag": "latest"},
+            {"ID": image_b, "Repository": "skua-base-codex", "Tag": "latest"},
+        ]
+        image_rows = [
+            {"Id": image_a, "RepoTags": ["skua-base-claude:latest"],
+             "Config": {"Labels": {BUILD_CONTEXT_HASH_LABEL: "abc"}}},
+            {"Id": image_b, "RepoTags": ["skua-base-codex:latest"], "Config": {"Labels": None}},
+        ]
+        mock_run.side_effect = [
+            self._completed("\n".join(json.dumps(r) for r in ps_rows)),
+            self._completed(json.dumps(container_rows)),
+            self._completed("\n".join(json.dumps(r) for r in ls_rows)),
+            self._completed(json.dumps(image_rows)),
+        ]
+
+        state = load_docker_state()
+
+        self.assertEqual(4, mock_run.call_count)
+        self.assertTrue(state.reachable)
+        self.assertEqual(10, len(state.running_skua_containers()))
+        self.assertTrue(state.is_running("skua-p1"))
+        self.assertFalse(state.is_running("skua-p2"))
+        self.assertEqual(image_a, state.container_image_id("skua-p3"))
+        self.assertTrue(state.image_exists("skua-base-claude"))
+        self.assertTrue(state.image_exists("skua-base-codex:latest"))
+        self.assertFalse(state.image_exists("skua-base-other"))
+        self.assertEqual(image_a, state.image_id("skua-base-claude:latest"))
+        self.assertEqual("abc", state.image_label("skua-base-claude", BUILD_CONTEXT_HASH_LABEL))
+        self.assertEqual(image_a, state.image("a" * 12)["id"])
+
+    @mock.patch("skua.docker.subprocess.run")
+    def test_load_docker_state_calls_share_one_timeout(self, mock_run):
+        import json
+        from skua.docker import load_docker_state
+
+        now = [0.0]
+
+        def _run(argv, **kwargs):
+            now[0] += 3
+            cmd = " ".join(argv)
+            if "docker ps" in cmd:
+                return self._completed(json.dumps({"Names": "skua-p", "ID": "c1", "State": "running"}))
+            if "docker image ls" in cmd:
+                return self._completed(json.dumps({"ID": "sha256:" + "a" * 64, "Repository": "r"}))
+            return self._completed("[]")
+
+        mock_run.side_effect = _run
+        with mock.patch("skua.docker.time.monotonic", side_effect=lambda: now[0]):
+            load_docker_state(host="qar", timeout=8)
+
+        # ps, container inspect and image ls get what is left; image inspect
+        # would start after the deadline and is skipped.
+        self.assertEqual([8, 5, 2], [c.kwargs["timeout"] for c in mock_run.call_args_list])
+
+    @mock.patch("skua.docker.subprocess.run")
+    def test_load_docker_state_quotes_remote_format_argument(self, mock_run):
+        from skua.docker import load_docker_state
+
+        mock_run.return_value = self._completed("")
+        load_docker_state(host="qar")
+
+        argv = mock_run.call_args_list[0].args[0]
+        self.assertEqual("ssh", argv[0])
+        self.assertIn("qar", argv)
+        self.assertIn("'{{json .}}'", argv[-1])
+
+    @mock.patch("skua.docker.subprocess.run", side_effect=FileNotFoundError)
+    def test_load_docker_state_marks_unreachable_on_failure(self, _mock_run):
+        from skua.docker import load_docker_state
+
+        state = load_docker_state()
+        self.assertFalse(state.reachable)
+        self.assertFalse(state.image_exists("skua-base-claude"))
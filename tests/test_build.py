@@ -0,0 +1,130 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for the skua build scheduler."""
+
+import io
+import sys
+import threading
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skua.commands.build import _plan_build_order, _run_build_jobs
+from skua.config.resources import AgentConfig, Project
+
+
+def _job(image, base="debian:bookworm-slim", agent="claude"):
+    return {
+        "image": image,
+        "project": Project(name=image),
+        "agent": AgentConfig(name=agent),
+        "base_image": base,
+        "extra_packages": [],
+        "extra_commands": [],
+        "rebuild": False,
+    }
+
+
+class TestBuildPlan(unittest.TestCase):
+    def test_groups_share_a_leader_and_from_image_is_a_hard_dependency(self):
+        jobs = [
+            _job("a"),
+            _job("b"),
+            _job("c", agent="codex"),
+            _job("d", base="a"),
+        ]
+        plan = _plan_build_order(jobs)
+
+        self.assertEqual((set(), set()), plan["a"])
+        self.assertEqual((set(), {"a"}), plan["b"])
+        self.assertEqual((set(), set()), plan["c"])
+        self.assertEqual(({"a"}, set()), plan["d"])
+
+
+class TestBuildScheduler(unittest.TestCase):
+    def _run(self, jobs, build_one, max_jobs):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            results = _run_build_jobs(jobs, build_one, max_jobs=max_jobs)
+        return results, out.getvalue()
+
+    def test_leader_builds_first_then_group_runs_concurrently(self):
+        jobs = [_job("lead"), _job("x"), _job("y")]
+        order = []
+        barrier = threading.Barrier(2, timeout=5)
+
+        def build_one(job):
+            order.append(job["image"])
+            if job["image"] != "lead":
+                barrier.wait()
+            return True, ""
+
+        results, out = self._run(jobs, build_one, max_jobs=3)
+
+        self.assertEqual("lead", order[0])
+        self.assertEqual({"ok"}, {status for status, _ in results.values()})
+        self.assertIn("[1/3] building 'lead'", out)
+        self.assertIn("done 'x'", out)
+
+    def test_failure_skips_only_dependent_images(self):
+        jobs = [_job("base"), _job("child", base="base"), _job("other", agent="codex"), _job("peer")]
+
+        def build_one(job):
+            return job["image"] != "base", "boom"
+
+        for max_jobs in (1, 3):
+            results, out = self._run(jobs, build_one, max_jobs=max_jobs)
+            self.assertEqual(("failed", "boom"), results["base"])
+            self.assertEqual("skipped", results["child"][0])
+            self.assertEqual("ok", results["other"][0])
+            self.assertEqual("ok", results["peer"][0])
+            self.assertIn("FAILED 'base'", out)
+
+    def test_crashed_build_is_reported_as_failure(self):
+        def build_one(job):
+            if job["image"] == "bad":
+                raise RuntimeError("daemon went away")
+            return True, ""
+
+        results, _ = self._run([_job("bad", agent="x"), _job("good")], build_one, max_jobs=2)
+        self.assertEqual(("failed", "daemon went away"), results["bad"])
+        self.assertEqual("ok", results["good"][0])
+
+
+class TestDockerfileLayerOrder(unittest.TestCase):
+    def _dockerfile(self, **kwargs):
+        from skua.docker import generate_dockerfile
+        return generate_dockerfile(agent=AgentConfig(name="codex"), **kwargs)
+
+    def test_project_changes_leave_shared_prefix_untouched(self):
+        marker = "# ── Project packages"
+        with_pkg = self._dockerfile(extra_packages=["golang"])
+        with_more = self._dockerfile(extra_packages=["golang", "ripgrep"])
+
+        prefix = with_pkg.split(marker)[0]
+        self.assertEqual(prefix, with_more.split(marker)[0])
+        self.assertIn(prefix, self._dockerfile())
+        self.assertIn("RUN npm install -g --prefix /home/dev/.local @openai/codex", prefix)
+
+    def test_project_packages_install_as_root_after_agent(self):
+        dockerfile = self._dockerfile(extra_packages=["golang", "jq"], extra_commands=["make setup"])
+
+        agent_install = dockerfile.index("@openai/codex")
+        project_pkgs = dockerfile.index("    golang")
+        self.assertLess(agent_install, project_pkgs)
+        self.assertIn("USER root\nRUN apt-get update", dockerfile[agent_install:])
+        self.assertLess(project_pkgs, dockerfile.index("RUN make setup"))
+        # Packages already in shared layers are not repeated in the project layer.
+        self.assertEqual(1, dockerfile.count("    jq \\"))
+
+    def test_agent_packages_have_their_own_layer(self):
+        dockerfile = self._dockerfile()
+        core = dockerfile.index("# ── Core system packages")
+        agent_pkgs = dockerfile.index("# ── Agent-required packages")
+        self.assertLess(core, agent_pkgs)
+        self.assertIn("    nodejs \\", dockerfile[agent_pkgs:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for build-context hashing, streaming and layer caching."""
+
+import io
+import os
+import sys
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skua import docker
+from skua.config.resources import AgentConfig, SecurityAgentSpec, SecurityProfile
+
+
+class TestBuildContextHashCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        self.container_dir = root / "container"
+        self.container_dir.mkdir()
+        (self.container_dir / "entrypoint.sh").write_text("#!/bin/bash\necho first\n")
+        self.home = root / "home"
+        (self.home / ".claude").mkdir(parents=True)
+        self.config_dir = root / "config"
+        self.config_dir.mkdir()
+
+        for patcher in (
+            mock.patch("skua.docker.Path.home", return_value=self.home),
+            mock.patch("skua.docker.CONFIG_DIR", self.config_dir),
+            mock.patch.dict(docker._BUILD_HASH_MEMO, {}, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _hash(self, **overrides):
+        kwargs = dict(
+            container_dir=self.container_dir,
+            security=SecurityProfile(name="open"),
+            agent=AgentConfig(name="claude"),
+            extra_packages=["jq"],
+        )
+        kwargs.update(overrides)
+        return docker.compute_build_context_hash(**kwargs)
+
+    def test_unchanged_inputs_skip_dockerfile_generation(self):
+        first = self._hash()
+        with mock.patch("skua.docker.generate_dockerfile") as gen:
+            second = self._hash()
+        gen.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_disk_cache_survives_new_process(self):
+        first = self._hash()
+        self.assertTrue(docker._build_hash_cache_file().is_file())
+
+        docker._BUILD_HASH_MEMO.clear()
+        with mock.patch("skua.docker.generate_dockerfile") as gen:
+            self.assertEqual(first, self._hash())
+        gen.assert_not_called()
+
+    def test_input_changes_miss_the_cache(self):
+        base = self._hash()
+        self.assertNotEqual(base, self._hash(extra_packages=["jq", "ripgrep"]))
+        self.assertNotEqual(base, self._hash(security=SecurityProfile(name="open", agent=SecurityAgentSpec(sudo=True))))
+
+        entrypoint = self.container_dir / "entrypoint.sh"
+        entrypoint.write_text("#!/bin/bash\necho second\n")
+        os.utime(entrypoint, ns=(1, 1))
+        self.assertNotEqual(base, self._hash())
+
+    def test_no_disk_cache_before_config_dir_exists(self):
+        with mock.patch("skua.docker.CONFIG_DIR", self.config_dir / "missing"):
+            self._hash()
+            self.assertFalse((self.config_dir / "missing").exists())
+
+
+
+class TestBuildKitCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        self.container_dir = root / "container"
+        self.container_dir.mkdir()
+        (self.container_dir / "entrypoint.sh").write_text("#!/bin/bash\n")
+        self.home = root / "home"
+        (self.home / ".claude").mkdir(parents=True)
+        self.cache_dir = root / "buildcache"
+        for patcher in (
+            mock.patch("skua.docker.Path.home", return_value=self.home),
+            mock.patch("skua.docker.CONFIG_DIR", root / "config"),
+            mock.patch.dict(docker._BUILD_HASH_MEMO, {}, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_build_cache_options_from_global_image_config(self):
+        self.assertEqual({"buildkit": False, "cache_dir": ""}, docker.build_cache_options({}))
+        self.assertEqual({"buildkit": True, "cache_dir": ""}, docker.build_cache_options({"buildkit": True}))
+        self.assertEqual(
+            {"buildkit": True, "cache_dir": "~/cache"},
+            docker.build_cache_options({"cacheDir": "~/cache"}),
+        )
+
+    def test_dockerfile_uses_cache_mounts_only_with_buildkit(self):
+        kwargs = dict(agent=AgentConfig(name="codex"), extra_commands=["pip install ruff"])
+        plain = docker.generate_dockerfile(**kwargs)
+        cached = docker.generate_dockerfile(buildkit=True, **kwargs)
+
+        self.assertNotIn("--mount=type=cache", plain)
+        self.assertTrue(cached.startswith("# syntax=docker/dockerfile:1\n"))
+        self.assertIn("--mount=type=cache,target=/var/cache/apt", cached)
+        self.assertNotIn("rm -rf /var/lib/apt/lists", cached)
+        self.assertIn(f"PIP_CACHE_DIR={docker.TOOL_CACHE_DIR}/pip; pip install ruff", cached)
+
+    def test_buildkit_does_not_change_context_hash(self):
+        # The label hash is computed from the plain Dockerfile, so toggling
+        # image.buildkit never marks existing images stale.
+        with mock.patch("skua.docker.subprocess.run", return_value=mock.Mock(returncode=0)) as run:
+            docker.build_image(self.container_dir, "skua-img", quiet=True)
+            docker.build_image(self.container_dir, "skua-img", quiet=True, buildkit=True)
+        labels = [
+            [a for a in call.args[0] if a.startswith(docker.BUILD_CONTEXT_HASH_LABEL)]
+            for call in run.call_args_list
+        ]
+        self.assertEqual(labels[0], labels[1])
+        self.assertEqual("1", run.call_args.kwargs["env"]["DOCKER_BUILDKIT"])
+
+    def test_cache_dir_exports_and_imports_local_cache(self):
+        shared = self.cache_dir / "skua-other"
+        shared.mkdir(parents=True)
+        (shared / "index.json").write_text("{}")
+        staging = self.cache_dir / ".skua-img.new"
+
+        def _run(argv, **kwargs):
+            if argv[:3] == ["docker", "buildx", "build"]:
+                staging.mkdir()
+                (staging / "index.json").write_text("{}")
+            return mock.Mock(returncode=0, stdout="1", stderr="")
+
+        with mock.patch("skua.docker.subprocess.run", side_effect=_run) as run:
+            ok, _ = docker.build_image(self.container_dir, "skua-img", quiet=True, cache_dir=str(self.cache_dir))
+
+        self.assertTrue(ok)
+        argv = run.call_args_list[-1].args[0]
+        self.assertEqual(["docker", "buildx", "build", "--builder", docker.BUILDX_CACHE_BUILDER, "--load"], argv[:6])
+        self.assertIn(f"type=local,src={shared}", argv)
+        self.assertIn(f"type=local,dest={staging},mode=max", argv)
+        self.assertTrue((self.cache_dir / "skua-img" / "index.json").is_file())
+        self.assertFalse(staging.exists())
+
+    def test_local_only_base_image_skips_cache_export(self):
+        def _run(argv, **kwargs):
+            # RepoDigests count of 0: image was built locally, never pulled.
+            return mock.Mock(returncode=0, stdout="0", stderr="")
+
+        with mock.patch("skua.docker.subprocess.run", side_effect=_run) as run:
+            docker.build_image(self.container_dir, "skua-img", quiet=True, cache_dir=str(self.cache_dir),
+                               base_image="skua-base-local")
+
+        self.assertEqual(["docker", "build"], run.call_args.args[0][:2])
+
+
+
+class TestStreamedBuildContext(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        self.container_dir = root / "container"
+        self.container_dir.mkdir()
+        (self.container_dir / "entrypoint.sh").write_text("#!/bin/bash\n")
+        self.home = root / "home"
+        (self.home / ".claude").mkdir(parents=True)
+        (self.home / ".claude" / "settings.json").write_text("{}")
+        (self.home / ".claude" / ".credentials.json").write_text("secret")
+        for patcher in (
+            mock.patch("skua.docker.Path.home", return_value=self.home),
+            mock.patch("skua.docker.CONFIG_DIR", root / "config"),
+            mock.patch.dict(docker._BUILD_HASH_MEMO, {}, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_context_is_piped_to_docker_build_stdin(self):
+        with mock.patch("skua.docker.subprocess.run", return_value=mock.Mock(returncode=0)) as run:
+            ok, _ = docker.build_image(self.container_dir, "skua-img", quiet=True)
+
+        self.assertTrue(ok)
+        self.assertEqual("-", run.call_args.args[0][-1])
+        with tarfile.open(fileobj=io.BytesIO(run.call_args.kwargs["input"])) as tar:
+            names = tar.getnames()
+            self.assertEqual(0o755, tar.getmember("entrypoint.sh").mode)
+            dockerfile = tar.extractfile("Dockerfile").read().decode()
+        self.assertEqual(["Dockerfile", "entrypoint.sh", "claude-settings", "claude-settings/settings.json"], names)
+        self.assertIn("entrypoint.sh /home/dev/entrypoint.sh", dockerfile)
+        self.assertEqual(["entrypoint.sh"], os.listdir(self.container_dir))
+
+
+    def test_content_tag_reuses_identical_image(self):
+        with mock.patch("skua.docker.image_exists", return_value=True), \
+                mock.patch("skua.docker.subprocess.run", return_value=mock.Mock(returncode=0)) as run:
+            ok, _ = docker.build_image(self.container_dir, "skua-base-claude-web-v1", quiet=True,
+                                       content_base="skua-base")
+
+        self.assertTrue(ok)
+        self.assertEqual(1, run.call_count)
+        argv = run.call_args.args[0]
+        self.assertEqual(["docker", "tag"], argv[:2])
+        self.assertRegex(argv[2], r"^skua-base-ctx-[0-9a-f]{12}$")
+        self.assertEqual("skua-base-claude-web-v1", argv[3])
+
+    def test_content_tag_added_to_new_builds(self):
+        with mock.patch("skua.docker.image_exists", return_value=False), \
+                mock.patch("skua.docker.subprocess.run", return_value=mock.Mock(returncode=0)) as run:
+            docker.build_image(self.container_dir, "skua-base-claude-web-v1", quiet=True, content_base="skua-base")
+
+        argv = run.call_args.args[0]
+        tags = [argv[i + 1] for i, arg in enumerate(argv) if arg == "-t"]
+        self.assertEqual("skua-base-claude-web-v1", tags[0])
+        self.assertRegex(tags[1], r"^skua-base-ctx-[0-9a-f]{12}$")
+
+    def test_content_tag_base_requires_option_and_customized_project(self):
+        from skua.config.resources import Project, ProjectImageSpec
+
+        plain = Project(name="web")
+        custom = Project(name="web", image=ProjectImageSpec(extra_packages=["golang"]))
+        self.assertEqual("", docker.content_tag_base("skua-base", {}, custom))
+        self.assertEqual("", docker.content_tag_base("skua-base", {"contentTags": True}, plain))
+        self.assertEqual("skua-base", docker.content_tag_base("skua-base", {"contentTags": True}, custom))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Startup cost guards for the CLI entry point."""
+
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+# Cumulative import time allowed for `import skua.cli` (microseconds). Far
+# above what it needs today; it exists to catch eager imports creeping back.
+CLI_IMPORT_BUDGET_US = 150_000
+
+HEAVY_MODULES = ("yaml", "skua.config", "skua.docker", "skua.project_adapt")
+
+
+def _import_times(code: str) -> dict:
+    """Return {module: cumulative_us} from `python -X importtime -c code`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=REPO_ROOT, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative.strip())
+    return times
+
+
+class TestCliStartup(unittest.TestCase):
+    def test_cli_import_skips_command_modules(self):
+        times = _import_times("import skua.cli")
+
+        loaded = [m for m in times if m in HEAVY_MODULES or m.startswith("skua.commands.")]
+        self.assertEqual([], loaded)
+        self.assertLess(times["skua.cli"], CLI_IMPORT_BUDGET_US)
+
+    def test_resolving_a_command_imports_only_its_module(self):
+        times = _import_times("import skua.commands as c; c.cmd_list")
+
+        self.assertIn("skua.commands.list_cmd", times)
+        for other in ("skua.commands.adapt", "skua.commands.build", "skua.commands.run"):
+            self.assertNotIn(other, times)
+
+    def test_unknown_command_attribute_raises(self):
+        import skua.commands
+
+        with self.assertRaises(AttributeError):
+            skua.commands.cmd_missing
+
+    def test_main_dispatches_through_registry(self):
+        from skua import cli
+
+        with mock.patch("skua.commands.cmd_ssh") as cmd_ssh, \
+                mock.patch.object(sys, "argv", ["skua", "ssh", "status"]):
+            cli.main()
+
+        cmd_ssh.assert_called_once()
+        self.assertEqual("status", cmd_ssh.call_args.args[0].action)
+
+
+if __name__ == "__main__":
+    unittest.main()
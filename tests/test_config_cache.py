@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for the ConfigStore parsed-YAML cache."""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import yaml
+
+from skua.config import loader
+from skua.config.loader import ConfigStore
+from skua.config.resources import AgentConfig
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.config_dir = Path(tmp.name)
+        self.store = ConfigStore(config_dir=self.config_dir)
+        self.store.save_resource(AgentConfig(name="claude"))
+        loader._PARSED.clear()
+        loader._DISK_CACHES.clear()
+        self.addCleanup(loader._PARSED.clear)
+        self.addCleanup(loader._DISK_CACHES.clear)
+
+    def _count_parses(self):
+        return mock.patch("skua.config.loader.yaml.load", wraps=yaml.load)
+
+    def test_repeated_loads_parse_once(self):
+        with self._count_parses() as load:
+            for _ in range(5):
+                self.assertEqual("claude", self.store.load_agent("claude").name)
+        self.assertEqual(1, load.call_count)
+        self.assertIs(loader.YAML_LOADER, load.call_args.kwargs["Loader"])
+
+    def test_loaded_objects_are_independent(self):
+        first = self.store.load_agent("claude")
+        first.runtime.command = "mutated"
+        self.assertNotEqual("mutated", self.store.load_agent("claude").runtime.command)
+
+    def test_external_edit_invalidates_entry(self):
+        self.store.load_agent("claude")
+        path = self.config_dir / "agents" / "claude.yaml"
+        data = yaml.safe_load(path.read_text())
+        data["spec"]["runtime"]["command"] = "edited-elsewhere"
+        path.write_text(yaml.safe_dump(data))
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        self.assertEqual("edited-elsewhere", self.store.load_agent("claude").runtime.command)
+
+    def test_save_and_delete_invalidate_entry(self):
+        agent = self.store.load_agent("claude")
+        agent.runtime.command = "saved"
+        self.store.save_resource(agent)
+        self.assertEqual("saved", self.store.load_agent("claude").runtime.command)
+
+        self.store.delete_resource("AgentConfig", "claude")
+        self.assertIsNone(self.store.load_agent("claude"))
+
+    def test_disk_cache_reused_by_next_process(self):
+        self.store.load_agent("claude")
+        loader.save_parse_cache()
+        cache_file = self.config_dir / "cache" / "resources.json"
+        self.assertIn(
+            str(self.config_dir / "agents" / "claude.yaml"),
+            json.loads(cache_file.read_text())["entries"],
+        )
+
+        loader._PARSED.clear()
+        loader._DISK_CACHES.clear()
+        with self._count_parses() as load:
+            self.assertEqual("claude", self.store.load_agent("claude").name)
+        load.assert_not_called()
+
+    def test_values_json_cannot_represent_are_not_cached(self):
+        self.store.ensure_dirs()
+        self.store.global_file.write_text("ports:\n  8080: web\n")
+        with self._count_parses() as load:
+            self.assertEqual({8080: "web"}, ConfigStore(self.config_dir).load_global()["ports"])
+            self.assertEqual({8080: "web"}, ConfigStore(self.config_dir).load_global()["ports"])
+        self.assertEqual(2, load.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
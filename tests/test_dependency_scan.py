@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for the static dependency analyzer behind `adapt --discover=static`."""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skua.dependency_scan import scan_project
+
+
+class TestScanProject(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+    def _write(self, rel: str, text: str = ""):
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+    def test_maps_manifests_to_packages_and_commands(self):
+        self._write("requirements.txt", "psycopg2==2.9\nrequests\n")
+        self._write("web/package.json", json.dumps({"dependencies": {"canvas": "^2"}}))
+        self._write("web/yarn.lock")
+        self._write("apt.txt", "# system deps\nffmpeg\n")
+
+        scan = scan_project(self.root)
+        request = scan.request()
+
+        self.assertEqual(["apt", "python", "node"], scan.ecosystems)
+        for pkg in ("libpq-dev", "python3-dev", "nodejs", "npm", "libcairo2-dev", "ffmpeg"):
+            self.assertIn(pkg, request["packages"])
+        self.assertEqual(["npm install -g --prefix /home/dev/.local yarn"], request["commands"])
+        self.assertEqual("ready", request["status"])
+        self.assertEqual([], scan.unresolved)
+
+    def test_binary_wheels_and_base_image_packages_are_not_requested(self):
+        self._write("requirements.txt", "psycopg2-binary\n")
+        self._write("Dockerfile", "RUN apt-get update && apt-get install -y --no-install-recommends \\\n    git libxml2-dev\n")
+
+        packages = scan_project(self.root).request()["packages"]
+
+        self.assertNotIn("libpq-dev", packages)
+        self.assertNotIn("git", packages)
+        self.assertIn("libxml2-dev", packages)
+
+    def test_reports_what_debian_cannot_provide(self):
+        self._write("go.mod", "module example.com/x\n\ngo 1.22\n")
+        self._write(".nvmrc", "v20\n")
+        self._write("app/app.csproj", "<Project/>")
+
+        scan = scan_project(self.root)
+
+        self.assertIn("golang-go", scan.request()["packages"])
+        self.assertEqual(
+            ["Node.js 20 (.nvmrc)", "Go 1.22 (go.mod)", ".NET SDK (app.csproj)"],
+            scan.unresolved,
+        )
+
+    def test_skips_dependency_and_hidden_directories(self):
+        self._write("node_modules/pkg/Cargo.toml")
+        self._write(".venv/lib/pyproject.toml")
+        self._write("a/b/c/d/e/go.mod", "go 1.19\n")
+
+        scan = scan_project(self.root)
+
+        self.assertEqual([], scan.ecosystems)
+        self.assertEqual([], scan.request()["packages"])
+
+    def _write_large_tree(self):
+        for i in range(500):
+            self._write(f"src/pkg{i % 20}/mod{i}.py", "import os\n")
+        self._write("pyproject.toml", "[tool.poetry]\nname = 'x'\n")
+
+    def test_scan_is_deterministic(self):
+        self._write_large_tree()
+        first = scan_project(self.root).request()
+        self.assertEqual(first, scan_project(self.root).request())
+        self.assertIn("python3-poetry", first["packages"])
+
+    @unittest.skipUnless(os.environ.get("SKUA_BENCHMARKS"), "set SKUA_BENCHMARKS=1 to run benchmarks")
+    def test_scan_benchmark(self):
+        self._write_large_tree()
+        started = time.monotonic()
+        scan_project(self.root)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for delta sync of local project directories into remote volumes."""
+
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skua import remote_sync
+from skua.config.resources import Project
+from skua.remote_sync import (
+    SYNC_MANIFEST,
+    local_manifest,
+    sync_directory_into_volume,
+    watch_directory,
+)
+
+# The helper script runs for real; only the docker wrapper is faked.
+_real_run = subprocess.run
+
+
+@unittest.skipUnless(shutil.which("sh") and shutil.which("sha256sum"), "needs sh and sha256sum")
+class TestDirectorySync(unittest.TestCase):
+    """Run the helper script locally, with a directory standing in for the volume."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.src = self.tmp / "src"
+        self.volume = self.tmp / "volume"
+        self.src.mkdir()
+        self.volume.mkdir()
+        self.state = self.tmp / "state.json"
+        (self.src / "a.txt").write_text("one")
+        (self.src / "pkg").mkdir()
+        (self.src / "pkg" / "run.sh").write_text("#!/bin/sh\n")
+        (self.src / "pkg" / "run.sh").chmod(0o755)
+        os.symlink("a.txt", self.src / "link")
+        self.pushed = []
+
+        patcher = mock.patch("skua.remote_sync.subprocess.run", side_effect=self._fake_docker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fake_docker(self, cmd, input=None, **kwargs):
+        with tarfile.open(fileobj=io.BytesIO(input), mode="r:gz") as tar:
+            self.pushed.append(sorted(n[len("files/"):] for n in tar.getnames() if n.startswith("files/")))
+        staging = tempfile.mkdtemp(dir=self.tmp)
+        script = cmd[-1].replace("/tmp/skua-sync-in", staging).replace("/workspace", str(self.volume))
+        return _real_run(["sh", "-c", script], input=input, capture_output=True)
+
+    def _sync(self, **kw):
+        return sync_directory_into_volume(self.src, "skua-p-repo", self.state, **kw)
+
+    def test_first_sync_sends_everything(self):
+        changed, deleted = self._sync()
+
+        self.assertEqual(["a.txt", "link", "pkg/run.sh"], changed)
+        self.assertEqual([], deleted)
+        self.assertEqual("one", (self.volume / "a.txt").read_text())
+        self.assertTrue(os.access(self.volume / "pkg" / "run.sh", os.X_OK))
+        self.assertEqual("a.txt", os.readlink(self.volume / "link"))
+        self.assertTrue((self.volume / SYNC_MANIFEST).is_file())
+
+    def test_later_syncs_send_only_the_delta(self):
+        self._sync()
+        (self.src / "a.txt").write_text("two")
+        (self.src / "pkg" / "run.sh").unlink()
+        (self.src / "new.txt").write_text("new")
+
+        changed, deleted = self._sync()
+
+        self.assertEqual(["a.txt", "new.txt"], changed)
+        self.assertEqual(["pkg/run.sh"], deleted)
+        self.assertEqual(["a.txt", "new.txt"], self.pushed[-1])
+        self.assertEqual("two", (self.volume / "a.txt").read_text())
+        self.assertFalse((self.volume / "pkg" / "run.sh").exists())
+
+    def test_path_can_swap_between_file_and_directory(self):
+        self._sync()
+        (self.src / "a.txt").unlink()
+        (self.src / "a.txt").mkdir()
+        (self.src / "a.txt" / "inner").write_text("nested")
+        shutil.rmtree(self.src / "pkg")
+        (self.src / "pkg").write_text("now a file")
+
+        changed, deleted = self._sync()
+
+        self.assertEqual(["a.txt/inner", "pkg"], changed)
+        self.assertEqual(["a.txt", "pkg/run.sh"], deleted)
+        self.assertEqual("nested", (self.volume / "a.txt" / "inner").read_text())
+        self.assertEqual("now a file", (self.volume / "pkg").read_text())
+        # The next push still applies, so the volume manifest was rewritten.
+        (self.src / "new.txt").write_text("new")
+        self.assertEqual((["new.txt"], []), self._sync())
+
+    def test_deletions_prune_emptied_directories(self):
+        (self.src / "deep" / "er").mkdir(parents=True)
+        (self.src / "deep" / "er" / "x.txt").write_text("x")
+        self._sync()
+        shutil.rmtree(self.src / "deep")
+
+        self._sync()
+
+        self.assertFalse((self.volume / "deep").exists())
+
+    def test_unchanged_tree_sends_no_files(self):
+        self._sync()
+        self.assertEqual(([], []), self._sync())
+        self.assertEqual([], self.pushed[-1])
+        # Without verification an unchanged tree needs no container at all.
+        count = len(self.pushed)
+        self.assertEqual(([], []), self._sync(verify=False))
+        self.assertEqual(count, len(self.pushed))
+
+    def test_files_created_remotely_are_kept(self):
+        self._sync()
+        (self.volume / "remote-only.txt").write_text("agent output")
+        (self.src / "a.txt").unlink()
+        self._sync()
+        self.assertTrue((self.volume / "remote-only.txt").exists())
+        self.assertFalse((self.volume / "a.txt").exists())
+
+    def test_lost_local_state_diffs_against_volume_manifest(self):
+        self._sync()
+        self.state.unlink()
+
+        self.assertEqual(([], []), self._sync())
+        # First push assumed an empty volume and was refused; the retry sent nothing.
+        self.assertEqual([], self.pushed[-1])
+
+    def test_recreated_volume_gets_full_copy(self):
+        self._sync()
+        shutil.rmtree(self.volume)
+        self.volume.mkdir()
+
+        changed, _ = self._sync()
+        self.assertEqual(["a.txt", "link", "pkg/run.sh"], changed)
+        self.assertEqual("one", (self.volume / "a.txt").read_text())
+
+    def test_watch_pushes_changes_between_polls(self):
+        synced = []
+        polls = iter(range(3))
+
+        def stop():
+            step = next(polls, None)
+            if step == 1:
+                (self.src / "a.txt").write_text("edited")
+            return step is None
+
+        with mock.patch("skua.remote_sync.time.sleep"):
+            watch_directory(self.src, "skua-p-repo", self.state, interval=0,
+                            on_sync=lambda changed, deleted: synced.append(changed), stop=stop)
+
+        self.assertEqual([["a.txt", "link", "pkg/run.sh"], ["a.txt"]], synced)
+        self.assertEqual(2, len(self.pushed))
+        self.assertEqual("edited", (self.volume / "a.txt").read_text())
+
+
+class TestLocalManifest(unittest.TestCase):
+    def test_unchanged_files_are_not_rehashed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "a.txt").write_text("one")
+            cache = {}
+            first = local_manifest(Path(tmpdir), cache)
+            with mock.patch("skua.remote_sync._entry_digest") as digest:
+                second = local_manifest(Path(tmpdir), cache)
+            digest.assert_not_called()
+            self.assertEqual(first, second)
+
+    def test_digest_covers_mode(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "tool"
+            path.write_text("x")
+            before = local_manifest(Path(tmpdir))
+            path.chmod(0o755)
+            self.assertNotEqual(before, local_manifest(Path(tmpdir)))
+
+
+class TestSyncCommand(unittest.TestCase):
+    @mock.patch("skua.commands.sync_cmd.ConfigStore")
+    def test_rejects_projects_without_host_directory(self, MockStore):
+        from skua.commands.sync_cmd import cmd_sync
+
+        MockStore.return_value.load_project.return_value = Project(
+            name="p", repo="git@github.com:o/r.git", host="qar",
+        )
+        with mock.patch("builtins.print"), self.assertRaises(SystemExit):
+            cmd_sync(SimpleNamespace(name="p", watch=False, interval=1.0))
+
+    @mock.patch("skua.commands.sync_cmd.ConfigStore")
+    def test_syncs_remote_directory_project(self, MockStore):
+        from skua.commands.sync_cmd import cmd_sync
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            MockStore.return_value.load_project.return_value = Project(name="p", directory=tmpdir, host="qar")
+            MockStore.return_value.config_dir = Path(tmpdir)
+            with mock.patch("skua.commands.run._ensure_local_ssh_client_for_remote_docker"), \
+                    mock.patch("skua.commands.run._configure_remote_docker_transport") as transport, \
+                    mock.patch("skua.commands.sync_cmd.sync_directory_into_volume",
+                               return_value=(["a"], [])) as sync, \
+                    mock.patch("builtins.print"):
+                cmd_sync(SimpleNamespace(name="p", watch=False, interval=1.0))
+
+        transport.assert_called_once_with("qar")
+        self.assertEqual("skua-p-repo", sync.call_args.args[1])
+        self.assertEqual(remote_sync.sync_state_file(Path(tmpdir), "p"), sync.call_args.args[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,315 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for the Engine API client over a unix socket."""
+
+import io
+import json
+import os
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skua import docker_api
+from skua.docker_api import DockerAPIError, DockerEngineClient, socket_path_from_env
+
+
+class _FakeEngineHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        path = self.path.split("?", 1)[0]
+        if path.endswith("/_ping"):
+            self._send(200)
+        elif path.endswith("/containers/skua-demo/json"):
+            self._send(200, {"Name": "/skua-demo", "State": {"Running": True}})
+        elif path.endswith("/images/skua-base-claude/json"):
+            self._send(200, {"Id": "sha256:abc", "Config": {"Labels": {"k": "v"}}})
+        elif path.endswith("/containers/json"):
+            self._send(200, [
+                {"Id": "c1", "Names": ["/skua-demo"], "State": "running",
+                 "Image": "skua-base-claude", "ImageID": "sha256:abc", "Labels": {}},
+                {"Id": "c2", "Names": ["/skua-idle"], "State": "exited",
+                 "Image": "skua-base-claude", "ImageID": "sha256:abc", "Labels": {}},
+            ])
+        elif path.endswith("/events"):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for event in self.server.events:
+                self.wfile.write((json.dumps(event) + "\n").encode("utf-8"))
+                self.wfile.flush()
+            self.close_connection = True
+        elif path.endswith("/images/json"):
+            self._send(200, [
+                {"Id": "sha256:abc", "RepoTags": ["skua-base-claude:latest"], "Labels": {"k": "v"}},
+            ])
+        else:
+            self._send(404, {"message": "not found"})
+
+    def do_POST(self):
+        self.server.paths.append(self.path)
+        if self.path.split("?", 1)[0].endswith("/containers/skua-demo/stop"):
+            self._send(204)
+        else:
+            self._send(404, {"message": "No such container"})
+
+
+class _FakeEngineServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        super().__init__(path, _FakeEngineHandler)
+        self.paths = []
+        self.connections = 0
+        self.events = []
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+class TestDockerEngineClient(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self._tmp.name, "docker.sock")
+        self.server = _FakeEngineServer(self.socket_path)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.client = DockerEngineClient(self.socket_path, timeout=5)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self._tmp.cleanup()
+
+    def test_requests_reuse_one_keep_alive_connection(self):
+        self.assertTrue(self.client.ping())
+        self.assertTrue(self.client.inspect_container("skua-demo")["State"]["Running"])
+        self.assertIsNone(self.client.inspect_container("skua-missing"))
+        self.assertEqual("sha256:abc", self.client.inspect_image("skua-base-claude")["Id"])
+        self.assertEqual(1, self.server.connections)
+
+    def test_image_exists_is_safe_from_concurrent_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from skua import docker
+
+        with mock.patch("skua.docker._engine_client", return_value=self.client), \
+                mock.patch("skua.docker.subprocess.run") as mock_run:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(lambda _: docker.image_exists("skua-base-claude"), range(200)))
+
+        self.assertEqual([True] * 200, results)
+        mock_run.assert_not_called()
+        # One keep-alive connection per worker thread, not per request.
+        self.assertLessEqual(self.server.connections, 8)
+
+    def test_list_containers_encodes_filters(self):
+        rows = self.client.list_containers(all=True, filters={"name": ["^skua-"]})
+        self.assertEqual(2, len(rows))
+        self.assertIn("all=1", self.server.paths[-1])
+        self.assertIn("filters=", self.server.paths[-1])
+
+    def test_stop_raises_for_missing_container(self):
+        self.client.stop_container("skua-demo")
+        with self.assertRaises(DockerAPIError) as ctx:
+            self.client.stop_container("skua-missing")
+        self.assertEqual(404, ctx.exception.status)
+
+    def test_docker_helpers_use_client_when_available(self):
+        from skua import docker
+
+        with mock.patch("skua.docker._engine_client", return_value=self.client), \
+                mock.patch("skua.docker.subprocess.run") as mock_run:
+            self.assertTrue(docker.is_container_running("skua-demo"))
+            self.assertTrue(docker.image_exists("skua-base-claude"))
+            self.assertEqual("v", docker._image_label("skua-base-claude", "k"))
+            self.assertEqual(["skua-demo", "skua-idle"], docker.get_running_skua_containers())
+            state = docker.load_docker_state()
+            self.assertTrue(docker.stop_container("skua-demo"))
+
+        mock_run.assert_not_called()
+        self.assertTrue(state.is_running("skua-demo"))
+        self.assertFalse(state.is_running("skua-idle"))
+        self.assertEqual("sha256:abc", state.container_image_id("skua-idle"))
+        self.assertEqual("v", state.image_label("skua-base-claude", "k"))
+
+    def test_unreachable_socket_raises_api_error(self):
+        client = DockerEngineClient(os.path.join(self._tmp.name, "missing.sock"))
+        self.assertFalse(client.ping())
+        with self.assertRaises(DockerAPIError):
+            client.inspect_container("skua-demo")
+
+    def test_wait_for_running_container_fails_fast_on_die_event(self):
+        from skua import docker
+
+        self.server.events = [{
+            "Type": "container",
+            "Action": "die",
+            "Actor": {"ID": "c1", "Attributes": {"name": "skua-demo", "exitCode": "3"}},
+        }]
+        logs = mock.Mock(returncode=0, stdout="fatal: missing config\n")
+        out = io.StringIO()
+        with mock.patch("skua.docker._engine_client", return_value=self.client), \
+                mock.patch("skua.docker.subprocess.run", return_value=logs), \
+                redirect_stdout(out):
+            ok = docker.wait_for_running_container("skua-demo", timeout_seconds=5, since=0, container_id="c1")
+
+        self.assertFalse(ok)
+        self.assertIn("exit code 3", out.getvalue())
+        self.assertIn("fatal: missing config", out.getvalue())
+        self.assertIn("container", self.server.paths[-1])
+
+
+class TestCliReadinessEvents(unittest.TestCase):
+    @staticmethod
+    def _fake_events(lines, log_lines=()):
+        """Fake `docker events` with lines and `docker logs --follow` with log_lines."""
+        real_popen = subprocess.Popen
+
+        def _popen(argv, **kwargs):
+            output = lines if argv[1] == "events" else log_lines
+            return real_popen(["printf", "%s", "".join(line + "\n" for line in output)], **kwargs)
+
+        return _popen
+
+    def test_start_event_returns_without_polling(self):
+        from skua import docker
+
+        popen = self._fake_events([
+            "2026-01-01T00:00:00.000000000Z container start c1 (image=skua-base-claude, name=skua-demo)",
+        ])
+        with mock.patch("skua.docker._engine_client", return_value=None), \
+                mock.patch("skua.docker.subprocess.Popen", side_effect=popen) as mock_popen, \
+                mock.patch("skua.docker.is_container_running", return_value=True) as running, \
+                mock.patch("skua.docker.time.sleep") as sleep:
+            self.assertTrue(docker.wait_for_running_container("skua-demo", since=100.0, container_id="c1"))
+
+        argv = mock_popen.call_args.args[0]
+        self.assertIn("container=c1", argv)
+        self.assertIn("95", argv)
+        self.assertEqual(1, running.call_count)
+        sleep.assert_not_called()
+
+    def test_die_event_reports_exit_code(self):
+        from skua import docker
+
+        popen = self._fake_events([
+            "2026-01-01T00:00:00.000000000Z container start c1 (name=skua-demo)",
+            "2026-01-01T00:00:01.000000000Z container die c1 (exitCode=137, name=skua-demo)",
+        ])
+        logs = mock.Mock(returncode=0, stdout="killed\n")
+        out = io.StringIO()
+        with mock.patch("skua.docker._engine_client", return_value=None), \
+                mock.patch("skua.docker.subprocess.Popen", side_effect=popen), \
+                mock.patch("skua.docker.subprocess.run", return_value=logs), \
+                mock.patch("skua.docker.is_container_running", return_value=False), \
+                redirect_stdout(out):
+            ok = docker.wait_for_running_container("skua-demo", since=100.0, container_id="c1")
+
+        self.assertFalse(ok)
+        self.assertIn("exit code 137", out.getvalue())
+        self.assertIn("killed", out.getvalue())
+
+    def test_die_event_reports_output_captured_before_auto_removal(self):
+        from skua import docker
+
+        popen = self._fake_events(
+            ["2026-01-01T00:00:01.000000000Z container die c1 (exitCode=1, name=skua-demo)"],
+            log_lines=["[OK] SSH key loaded", "fatal: cannot read /home/dev/.claude"],
+        )
+        # By the time the log tail is reported, --rm has removed the container.
+        removed = mock.Mock(returncode=1, stdout="Error: No such container: skua-demo\n")
+        out = io.StringIO()
+        with mock.patch("skua.docker._engine_client", return_value=None), \
+                mock.patch("skua.docker.subprocess.Popen", side_effect=popen) as mock_popen, \
+                mock.patch("skua.docker.subprocess.run", return_value=removed) as mock_run, \
+                mock.patch("skua.docker.is_container_running", return_value=False), \
+                redirect_stdout(out):
+            ok = docker.wait_for_running_container("skua-demo", since=100.0, container_id="c1")
+
+        self.assertFalse(ok)
+        self.assertIn(["docker", "logs", "--follow", "--tail", "20", "c1"], [c.args[0] for c in mock_popen.call_args_list])
+        mock_run.assert_not_called()
+        self.assertIn("Last 2 log line(s):", out.getvalue())
+        self.assertIn("fatal: cannot read /home/dev/.claude", out.getvalue())
+
+    def test_die_event_without_captured_output_reads_docker_logs(self):
+        from skua import docker
+
+        popen = self._fake_events(["2026-01-01T00:00:01.000000000Z container die c1 (exitCode=1, name=skua-demo)"])
+        removed = mock.Mock(returncode=1, stdout="Error: No such container: skua-demo\n")
+        out = io.StringIO()
+        with mock.patch("skua.docker._engine_client", return_value=None), \
+                mock.patch("skua.docker.subprocess.Popen", side_effect=popen), \
+                mock.patch("skua.docker.subprocess.run", return_value=removed), \
+                mock.patch("skua.docker.is_container_running", return_value=False), \
+                redirect_stdout(out):
+            self.assertFalse(docker.wait_for_running_container("skua-demo", since=100.0, container_id="c1"))
+
+        self.assertIn("exit code 1", out.getvalue())
+        self.assertIn("no log output available", out.getvalue())
+        self.assertNotIn("No such container", out.getvalue())
+
+
+class TestSocketPathFromEnv(unittest.TestCase):
+    def setUp(self):
+        home = tempfile.TemporaryDirectory()
+        self.addCleanup(home.cleanup)
+        self.home = home.name
+
+    def _path(self, **env):
+        base = {"HOME": self.home}
+        base.update(env)
+        with mock.patch.dict(os.environ, base, clear=True):
+            return socket_path_from_env()
+
+    def test_default_socket_when_docker_host_unset(self):
+        self.assertEqual(docker_api.DEFAULT_SOCKET, self._path())
+
+    def test_unix_docker_host_is_used(self):
+        self.assertEqual("/run/user/1000/docker.sock", self._path(DOCKER_HOST="unix:///run/user/1000/docker.sock"))
+
+    def test_remote_docker_host_disables_client(self):
+        self.assertEqual("", self._path(DOCKER_HOST="ssh://build-box"))
+        self.assertEqual("", self._path(DOCKER_HOST="tcp://10.0.0.2:2375"))
+
+    def test_non_default_context_disables_client(self):
+        self.assertEqual("", self._path(DOCKER_CONTEXT="remote"))
+        config_dir = Path(self.home) / ".docker"
+        config_dir.mkdir()
+        (config_dir / "config.json").write_text(json.dumps({"currentContext": "colima"}))
+        self.assertEqual("", self._path())
+
+    def test_opt_out_env_disables_client(self):
+        self.assertEqual("", self._path(SKUA_DOCKER_API="0"))
+
+    def test_get_client_returns_none_for_missing_socket(self):
+        with mock.patch.dict(os.environ, {"HOME": self.home, "DOCKER_HOST": "unix:///nonexistent/docker.sock"}, clear=True):
+            with mock.patch.dict(docker_api._CLIENTS, {}, clear=True):
+                self.assertIsNone(docker_api.get_client())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for entrypoint phase timings and the setup stamp."""
+
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skua import docker
+
+ENTRYPOINT = Path(__file__).resolve().parent.parent / "skua" / "container" / "entrypoint.sh"
+
+
+class TestEntrypointTimingHelpers(unittest.TestCase):
+    def test_timing_helpers_write_json(self):
+        text = ENTRYPOINT.read_text()
+        start = text.index("# ── Phase timings")
+        end = text.index("\n}\n", text.index("write_timings()")) + 3
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "timings.json"
+            script = (
+                f"set -e\nTIMINGS_FILE={out}\n{text[start:end]}"
+                "phase_begin ownership\nphase_end true\n"
+                "phase_begin git\nphase_end\n"
+                "write_timings\n"
+            )
+            subprocess.run(["bash", "-c", script], check=True)
+            data = json.loads(out.read_text())
+
+        self.assertEqual(["ownership", "git"], [p["phase"] for p in data["phases"]])
+        self.assertTrue(data["phases"][0]["skipped"])
+        self.assertFalse(data["phases"][1]["skipped"])
+        self.assertIsInstance(data["totalMs"], int)
+
+    def test_entrypoint_skips_setup_only_when_stamp_matches(self):
+        text = ENTRYPOINT.read_text()
+        self.assertIn('STAMP="owner=dev:${DEV_GROUP} uid=$(id -u dev) gid=$(id -g dev) image=${SKUA_IMAGE_HASH:-}"', text)
+        self.assertIn('grep -qxF "$1" /home/dev/.bashrc', text)
+
+
+class TestEntrypointTimingsFromRun(unittest.TestCase):
+    def test_image_receives_build_hash(self):
+        self.assertIn('ENV SKUA_IMAGE_HASH="${SKUA_BUILD_HASH}"', docker.generate_dockerfile())
+
+    @mock.patch("skua.docker.time.sleep")
+    @mock.patch("skua.docker.subprocess.run")
+    def test_timings_retry_until_written(self, mock_run, _sleep):
+        payload = {"totalMs": 12, "phases": [{"phase": "ownership", "ms": 0, "skipped": True}]}
+        mock_run.side_effect = [
+            mock.Mock(returncode=1, stdout=""),
+            mock.Mock(returncode=0, stdout=json.dumps(payload)),
+        ]
+        self.assertEqual(payload, docker.entrypoint_timings("skua-web"))
+        self.assertEqual(
+            ["docker", "exec", "skua-web", "cat", docker.ENTRYPOINT_TIMINGS_FILE],
+            mock_run.call_args.args[0],
+        )
+
+    def test_run_prints_phase_table(self):
+        from skua.commands.run import _print_entrypoint_timings
+
+        payload = {"totalMs": 40, "phases": [
+            {"phase": "ownership", "ms": 0, "skipped": True},
+            {"phase": "ssh", "ms": 31, "skipped": False},
+        ]}
+        out = io.StringIO()
+        with mock.patch("skua.commands.run.entrypoint_timings", return_value=payload), redirect_stdout(out):
+            _print_entrypoint_timings("skua-web")
+
+        text = out.getvalue()
+        self.assertIn("total 40 ms", text)
+        self.assertIn("skipped, stamp current", text)
+        self.assertRegex(text, r"ssh\s+31 ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for the shared git mirror cache used by local repo clones."""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skua import git_cache
+
+
+@unittest.skipUnless(shutil.which("git"), "git not installed")
+class TestGitCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        env = {
+            "HOME": str(self.tmp),
+            "GIT_CONFIG_NOSYSTEM": "1",
+            "GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@example.com",
+            "GIT_COMMITTER_NAME": "t", "GIT_COMMITTER_EMAIL": "t@example.com",
+        }
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.upstream = self.tmp / "upstream"
+        self._git("init", "-q", "-b", "main", str(self.upstream))
+        self._commit("a.txt", "one")
+        self.url = f"file://{self.upstream}"
+        self.cache = self.tmp / "git-cache"
+
+    def _git(self, *args, cwd=None):
+        return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+    def _commit(self, name, text):
+        (self.upstream / name).write_text(text)
+        self._git("add", name, cwd=self.upstream)
+        self._git("commit", "-q", "-m", name, cwd=self.upstream)
+
+    def test_clone_uses_mirror_and_points_at_upstream(self):
+        dest = self.tmp / "repos" / "proj"
+        self.assertTrue(git_cache.clone_repo(self.url, dest, self.cache))
+
+        mirror = git_cache.mirror_path(self.cache, self.url)
+        self.assertTrue((mirror / "HEAD").is_file())
+        self.assertEqual("one", (dest / "a.txt").read_text())
+        self.assertEqual(self.url, self._git("-C", str(dest), "remote", "get-url", "origin").strip())
+        self.assertEqual("main", self._git("-C", str(dest), "branch", "--show-current").strip())
+        # Objects are hardlinked from the mirror, not copied or referenced.
+        objects = [p for p in (dest / ".git" / "objects").rglob("*") if p.is_file()]
+        self.assertTrue(any(p.stat().st_nlink > 1 for p in objects))
+        self.assertFalse((dest / ".git" / "objects" / "info" / "alternates").exists())
+
+    def test_second_clone_refreshes_mirror_incrementally(self):
+        git_cache.clone_repo(self.url, self.tmp / "p1", self.cache)
+        self._commit("b.txt", "two")
+
+        with mock.patch("skua.git_cache.subprocess.run", wraps=subprocess.run) as run:
+            self.assertTrue(git_cache.clone_repo(self.url, self.tmp / "p2", self.cache))
+
+        commands = [c.args[0] for c in run.call_args_list]
+        self.assertTrue(any("fetch" in cmd for cmd in commands))
+        self.assertFalse(any(cmd[-2:] == [self.url, str(self.tmp / "p2")] for cmd in commands))
+        self.assertEqual("two", (self.tmp / "p2" / "b.txt").read_text())
+        self.assertEqual(
+            self._git("-C", str(self.upstream), "rev-parse", "HEAD"),
+            self._git("-C", str(self.tmp / "p2"), "rev-parse", "origin/main"),
+        )
+
+    def test_equivalent_urls_share_one_mirror(self):
+        self.assertEqual(
+            git_cache.mirror_path(self.cache, "git@github.com:org/repo.git"),
+            git_cache.mirror_path(self.cache, "https://github.com/org/repo"),
+        )
+
+    def test_falls_back_to_upstream_clone_without_mirror(self):
+        dest = self.tmp / "proj"
+        with mock.patch("skua.git_cache.refresh_mirror", return_value=None):
+            self.assertTrue(git_cache.clone_repo(self.url, dest, self.cache))
+        self.assertEqual("one", (dest / "a.txt").read_text())
+        self.assertFalse(self.cache.exists())
+
+    def test_unreachable_upstream_fails(self):
+        missing = f"file://{self.tmp / 'missing'}"
+        with mock.patch("builtins.print"):
+            self.assertFalse(git_cache.clone_repo(missing, self.tmp / "proj", self.cache))
+        self.assertEqual([], list(self.cache.glob(".*")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for pre-created containers (run.precreate)."""
+
+import io
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skua import docker
+from skua.config.resources import Project
+
+RUN_CMD = ["docker", "run", "-d", "--rm", "--name", "skua-web", "-e", "A=1", "skua-base-claude", "bash"]
+
+
+class TestContainerConfigHash(unittest.TestCase):
+    def test_hash_tracks_argv_and_image_id(self):
+        base = docker.container_config_hash(RUN_CMD, "sha256:a")
+        self.assertEqual(base, docker.container_config_hash(list(RUN_CMD), "sha256:a"))
+        self.assertNotEqual(base, docker.container_config_hash(RUN_CMD, "sha256:b"))
+        self.assertNotEqual(base, docker.container_config_hash(RUN_CMD[:-1] + ["zsh"], "sha256:a"))
+
+    def test_create_command_keeps_container_and_labels_hash(self):
+        cmd = docker.container_create_command(RUN_CMD, "abc")
+        self.assertEqual(["docker", "create", "--label", f"{docker.CONTAINER_CONFIG_HASH_LABEL}=abc"], cmd[:4])
+        self.assertNotIn("--rm", cmd)
+        self.assertNotIn("-d", cmd)
+        self.assertEqual(RUN_CMD[4:], cmd[4:])
+
+
+class TestStartPrecreatedContainer(unittest.TestCase):
+    def _start(self, existing):
+        from skua.commands import run
+
+        config_hash = docker.container_config_hash(RUN_CMD, "sha256:a")
+        if existing is not None:
+            existing = dict(existing, config_hash=existing.get("config_hash", config_hash))
+        with mock.patch("skua.commands.run.image_id", return_value="sha256:a"), \
+                mock.patch("skua.commands.run.inspect_container_state", return_value=existing), \
+                mock.patch("skua.commands.run.start_existing_container", return_value=True) as start, \
+                mock.patch("skua.commands.run.start_detached_container", return_value="c2") as create, \
+                mock.patch("skua.commands.run.remove_container") as remove, \
+                mock.patch("skua.commands.run.wait_for_running_container", return_value=True):
+            self.assertTrue(run._start_precreated_container("skua-web", RUN_CMD, "skua-base-claude"))
+        return start, create, remove
+
+    def test_matching_container_is_only_started(self):
+        start, create, remove = self._start({"id": "c1", "running": False})
+        start.assert_called_once_with("skua-web")
+        create.assert_not_called()
+        remove.assert_not_called()
+
+    def test_precreated_container_that_dies_on_start_is_reported(self):
+        from skua.commands import run
+
+        real_popen = subprocess.Popen
+        die = "2026-01-01T00:00:01.000000000Z container die c1 (exitCode=1, name=skua-web)\n"
+
+        def _popen(argv, **kwargs):
+            # `docker events` reports the die; `docker logs --follow` has the cause.
+            output = die if argv[1] == "events" else "fatal: bad config\n"
+            return real_popen(["printf", "%s", output], **kwargs)
+
+        existing = {"id": "c1", "running": False,
+                    "config_hash": docker.container_config_hash(RUN_CMD, "sha256:a")}
+        out = io.StringIO()
+        with mock.patch("skua.commands.run.image_id", return_value="sha256:a"), \
+                mock.patch("skua.commands.run.inspect_container_state", return_value=existing), \
+                mock.patch("skua.commands.run.start_existing_container", return_value=True), \
+                mock.patch("skua.docker._engine_client", return_value=None), \
+                mock.patch("skua.docker.subprocess.Popen", side_effect=_popen) as popen, \
+                mock.patch("skua.docker.subprocess.run", return_value=mock.Mock(returncode=1, stdout="")), \
+                mock.patch("skua.docker.is_container_running", return_value=False), \
+                redirect_stdout(out):
+            self.assertFalse(run._start_precreated_container("skua-web", RUN_CMD, "skua-base-claude"))
+
+        events_argv = next(c.args[0] for c in popen.call_args_list if c.args[0][1] == "events")
+        self.assertIn("container=c1", events_argv)
+        self.assertIn("exit code 1", out.getvalue())
+        self.assertIn("fatal: bad config", out.getvalue())
+
+    def test_stale_container_is_recreated(self):
+        start, create, remove = self._start({"id": "c1", "running": False, "config_hash": "old"})
+        remove.assert_called_once_with("skua-web")
+        self.assertEqual(["docker", "create"], create.call_args.args[0][:2])
+        start.assert_called_once_with("c2")
+
+    def test_missing_container_is_created(self):
+        start, create, remove = self._start(None)
+        remove.assert_not_called()
+        create.assert_called_once()
+        start.assert_called_once_with("c2")
+
+
+class TestPrecreateContainer(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        project_dir = self.root / "web"
+        project_dir.mkdir()
+        self.store = mock.Mock()
+        self.store.resolve_project.return_value = Project(name="web", directory=str(project_dir))
+        self.store.load_environment.return_value = SimpleNamespace(persistence=SimpleNamespace(mode="bind"))
+        self.store.load_global.return_value = {"run": {"precreate": True}}
+        self.store.project_data_dir.return_value = self.root / "data"
+
+    def _precreate(self, image="sha256:a", existing=None):
+        from skua.commands import run
+
+        with mock.patch("skua.commands.run.validate_project", return_value=SimpleNamespace(valid=True)), \
+                mock.patch("skua.commands.run.image_id", return_value=image), \
+                mock.patch("skua.commands.run.inspect_container_state", return_value=existing), \
+                mock.patch("skua.commands.run.build_run_command", return_value=["docker", "run", "-it", "--rm", "img"]), \
+                mock.patch("skua.commands.run.start_detached_container", return_value="c1") as create:
+            return run.precreate_container(self.store, "web"), create
+
+    def test_creates_stopped_container(self):
+        status, create = self._precreate()
+        self.assertEqual("created", status)
+        self.assertEqual(["docker", "create"], create.call_args.args[0][:2])
+        self.assertTrue((self.root / "data").is_dir())
+
+    def test_skips_until_image_is_built(self):
+        status, create = self._precreate(image="")
+        self.assertEqual("image not built", status)
+        create.assert_not_called()
+
+    def test_leaves_running_container_alone(self):
+        status, create = self._precreate(existing={"id": "c0", "running": True, "config_hash": "x"})
+        self.assertEqual("running", status)
+        create.assert_not_called()
+
+    def test_disabled_by_default(self):
+        from skua.commands import run
+
+        self.store.load_global.return_value = {}
+        with mock.patch("skua.commands.run.precreate_container") as precreate:
+            run.precreate_containers(self.store, ["web"])
+        precreate.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
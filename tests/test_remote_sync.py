@@ -0,0 +1,165 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for syncing project repos into remote-host volumes."""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skua.config.resources import Project
+from skua.remote_sync import MIRROR_VOLUME, sync_options, sync_repo_into_volume, sync_script
+from skua.utils import normalize_repo_url, repo_cache_key
+
+
+class TestRepoUrlKeys(unittest.TestCase):
+    def test_equivalent_urls_share_a_key(self):
+        urls = [
+            "git@github.com:Org/Repo.git",
+            "ssh://git@GitHub.com/Org/Repo",
+            "https://github.com/Org/Repo/",
+        ]
+        self.assertEqual({"github.com/Org/Repo"}, {normalize_repo_url(u) for u in urls})
+        self.assertEqual(1, len({repo_cache_key(u) for u in urls}))
+        self.assertTrue(repo_cache_key(urls[0]).startswith("Repo-"))
+
+    def test_different_repos_differ(self):
+        self.assertNotEqual(repo_cache_key("git@github.com:a/repo.git"),
+                            repo_cache_key("git@github.com:b/repo.git"))
+
+
+class TestSyncRepoIntoVolume(unittest.TestCase):
+    def _sync(self, project, status="cloned", options=None, returncode=0):
+        result = mock.Mock(returncode=returncode, stdout=f"skua-sync: {status}\n")
+        with mock.patch("skua.remote_sync.subprocess.run", return_value=result) as mock_run:
+            got = sync_repo_into_volume(project, "skua-qar-repo", options)
+        return got, mock_run
+
+    def test_uses_project_ssh_key_and_known_hosts(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            key_path = Path(tmpdir) / "id_ed25519"
+            key_path.write_text("-----BEGIN TEST KEY-----\nabc\n-----END TEST KEY-----\n")
+            (Path(tmpdir) / "known_hosts").write_text("github.com ssh-ed25519 AAAA...\n")
+            project = Project(name="qar", repo="git@github.com:org/repo.git")
+            project.ssh.private_key = str(key_path)
+
+            status, mock_run = self._sync(project)
+
+        self.assertEqual("cloned", status)
+        self.assertEqual(1, mock_run.call_count)
+        cmd = mock_run.call_args.args[0]
+        env = mock_run.call_args.kwargs["env"]
+        for var in ("SKUA_REMOTE_GIT_REPO", "SKUA_REMOTE_GIT_SSH_KEY_B64", "SKUA_REMOTE_GIT_KNOWN_HOSTS_B64"):
+            self.assertIn(var, cmd)
+            self.assertIn(var, env)
+        self.assertIn("alpine/git", cmd)
+        self.assertIn("UserKnownHostsFile=/tmp/skua-ssh/known_hosts", cmd[-1])
+        self.assertNotIn(f"{MIRROR_VOLUME}:/mirrors", cmd)
+
+    def test_accept_new_without_project_key(self):
+        project = Project(name="qar", repo="git@github.com:org/repo.git")
+        _, mock_run = self._sync(project, status="current")
+        cmd = mock_run.call_args.args[0]
+        self.assertIn("StrictHostKeyChecking=accept-new", cmd[-1])
+        self.assertNotIn("SKUA_REMOTE_GIT_SSH_KEY_B64", cmd)
+
+    def test_mirror_mounts_shared_volume(self):
+        project = Project(name="qar", repo="git@github.com:org/repo.git")
+        _, mock_run = self._sync(project, options={"mirror": True})
+        cmd = mock_run.call_args.args[0]
+        self.assertIn(f"{MIRROR_VOLUME}:/mirrors", cmd)
+        self.assertEqual(repo_cache_key(project.repo), mock_run.call_args.kwargs["env"]["SKUA_MIRROR_KEY"])
+
+    def test_failure_exits(self):
+        project = Project(name="qar", repo="git@github.com:org/repo.git")
+        with self.assertRaises(SystemExit):
+            self._sync(project, status="", returncode=128)
+
+    def test_sync_options_from_global(self):
+        self.assertEqual({"filter": "", "depth": 0, "mirror": False}, sync_options({}))
+        g = {"git": {"remoteFilter": "blob:none", "remoteDepth": "50", "remoteMirror": True}}
+        self.assertEqual({"filter": "blob:none", "depth": 50, "mirror": True}, sync_options(g))
+
+
+@unittest.skipUnless(shutil.which("git"), "git not installed")
+class TestSyncScript(unittest.TestCase):
+    """Run the helper script against local directories standing in for volumes."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.env = dict(
+            os.environ,
+            HOME=str(self.tmp),
+            GIT_CONFIG_NOSYSTEM="1",
+            GIT_AUTHOR_NAME="t", GIT_AUTHOR_EMAIL="t@example.com",
+            GIT_COMMITTER_NAME="t", GIT_COMMITTER_EMAIL="t@example.com",
+        )
+        self.upstream = self.tmp / "upstream"
+        self._git("init", "-q", "-b", "main", str(self.upstream))
+        self._commit("a.txt", "one")
+        self.env["SKUA_REMOTE_GIT_REPO"] = f"file://{self.upstream}"
+
+    def _git(self, *args, cwd=None):
+        subprocess.run(["git", *args], cwd=cwd, env=self.env, check=True, capture_output=True)
+
+    def _commit(self, name, text):
+        (self.upstream / name).write_text(text)
+        self._git("add", name, cwd=self.upstream)
+        self._git("commit", "-q", "-m", name, cwd=self.upstream)
+
+    def _run(self, workspace, options, mirror_key=""):
+        script = sync_script(["ssh"], options)
+        script = script.replace("/workspace", str(workspace)).replace("/mirrors/", f"{self.tmp}/mirrors/")
+        env = dict(self.env, SKUA_MIRROR_KEY=mirror_key)
+        result = subprocess.run(["sh", "-c", script], env=env, capture_output=True, text=True, check=True)
+        return result.stdout.strip().splitlines()[-1]
+
+    def test_clone_then_fast_forward(self):
+        ws = self.tmp / "ws"
+        ws.mkdir()
+        self.assertEqual("skua-sync: cloned", self._run(ws, {"depth": 1}))
+        self.assertEqual("skua-sync: current", self._run(ws, {"depth": 1}))
+
+        self._commit("b.txt", "two")
+        self.assertEqual("skua-sync: updated", self._run(ws, {"depth": 1}))
+        self.assertEqual("two", (ws / "b.txt").read_text())
+        self.assertTrue((ws / ".git" / "shallow").exists())
+
+    def test_local_commits_are_left_alone(self):
+        ws = self.tmp / "ws"
+        ws.mkdir()
+        self._run(ws, {})
+        (ws / "local.txt").write_text("mine")
+        self._git("add", "local.txt", cwd=ws)
+        self._git("commit", "-q", "-m", "local", cwd=ws)
+        self._commit("b.txt", "two")
+
+        self.assertEqual("skua-sync: diverged", self._run(ws, {}))
+        self.assertEqual("mine", (ws / "local.txt").read_text())
+
+    def test_clones_borrow_from_shared_mirror(self):
+        key = repo_cache_key(str(self.upstream))
+        first, second = self.tmp / "ws1", self.tmp / "ws2"
+        first.mkdir()
+        second.mkdir()
+        (self.tmp / "mirrors").mkdir()
+
+        self.assertEqual("skua-sync: cloned", self._run(first, {"mirror": True}, key))
+        self.assertTrue((self.tmp / "mirrors" / f"{key}.git").is_dir())
+        self._commit("b.txt", "two")
+        self.assertEqual("skua-sync: cloned", self._run(second, {"mirror": True}, key))
+
+        self.assertEqual("two", (second / "b.txt").read_text())
+        # --dissociate: the clone does not depend on the mirror afterwards.
+        self.assertFalse((second / ".git" / "objects" / "info" / "alternates").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
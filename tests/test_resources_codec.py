@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for resource (de)serialization."""
+
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skua.config import resources
+from skua.config.resources import (
+    AgentConfig,
+    Project,
+    ProjectGitSpec,
+    ProjectImageSpec,
+    resource_from_dict,
+    resource_to_dict,
+)
+
+ROUND_TRIPS = 10_000
+# Ceiling for ROUND_TRIPS Project round trips: about 3x what the precompiled
+# codecs need, and below what per-call reflection took (~1.4s). Wall-clock
+# checks are opt-in (SKUA_BENCHMARKS=1) so loaded CI runners do not flake.
+ROUND_TRIP_BUDGET_S = 1.0
+
+
+def _project(i: int) -> Project:
+    return Project(
+        name=f"proj-{i}",
+        repo=f"git@github.com:org/proj-{i}.git",
+        git=ProjectGitSpec(name="Dev", email="dev@example.com"),
+        image=ProjectImageSpec(
+            from_image="debian:bookworm-slim",
+            extra_packages=["ripgrep", "jq"],
+            extra_commands=["echo ok"],
+            version=i,
+        ),
+    )
+
+
+class TestResourceCodec(unittest.TestCase):
+    def test_round_trip_preserves_nested_specs(self):
+        project = _project(7)
+        data = resource_to_dict(project)
+
+        self.assertEqual("proj-7", data["metadata"]["name"])
+        self.assertEqual(["ripgrep", "jq"], data["spec"]["image"]["extra_packages"])
+        self.assertEqual(project, resource_from_dict(data))
+
+    def test_camel_case_keys_and_unknown_keys(self):
+        agent = resource_from_dict({
+            "kind": "AgentConfig",
+            "metadata": {"name": "codex"},
+            "spec": {
+                "runtime": {"command": "codex", "adaptCommand": "codex exec"},
+                "notAField": True,
+            },
+        })
+        self.assertIsInstance(agent, AgentConfig)
+        self.assertEqual("codex exec", agent.runtime.adapt_command)
+
+    def test_non_dict_nested_value_passes_through(self):
+        project = resources._dict_to_dataclass(Project, {"name": "p", "git": None})
+        self.assertIsNone(project.git)
+
+    def test_codecs_are_built_once_per_class(self):
+        resource_to_dict(_project(1))
+        encoder = resources._ENCODERS[Project]
+        decoder = resources._decoder(Project)
+        resource_from_dict(resource_to_dict(_project(2)))
+        self.assertIs(encoder, resources._ENCODERS[Project])
+        self.assertIs(decoder, resources._DECODERS[Project])
+
+    def test_round_trip_preserves_projects(self):
+        projects = [_project(i) for i in range(100)]
+        self.assertEqual(projects, [resource_from_dict(resource_to_dict(p)) for p in projects])
+
+    @unittest.skipUnless(os.environ.get("SKUA_BENCHMARKS"), "set SKUA_BENCHMARKS=1 to run benchmarks")
+    def test_round_trip_benchmark(self):
+        projects = [_project(i) for i in range(ROUND_TRIPS)]
+
+        start = time.perf_counter()
+        decoded = [resource_from_dict(resource_to_dict(p)) for p in projects]
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(projects, decoded)
+        self.assertLess(elapsed, ROUND_TRIP_BUDGET_S)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -85,6 +85,8 @@ class TestRemoteDockerTransportFallback(unittest.TestCase):
 
     def setUp(self):
         self._orig_env = os.environ.copy()
+        # Keep the ssh multiplexing shim out of the real config dir.
+        os.environ["SKUA_SSH_MUX"] = "0"
 
     def tearDown(self):
         os.environ.clear()
@@ -241,121 +243,98 @@ class TestRemoteDockerTransportFallback(unittest.TestCase):
                             mock_transport.assert_called_once_with("docker.example.com")
 
 
-class TestRemoteRepoCloneWithProjectSshKey(unittest.TestCase):
-    """Validate remote repo clone behavior with project SSH key support."""
-
-    def setUp(self):
-        self._orig_env = os.environ.copy()
-
-    def tearDown(self):
-        os.environ.clear()
-        os.environ.update(self._orig_env)
-
-    def test_remote_clone_uses_project_ssh_key_and_known_hosts(self):
-        from skua.commands.run import _clone_repo_into_remote_volume
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            key_path = os.path.join(tmpdir, "id_ed25519")
-            known_hosts_path = os.path.join(tmpdir, "known_hosts")
-            with open(key_path, "w", encoding="utf-8") as f:
-                f.write("-----BEGIN TEST KEY-----\nabc\n-----END TEST KEY-----\n")
-            with open(known_hosts_path, "w", encoding="utf-8") as f:
-                f.write("github.com ssh-ed25519 AAAA...\n")
-
-            project = Project(name="qar", repo="git@github.com:org/repo.git")
-            project.ssh.private_key = key_path
-
-            mock_check = mock.Mock(returncode=0, stdout="empty\n")
-            mock_clone = mock.Mock(returncode=0)
-            with mock.patch("skua.commands.run.subprocess.run", side_effect=[mock_check, mock_clone]) as mock_run:
-                _clone_repo_into_remote_volume(project, "skua-qar-repo")
-
-                self.assertEqual(2, mock_run.call_count)
-                clone_call = mock_run.call_args_list[1]
-                clone_cmd = clone_call.args[0]
-                clone_env = clone_call.kwargs.get("env", {})
-
-                self.assertIn("-e", clone_cmd)
-                self.assertIn("SKUA_REMOTE_GIT_REPO", clone_cmd)
-                self.assertIn("SKUA_REMOTE_GIT_SSH_KEY_B64", clone_cmd)
-                self.assertIn("SKUA_REMOTE_GIT_KNOWN_HOSTS_B64", clone_cmd)
-                self.assertIn("--entrypoint", clone_cmd)
-                self.assertIn("sh", clone_cmd)
-                self.assertIn("alpine/git", clone_cmd)
-                self.assertEqual("git@github.com:org/repo.git", clone_env.get("SKUA_REMOTE_GIT_REPO"))
-                self.assertTrue(clone_env.get("SKUA_REMOTE_GIT_SSH_KEY_B64"))
-                self.assertTrue(clone_env.get("SKUA_REMOTE_GIT_KNOWN_HOSTS_B64"))
-
-    def test_remote_clone_uses_accept_new_even_without_project_key(self):
-        from skua.commands.run import _clone_repo_into_remote_volume
-
-        project = Project(name="qar", repo="git@github.com:org/repo.git")
-        project.ssh.private_key = ""
-
-        mock_check = mock.Mock(returncode=0, stdout="empty\n")
-        mock_clone = mock.Mock(returncode=0)
-        with mock.patch("skua.commands.run.subprocess.run", side_effect=[mock_check, mock_clone]) as mock_run:
-            _clone_repo_into_remote_volume(project, "skua-qar-repo")
-            clone_cmd = mock_run.call_args_list[1].args[0]
-            script = clone_cmd[-1]
-            self.assertIn("StrictHostKeyChecking=accept-new", script)
-            self.assertNotIn("SKUA_REMOTE_GIT_SSH_KEY_B64", clone_cmd)
-
-
 class TestRemoteAuthSeeding(unittest.TestCase):
     """Validate host-to-remote auth seeding behavior."""
 
-    def test_seed_auth_into_remote_volume_copies_missing_files(self):
-        from skua.commands.run import _seed_auth_into_remote_volume
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            auth_file = Path(tmpdir) / "auth.json"
-            auth_file.write_text('{"token":"abc"}')
-
-            check_missing = mock.Mock(returncode=1)
-            copy_ok = mock.Mock(returncode=0)
-            with mock.patch(
-                "skua.commands.run.resolve_credential_sources",
-                return_value=[(auth_file, "auth.json")],
-            ):
-                with mock.patch("skua.commands.run.subprocess.run", side_effect=[check_missing, copy_ok]) as mock_run:
-                    copied = _seed_auth_into_remote_volume("qar", "claude", cred=None, agent=mock.Mock(), overwrite=False)
-                    self.assertEqual(1, copied)
-                    self.assertEqual(2, mock_run.call_count)
-
-    def test_seed_auth_into_remote_volume_skips_existing_when_not_overwriting(self):
-        from skua.commands.run import _seed_auth_into_remote_volume
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            auth_file = Path(tmpdir) / "auth.json"
-            auth_file.write_text('{"token":"abc"}')
-
-            check_exists = mock.Mock(returncode=0)
-            with mock.patch(
-                "skua.commands.run.resolve_credential_sources",
-                return_value=[(auth_file, "auth.json")],
-            ):
-                with mock.patch("skua.commands.run.subprocess.run", side_effect=[check_exists]) as mock_run:
-                    copied = _seed_auth_into_remote_volume("qar", "claude", cred=None, agent=mock.Mock(), overwrite=False)
-                    self.assertEqual(0, copied)
-                    self.assertEqual(1, mock_run.call_count)
-
-    def test_seed_auth_into_remote_volume_overwrite_skips_existence_check(self):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.auth_file = self.tmp / "auth.json"
+        self.auth_file.write_text('{"token":"abc"}')
+        self.settings_file = self.tmp / "settings.json"
+        self.settings_file.write_text("{}")
+        self.sources = [(self.auth_file, "auth.json"), (self.settings_file, "settings.json")]
+
+    def _seed(self, result, overwrite=False, sources=None):
         from skua.commands.run import _seed_auth_into_remote_volume
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            auth_file = Path(tmpdir) / "auth.json"
-            auth_file.write_text('{"token":"abc"}')
-
-            copy_ok = mock.Mock(returncode=0)
-            with mock.patch(
-                "skua.commands.run.resolve_credential_sources",
-                return_value=[(auth_file, "auth.json")],
-            ):
-                with mock.patch("skua.commands.run.subprocess.run", side_effect=[copy_ok]) as mock_run:
-                    copied = _seed_auth_into_remote_volume("qar", "claude", cred=None, agent=mock.Mock(), overwrite=True)
-                    self.assertEqual(1, copied)
-                    self.assertEqual(1, mock_run.call_count)
+        with mock.patch(
+            "skua.commands.run.resolve_credential_sources",
+            return_value=self.sources if sources is None else sources,
+        ):
+            with mock.patch("skua.commands.run.subprocess.run", return_value=result) as mock_run:
+                copied = _seed_auth_into_remote_volume("qar", "claude", cred=None, agent=mock.Mock(), overwrite=overwrite)
+        return copied, mock_run
+
+    def test_seed_auth_into_remote_volume_uses_one_container_for_all_files(self):
+        import io
+        import tarfile
+
+        result = mock.Mock(returncode=0, stdout=b"synced auth.json\nsynced settings.json\n", stderr=b"")
+        copied, mock_run = self._seed(result)
+
+        self.assertEqual(2, copied)
+        self.assertEqual(1, mock_run.call_count)
+        cmd = mock_run.call_args.args[0]
+        self.assertIn("skua-qar-claude:/auth", cmd)
+        self.assertIn("SKUA_AUTH_OVERWRITE=0", cmd)
+        with tarfile.open(fileobj=io.BytesIO(mock_run.call_args.kwargs["input"])) as tar:
+            names = tar.getnames()
+            manifest = tar.extractfile("manifest").read().decode()
+        self.assertEqual(["files/auth.json", "files/settings.json", "manifest"], names)
+        self.assertEqual(["auth.json", "settings.json"], [line.split()[1] for line in manifest.splitlines()])
+
+    def test_seed_auth_into_remote_volume_passes_overwrite(self):
+        result = mock.Mock(returncode=0, stdout=b"", stderr=b"")
+        copied, mock_run = self._seed(result, overwrite=True)
+        self.assertEqual(0, copied)
+        self.assertIn("SKUA_AUTH_OVERWRITE=1", mock_run.call_args.args[0])
+
+    def test_seed_auth_into_remote_volume_skips_run_without_files(self):
+        missing = [(self.tmp / "missing.json", "missing.json")]
+        copied, mock_run = self._seed(mock.Mock(), sources=missing)
+        self.assertEqual(0, copied)
+        mock_run.assert_not_called()
+
+    def test_seed_auth_into_remote_volume_failure_warns(self):
+        result = mock.Mock(returncode=125, stdout=b"", stderr=b"docker: error\n")
+        with mock.patch("builtins.print") as mock_print:
+            copied, _ = self._seed(result)
+        self.assertEqual(0, copied)
+        self.assertIn("failed to sync", mock_print.call_args_list[0].args[0])
+
+    def test_sync_script_writes_only_missing_or_changed_files(self):
+        import subprocess
+        from skua.commands.run import _REMOTE_AUTH_SYNC_SCRIPT, _remote_auth_payload
+
+        auth_dir = self.tmp / "auth"
+        auth_dir.mkdir()
+        script = _REMOTE_AUTH_SYNC_SCRIPT.replace("/tmp/skua-auth-in", str(self.tmp / "in"))
+        script = script.replace("/auth/", f"{auth_dir}/")
+
+        def sync(overwrite):
+            env = dict(os.environ, SKUA_AUTH_OVERWRITE="1" if overwrite else "0")
+            out = subprocess.run(["sh", "-c", script], input=_remote_auth_payload(self.sources),
+                                 capture_output=True, env=env, check=True)
+            return out.stdout.decode().split()[1::2]
+
+        stamp = auth_dir / ".skua-setup-stamp"
+        stamp.write_text("owner=dev:dev")
+        self.assertEqual(["auth.json", "settings.json"], sync(overwrite=False))
+        # Root-written files make the entrypoint redo its ownership fix.
+        self.assertFalse(stamp.exists())
+        self.assertEqual('{"token":"abc"}', (auth_dir / "auth.json").read_text())
+        self.assertEqual(0o600, (auth_dir / "auth.json").stat().st_mode & 0o777)
+        self.assertEqual(auth_dir.stat().st_uid, (auth_dir / "auth.json").stat().st_uid)
+
+        stamp.write_text("owner=dev:dev")
+        self.auth_file.write_text('{"token":"new"}')
+        self.assertEqual([], sync(overwrite=False))
+        self.assertTrue(stamp.exists())
+        self.assertEqual(["auth.json"], sync(overwrite=True))
+        self.assertEqual('{"token":"new"}', (auth_dir / "auth.json").read_text())
+        self.assertEqual([], sync(overwrite=True))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for multiplexed SSH connections to remote hosts."""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skua import ssh_mux
+
+
+class TestSshMux(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.config_dir = Path(tmp.name)
+        patcher = mock.patch("skua.ssh_mux.CONFIG_DIR", self.config_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        env = mock.patch.dict(os.environ, {"SKUA_SSH_MUX": "", "SKUA_SSH_PERSIST": ""})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_ssh_argv_uses_shared_control_socket(self):
+        argv = ssh_mux.ssh_argv("qar", "docker", "ps", batch=True)
+
+        self.assertEqual("ssh", argv[0])
+        self.assertIn("ControlMaster=auto", argv)
+        self.assertIn(f"ControlPath={self.config_dir / 'ssh' / '%C'}", argv)
+        self.assertIn("ControlPersist=10m", argv)
+        self.assertIn("BatchMode=yes", argv)
+        self.assertEqual(["qar", "docker", "ps"], argv[-3:])
+        self.assertTrue((self.config_dir / "ssh").is_dir())
+
+    def test_disabled_mux_omits_control_options(self):
+        with mock.patch.dict(os.environ, {"SKUA_SSH_MUX": "0"}):
+            self.assertEqual(["ssh", "qar", "true"], ssh_mux.ssh_argv("qar", "true"))
+
+    def test_persist_override(self):
+        with mock.patch.dict(os.environ, {"SKUA_SSH_PERSIST": "1h"}):
+            self.assertIn("ControlPersist=1h", ssh_mux.ssh_argv("qar"))
+
+    def test_install_ssh_shim_prepends_path(self):
+        bin_dir = self.config_dir / "realbin"
+        bin_dir.mkdir()
+        real_ssh = bin_dir / "ssh"
+        real_ssh.write_text("#!/bin/sh\n")
+        real_ssh.chmod(0o755)
+
+        with mock.patch.dict(os.environ, {"PATH": str(bin_dir)}):
+            shim_dir = ssh_mux.install_ssh_shim()
+            path = os.environ["PATH"]
+
+        self.assertEqual(str(self.config_dir / "ssh" / "bin"), shim_dir)
+        self.assertEqual([shim_dir, str(bin_dir)], path.split(os.pathsep))
+        script = (Path(shim_dir) / "ssh").read_text()
+        self.assertIn(str(real_ssh), script)
+        self.assertIn("ControlMaster=auto", script)
+
+    @mock.patch("skua.ssh_mux.subprocess.run")
+    def test_master_status_and_close(self, mock_run):
+        mock_run.return_value = mock.Mock(returncode=0)
+        self.assertEqual("active", ssh_mux.master_status("qar"))
+        self.assertIn("check", mock_run.call_args.args[0])
+
+        mock_run.return_value = mock.Mock(returncode=255)
+        self.assertFalse(ssh_mux.close_master("qar"))
+        self.assertIn("exit", mock_run.call_args.args[0])
+
+    @mock.patch("skua.docker._engine_client", return_value=None)
+    @mock.patch("skua.docker.subprocess.run")
+    def test_remote_docker_queries_go_through_mux(self, mock_run, _client):
+        from skua.docker import get_running_skua_containers, load_docker_state
+
+        mock_run.return_value = mock.Mock(returncode=0, stdout="", stderr="")
+        get_running_skua_containers(host="qar")
+        load_docker_state(host="qar")
+
+        for call in mock_run.call_args_list:
+            self.assertIn("ControlMaster=auto", call.args[0])
+
+
+class TestSshCommand(unittest.TestCase):
+    def _store(self, hosts):
+        store = mock.Mock()
+        store.list_resources.return_value = [f"p{i}" for i in range(len(hosts))]
+        store.load_project.side_effect = lambda name: SimpleNamespace(host=hosts[int(name[1:])])
+        return store
+
+    def test_status_reports_each_project_host_once(self):
+        from skua.commands.ssh_cmd import cmd_ssh
+
+        with mock.patch("skua.commands.ssh_cmd.ConfigStore", return_value=self._store(["a", "b", "a", ""])), \
+                mock.patch("skua.commands.ssh_cmd.ssh_mux.master_status", return_value="active") as status, \
+                mock.patch("skua.commands.ssh_cmd.ssh_mux.control_sockets", return_value=[]):
+            out = io.StringIO()
+            with redirect_stdout(out):
+                cmd_ssh(SimpleNamespace(action="status", host=None))
+
+        self.assertEqual([mock.call("a"), mock.call("b")], status.call_args_list)
+        self.assertIn("active", out.getvalue())
+
+    def test_close_single_host(self):
+        from skua.commands.ssh_cmd import cmd_ssh
+
+        with mock.patch("skua.commands.ssh_cmd.ConfigStore", return_value=self._store([])), \
+                mock.patch("skua.commands.ssh_cmd.ssh_mux.close_master", return_value=True) as close:
+            out = io.StringIO()
+            with redirect_stdout(out):
+                cmd_ssh(SimpleNamespace(action="close", host="qar"))
+
+        close.assert_called_once_with("qar")
+        self.assertIn("Closed SSH master for 'qar'", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
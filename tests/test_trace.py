@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: BUSL-1.1
+"""Tests for Chrome trace-event output."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skua import trace
+
+
+class TestTrace(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "trace.json"
+        self.addCleanup(trace.disable)
+
+    def _events(self):
+        trace.flush()
+        return json.loads(self.path.read_text())["traceEvents"]
+
+    def test_disabled_records_nothing(self):
+        with trace.span("noop"):
+            pass
+        self.assertFalse(trace.enabled())
+        self.assertIs(subprocess.Popen, trace._real_popen)
+
+    def test_spans_and_subprocess_children(self):
+        trace.enable(str(self.path))
+
+        @trace.traced("outer")
+        def outer():
+            with trace.span("inner", host="qar"):
+                subprocess.run(["true"], check=True)
+
+        outer()
+        events = {e["name"]: e for e in self._events()}
+
+        self.assertEqual({"outer", "inner", "true"}, set(events))
+        proc = events["true"]
+        self.assertEqual("subprocess", proc["cat"])
+        self.assertEqual(["true"], proc["args"]["argv"])
+        self.assertEqual(0, proc["args"]["returncode"])
+        self.assertEqual("qar", events["inner"]["args"]["host"])
+        # Children lie within their parents on the same thread.
+        for child, parent in (("true", "inner"), ("inner", "outer")):
+            self.assertGreaterEqual(events[child]["ts"], events[parent]["ts"])
+            self.assertLessEqual(
+                events[child]["ts"] + events[child]["dur"],
+                events[parent]["ts"] + events[parent]["dur"],
+            )
+            self.assertEqual(events[child]["tid"], events[parent]["tid"])
+
+    def test_flush_includes_open_spans(self):
+        trace.enable(str(self.path))
+        with trace.span("cmd_run"):
+            names = [e["name"] for e in self._events()]
+        self.assertEqual(["cmd_run"], names)
+
+    def test_enable_from_env(self):
+        with mock.patch.dict(os.environ, {"SKUA_TRACE": str(self.path)}):
+            trace.enable_from_env()
+        self.assertTrue(trace.enabled())
+        self.assertIsNot(subprocess.Popen, trace._real_popen)
+
+    def test_disable_restores_popen(self):
+        trace.enable(str(self.path))
+        trace.disable()
+        self.assertIs(subprocess.Popen, trace._real_popen)
+
+
+if __name__ == "__main__":
+    unittest.main()